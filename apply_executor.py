@@ -0,0 +1,277 @@
+# apply_executor.py
+import os
+import threading
+import time
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from html.parser import HTMLParser
+
+import config
+import sources
+import tracing
+from politeness import Scheduler, is_challenge
+
+# skipped: never tried (its site was paused), so the job is left to a later run
+Outcome = namedtuple("Outcome", ["job", "ok", "reason", "seconds", "skipped"], defaults=(False,))
+
+
+def site_of(job):
+    return (job.get("source") or "").lower()
+
+
+# ======================================
+# OUTCOME COLLECTOR
+# ======================================
+class OutcomeCollector:
+    """Thread-safe sink for finished applications."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._outcomes = []
+        self._unread = []
+
+    def add(self, outcome):
+        with self._lock:
+            self._outcomes.append(outcome)
+            self._unread.append(outcome)
+
+    def take(self):
+        """Outcomes added since the last take()."""
+        with self._lock:
+            unread, self._unread = self._unread, []
+        return unread
+
+    def all(self):
+        with self._lock:
+            return list(self._outcomes)
+
+    def summary(self):
+        """{site: {"ok": n, "failed": n, "skipped": n, "seconds": total}}"""
+        out = {}
+        for o in self.all():
+            s = out.setdefault(site_of(o.job), {"ok": 0, "failed": 0, "skipped": 0, "seconds": 0.0})
+            s["skipped" if o.skipped else "ok" if o.ok else "failed"] += 1
+            s["seconds"] = round(s["seconds"] + o.seconds, 2)
+        return out
+
+
+# ======================================
+# BACKENDS
+# ======================================
+class SeleniumBackend:
+    """Applies for real, borrowing headless browsers from a DriverPool."""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def __call__(self, job):
+        adapter = sources.find(job)
+        if not adapter:
+            return False, f"No apply automation for {job.get('source')}"
+        return adapter.apply(job, pool=self.pool, headless=self.pool.headless)
+
+    def close(self):
+        self.pool.close()
+
+
+class _Controls(HTMLParser):
+    """Collects (tag, class, text/value) for every button, link and input on a page."""
+
+    def __init__(self):
+        super().__init__()
+        self.controls = []
+        self._open = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "input":
+            self.controls.append((tag, attrs.get("class") or "", attrs.get("value") or ""))
+        elif tag in ("a", "button"):
+            self._open = [tag, attrs.get("class") or "", ""]
+
+    def handle_data(self, data):
+        if self._open:
+            self._open[2] += data
+
+    def handle_endtag(self, tag):
+        if self._open and tag == self._open[0]:
+            self.controls.append(tuple(self._open))
+            self._open = None
+
+
+class DryRunBackend:
+    """
+    Offline stand-in for SeleniumBackend.
+
+    Each job is "applied" against a local HTML fixture instead of the live
+    site: `file://` job links are read directly, anything else uses
+    `<fixture_dir>/<site>.html`. It succeeds when the page has the control
+    the real automation would click (the adapter's is_apply_control), after
+    `latency` seconds.
+    """
+
+    def __init__(self, fixture_dir=None, latency=None):
+        self.fixture_dir = fixture_dir or config.APPLY_FIXTURE_DIR
+        self.latency = config.DRY_RUN_LATENCY if latency is None else latency
+
+    def _page(self, job):
+        link = job.get("link") or ""
+        if link.startswith("file://"):
+            return link[len("file://"):]
+        return os.path.join(self.fixture_dir, f"{site_of(job)}.html")
+
+    def __call__(self, job):
+        adapter = sources.find(job)
+        if not adapter:
+            return False, f"No apply automation for {job.get('source')}"
+        path = self._page(job)
+        if not os.path.exists(path):
+            return False, f"Fixture missing: {path}"
+        parser = _Controls()
+        with open(path, "r", encoding="utf-8") as f:
+            parser.feed(f.read())
+        if self.latency:
+            time.sleep(self.latency)
+        if any(adapter.is_apply_control(tag, cls, text.strip()) for tag, cls, text in parser.controls):
+            return True, "Dry run - apply control found"
+        return False, "Dry run - apply control not found"
+
+    def close(self):
+        pass
+
+
+# ======================================
+# EXECUTOR
+# ======================================
+class ApplyExecutor:
+    """
+    Runs applications for different sites in parallel.
+
+    Each site has its own concurrency cap and an adaptive pacer (politeness):
+    starts are spaced by APPLY_SITE_INTERVALS at first, a little closer
+    while applies succeed, and a CAPTCHA/OTP challenge pauses the site.
+    Queued jobs are kept per site and a free worker takes the job whose site
+    can start soonest, so one slow or paused board never holds up the
+    others. Jobs for a site paused longer than APPLY_MAX_WAIT are reported
+    as skipped. Finished applications land in `self.outcomes`.
+    """
+
+    def __init__(self, backend, max_workers=None, site_limits=None, site_intervals=None, max_wait=None):
+        self.backend = backend
+        self.site_limits = site_limits or config.APPLY_SITE_LIMITS
+        self.site_intervals = site_intervals or config.APPLY_SITE_INTERVALS
+        self.max_wait = config.APPLY_MAX_WAIT if max_wait is None else max_wait
+        self.scheduler = Scheduler({site: 1.0 / i if i else 0.0 for site, i in self.site_intervals.items()},
+                                   default_rate=0.0, burst=1, name="apply")
+        self.outcomes = OutcomeCollector()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or config.APPLY_MAX_WORKERS,
+                                        thread_name_prefix="apply")
+        self._queues = {}
+        self._running = Counter()
+        self._ready = threading.Condition()
+        self._futures = set()
+        # submitted jobs whose outcome has not been handed out by poll/wait_any/drain yet
+        self._unreported = 0
+
+    def _next_job(self):
+        """Take a queued job from the site that can start soonest among those below their cap."""
+        with self._ready:
+            while True:
+                open_sites = [site for site, queued in self._queues.items()
+                              if queued and self._running[site] < max(1, self.site_limits.get(site, 1))]
+                if open_sites:
+                    site = self.scheduler.pick(open_sites)
+                    self._running[site] += 1
+                    return site, self._queues[site].popleft()
+                self._ready.wait()
+
+    def _run(self):
+        # one _run per submitted job, so there is always a queued job for it to take
+        site, job = self._next_job()
+        pacer = self.scheduler.pacer(site)
+        started = time.monotonic()
+        skipped = False
+        try:
+            if pacer.acquire(self.max_wait) is None:
+                ok, reason = False, f"Skipped: {site} paused for {pacer.ready_in():.0f}s after a challenge"
+                skipped = True
+            else:
+                started = time.monotonic()
+                try:
+                    with tracing.span("apply", site=site):
+                        ok, reason = self.backend(job)
+                except Exception as e:
+                    ok, reason = False, str(e)
+                if ok:
+                    pacer.success()
+                elif is_challenge(reason):
+                    pacer.challenged()
+            self.outcomes.add(Outcome(job, ok, reason, time.monotonic() - started, skipped))
+        finally:
+            with self._ready:
+                self._running[site] -= 1
+                self._ready.notify_all()
+
+    @property
+    def pending(self):
+        """
+        Jobs submitted but not yet returned as outcomes. Counting finished
+        futures instead would miss a job that ends between a poll() and this
+        check, and callers budgeting applies on "recorded + pending" would
+        overshoot by it.
+        """
+        with self._ready:
+            return self._unreported
+
+    def _take(self):
+        outcomes = self.outcomes.take()
+        with self._ready:
+            self._unreported -= len(outcomes)
+        return outcomes
+
+    def submit(self, job):
+        """
+        Queue a job. The returned future finishes when one application has,
+        which, as sites are picked by readiness, need not be this job's.
+        """
+        with self._ready:
+            self._queues.setdefault(site_of(job), deque()).append(job)
+            self._ready.notify_all()
+            future = self._pool.submit(self._run)
+            self._futures = {f for f in self._futures if not f.done()}
+            self._futures.add(future)
+            self._unreported += 1
+        return future
+
+    def poll(self):
+        """Outcomes finished since the last call, without blocking."""
+        return self._take()
+
+    def wait_any(self):
+        """Block until at least one more application finishes (if any are running)."""
+        with self._ready:
+            running = {f for f in self._futures if not f.done()}
+        if running:
+            wait(running, return_when=FIRST_COMPLETED)
+        return self._take()
+
+    def drain(self):
+        """Wait for everything submitted so far."""
+        with self._ready:
+            futures, self._futures = self._futures, set()
+        wait(futures)
+        return self._take()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+        self.backend.close()
+
+
+def create_backend(dry_run=None, headless=None):
+    dry_run = config.DRY_RUN if dry_run is None else dry_run
+    if dry_run:
+        print("🧪 DRY_RUN is on: applications run against local fixture pages only")
+        return DryRunBackend()
+    from driver_pool import DriverPool
+    headless = config.APPLY_HEADLESS if headless is None else headless
+    return SeleniumBackend(DriverPool(headless=headless, max_per_site=max(config.APPLY_SITE_LIMITS.values())))
@@ -0,0 +1,65 @@
+# apply_timing.py
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+import tracing
+from tracing import percentile
+
+
+class ApplyTimings:
+    """Thread-safe record of how long each apply step took, per site."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def record(self, site, step, seconds):
+        with self._lock:
+            self._samples.setdefault((site, step), []).append(seconds)
+        tracing.REGISTRY.observe("apply_step", seconds, site=site, step=step)
+
+    @contextmanager
+    def step(self, site, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(site, name, time.perf_counter() - started)
+
+    def summary(self):
+        """{site: {step: {"count", "p50", "p95", "max"}}} in seconds."""
+        with self._lock:
+            samples = {k: list(v) for k, v in self._samples.items()}
+        out = {}
+        for (site, step), values in sorted(samples.items()):
+            out.setdefault(site, {})[step] = {
+                "count": len(values),
+                "p50": round(percentile(values, 50), 3),
+                "p95": round(percentile(values, 95), 3),
+                "max": round(max(values), 3),
+            }
+        return out
+
+    def report(self):
+        summary = self.summary()
+        if not summary:
+            return "⏱️ No apply steps recorded."
+        lines = ["⏱️ Apply step latency (seconds):", f"   {'site':<12} {'step':<16} {'n':>4} {'p50':>7} {'p95':>7}"]
+        for site, steps in summary.items():
+            for step, s in steps.items():
+                lines.append(f"   {site:<12} {step:<16} {s['count']:>4} {s['p50']:>7.2f} {s['p95']:>7.2f}")
+        return "\n".join(lines)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+# Shared by all apply_* calls in the process
+TIMINGS = ApplyTimings()
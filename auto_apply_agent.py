@@ -14,12 +14,21 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options
 import time
 import traceback
+from functools import lru_cache
 import config
+from driver_pool import borrow_driver
+from apply_timing import TIMINGS
 
 # ======================================
 # DRIVER FACTORY
 # ======================================
-def create_driver(headless=False):
+@lru_cache(maxsize=1)
+def _chromedriver_path():
+    # resolve (and download if needed) the driver binary once per process
+    return ChromeDriverManager().install()
+
+
+def create_driver(headless=False, profile_dir=None):
     """Create a Chrome WebDriver with best-practice options."""
     options = Options()
     if headless:
@@ -34,8 +43,10 @@ def create_driver(headless=False):
     options.add_argument("--log-level=3")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
 
-    driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
+    driver = webdriver.Chrome(service=ChromeService(_chromedriver_path()), options=options)
     driver.set_page_load_timeout(30)
     return driver
 
@@ -54,163 +65,259 @@ def safe_click(driver, by, selector, timeout=8):
 
 
 # ======================================
-# LINKEDIN APPLY
+# WAIT UTILS (instead of fixed sleeps)
 # ======================================
-def apply_linkedin(job_url, email=None, password=None, headless=False):
-    """Automate LinkedIn Easy Apply jobs."""
-    if not email or not password:
-        print("⚠️ LinkedIn credentials not provided.")
-        return False, "No credentials"
+_PENDING_RESOURCES_JS = "return window.performance.getEntriesByType('resource').length"
+
+
+def wait_for_network_idle(driver, timeout=None, quiet=None):
+    """
+    Wait for document.readyState == 'complete' and then for the page to stop
+    loading new resources for `quiet` seconds (XHR/fetch driven SPAs).
+    Gives up silently after `timeout`; returns True if the page went idle.
+    """
+    timeout = timeout or config.APPLY_WAIT_TIMEOUT
+    quiet = config.NETWORK_IDLE_QUIET if quiet is None else quiet
+    deadline = time.monotonic() + timeout
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        last_count, last_change = -1, time.monotonic()
+        while time.monotonic() < deadline:
+            count = driver.execute_script(_PENDING_RESOURCES_JS)
+            now = time.monotonic()
+            if count != last_count:
+                last_count, last_change = count, now
+            elif now - last_change >= quiet:
+                return True
+            time.sleep(0.1)
+    except TimeoutException:
+        pass
+    return False
+
+
+def wait_for_url_change(driver, old_url, timeout=None):
+    try:
+        WebDriverWait(driver, timeout or config.APPLY_WAIT_TIMEOUT).until(EC.url_changes(old_url))
+        return True
+    except TimeoutException:
+        return False
 
-    driver = create_driver(headless=headless)
+
+def wait_for_stale(driver, element, timeout=None):
+    """Wait until `element` is detached (the click led to a re-render or navigation)."""
     try:
+        WebDriverWait(driver, timeout or config.APPLY_WAIT_TIMEOUT).until(EC.staleness_of(element))
+        return True
+    except TimeoutException:
+        return False
+
+
+def open_page(driver, site, url):
+    with TIMINGS.step(site, "open_job"):
+        driver.get(url)
+        wait_for_network_idle(driver)
+
+
+# ======================================
+# LINKEDIN APPLY
+# ======================================
+def login_linkedin(driver, email, password):
+    """Log in on LinkedIn; returns (ok, reason)."""
+    with TIMINGS.step("linkedin", "login"):
         print(f"🌐 Opening LinkedIn login page...")
         driver.get("https://www.linkedin.com/login")
         WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.ID, "username")))
 
         driver.find_element(By.ID, "username").send_keys(email)
         driver.find_element(By.ID, "password").send_keys(password)
+        login_url = driver.current_url
         driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
-        time.sleep(3)
+        wait_for_url_change(driver, login_url, timeout=15)
 
-        # check if captcha appeared
-        if "checkpoint" in driver.current_url or "challenge" in driver.current_url:
-            print("⚠️ CAPTCHA detected on LinkedIn login. Manual login required.")
-            return False, "CAPTCHA login required"
+    # check if captcha appeared
+    if "checkpoint" in driver.current_url or "challenge" in driver.current_url:
+        print("⚠️ CAPTCHA detected on LinkedIn login. Manual login required.")
+        return False, "CAPTCHA login required"
+    return True, "Logged in"
 
-        driver.get(job_url)
-        time.sleep(3)
 
-        print(f"🔎 Checking for Easy Apply button on: {job_url}")
+def apply_linkedin(job_url, email=None, password=None, headless=False, pool=None):
+    """Automate LinkedIn Easy Apply jobs."""
+    if not email or not password:
+        print("⚠️ LinkedIn credentials not provided.")
+        return False, "No credentials"
+
+    with borrow_driver("linkedin", headless, pool) as session:
+        driver = session.driver
         try:
-            easy_apply = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Easy Apply') or contains(., 'Apply now')]"))
-            )
-            easy_apply.click()
-            time.sleep(2)
-        except Exception:
-            return False, "Easy Apply not found"
-
-        for _ in range(6):
-            try:
-                submit = driver.find_element(By.XPATH, "//button[contains(., 'Submit') or contains(., 'Done') or contains(., 'Apply')]")
-                if submit.is_enabled():
-                    submit.click()
-                    time.sleep(3)
-                    return True, "Submitted successfully"
-            except NoSuchElementException:
-                pass
+            if not session.logged_in:
+                ok, reason = login_linkedin(driver, email, password)
+                if not ok:
+                    return False, reason
+                session.mark_logged_in()
+
+            open_page(driver, "linkedin", job_url)
 
+            print(f"🔎 Checking for Easy Apply button on: {job_url}")
             try:
-                next_btn = driver.find_element(By.XPATH, "//button[contains(., 'Next') or contains(., 'Continue')]")
-                next_btn.click()
-                time.sleep(2)
+                with TIMINGS.step("linkedin", "open_form"):
+                    easy_apply = WebDriverWait(driver, 5).until(
+                        EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Easy Apply') or contains(., 'Apply now')]"))
+                    )
+                    easy_apply.click()
+                    WebDriverWait(driver, config.APPLY_WAIT_TIMEOUT).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "div[role='dialog'], .jobs-easy-apply-modal"))
+                    )
             except Exception:
-                break
+                return False, "Easy Apply not found"
 
-        print("⚠️ Complex LinkedIn apply form detected (manual input required).")
-        return False, "Complex flow (manual)"
+            for _ in range(6):
+                try:
+                    submit = driver.find_element(By.XPATH, "//button[contains(., 'Submit') or contains(., 'Done') or contains(., 'Apply')]")
+                    if submit.is_enabled():
+                        with TIMINGS.step("linkedin", "submit"):
+                            submit.click()
+                            wait_for_stale(driver, submit)
+                        return True, "Submitted successfully"
+                except NoSuchElementException:
+                    pass
 
-    except Exception as e:
-        print(f"⚠️ LinkedIn apply error: {e}")
-        traceback.print_exc()
-        return False, str(e)
-    finally:
-        driver.quit()
+                try:
+                    next_btn = driver.find_element(By.XPATH, "//button[contains(., 'Next') or contains(., 'Continue')]")
+                    with TIMINGS.step("linkedin", "next_page"):
+                        next_btn.click()
+                        wait_for_stale(driver, next_btn, timeout=5)
+                except Exception:
+                    break
+
+            print("⚠️ Complex LinkedIn apply form detected (manual input required).")
+            return False, "Complex flow (manual)"
+
+        except Exception as e:
+            print(f"⚠️ LinkedIn apply error: {e}")
+            traceback.print_exc()
+            session.broken = True
+            return False, str(e)
 
 
 # ======================================
 # INTERNSHALA APPLY
 # ======================================
-def apply_internshala(job_url, email=None, password=None, headless=False):
-    """Automate Internshala apply."""
-    if not email or not password:
-        print("⚠️ Internshala credentials missing.")
-        return False, "No credentials"
-
-    driver = create_driver(headless=headless)
-    try:
+def login_internshala(driver, email, password):
+    """Log in on Internshala; returns (ok, reason)."""
+    with TIMINGS.step("internshala", "login"):
         driver.get("https://internshala.com/users/sign_in")
         WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "user_email")))
 
         driver.find_element(By.ID, "user_email").send_keys(email)
         driver.find_element(By.ID, "user_password").send_keys(password)
+        login_url = driver.current_url
         driver.find_element(By.NAME, "commit").click()
-        time.sleep(3)
+        wait_for_url_change(driver, login_url, timeout=15)
 
-        if "otp" in driver.current_url or "verify" in driver.current_url:
-            print("⚠️ OTP verification required on Internshala.")
-            return False, "OTP verification required"
+    if "otp" in driver.current_url or "verify" in driver.current_url:
+        print("⚠️ OTP verification required on Internshala.")
+        return False, "OTP verification required"
+    return True, "Logged in"
 
-        driver.get(job_url)
-        time.sleep(3)
 
-        print(f"🔎 Checking for Apply button on Internshala...")
+def apply_internshala(job_url, email=None, password=None, headless=False, pool=None):
+    """Automate Internshala apply."""
+    if not email or not password:
+        print("⚠️ Internshala credentials missing.")
+        return False, "No credentials"
+
+    with borrow_driver("internshala", headless, pool) as session:
+        driver = session.driver
         try:
-            apply_btn = driver.find_element(By.XPATH, "//a[contains(@class,'apply_button') or contains(text(),'Apply Now') or contains(text(),'Apply')]")
-            apply_btn.click()
-            time.sleep(2)
+            if not session.logged_in:
+                ok, reason = login_internshala(driver, email, password)
+                if not ok:
+                    return False, reason
+                session.mark_logged_in()
+
+            open_page(driver, "internshala", job_url)
+
+            print(f"🔎 Checking for Apply button on Internshala...")
+            try:
+                apply_btn = driver.find_element(By.XPATH, "//a[contains(@class,'apply_button') or contains(text(),'Apply Now') or contains(text(),'Apply')]")
+                with TIMINGS.step("internshala", "open_form"):
+                    apply_btn.click()
+                    submit = WebDriverWait(driver, config.APPLY_WAIT_TIMEOUT).until(
+                        EC.element_to_be_clickable((By.XPATH, "//input[@type='submit' or @value='Apply' or @value='Submit']"))
+                    )
+            except NoSuchElementException:
+                return False, "Apply button not found"
+            except TimeoutException:
+                return True, "Apply clicked - manual finalize"
 
             try:
-                submit = driver.find_element(By.XPATH, "//input[@type='submit' or @value='Apply' or @value='Submit']")
-                submit.click()
-                time.sleep(2)
+                with TIMINGS.step("internshala", "submit"):
+                    submit.click()
+                    wait_for_stale(driver, submit)
                 return True, "Submitted successfully"
             except Exception:
                 return True, "Apply clicked - manual finalize"
-        except NoSuchElementException:
-            return False, "Apply button not found"
-    except Exception as e:
-        print(f"⚠️ Internshala apply error: {e}")
-        traceback.print_exc()
-        return False, str(e)
-    finally:
-        driver.quit()
+        except Exception as e:
+            print(f"⚠️ Internshala apply error: {e}")
+            traceback.print_exc()
+            session.broken = True
+            return False, str(e)
 
 
 # ======================================
 # WELLFOUND (ANGELLIST)
 # ======================================
-def apply_wellfound(job_url, email=None, password=None, headless=False):
+def apply_wellfound(job_url, email=None, password=None, headless=False, pool=None):
     """Best-effort for Wellfound (AngelList)."""
-    driver = create_driver(headless=headless)
-    try:
-        driver.get(job_url)
-        time.sleep(2)
+    with borrow_driver("wellfound", headless, pool) as session:
+        driver = session.driver
+        try:
+            open_page(driver, "wellfound", job_url)
 
-        print(f"🔎 Checking for Apply button on Wellfound...")
-        if safe_click(driver, By.XPATH, "//button[contains(., 'Apply') or contains(., 'Apply now') or contains(., 'Quick Apply')]"):
-            return True, "Clicked apply"
-        return False, "No standard apply button found"
-    except Exception as e:
-        print(f"⚠️ Wellfound apply error: {e}")
-        traceback.print_exc()
-        return False, str(e)
-    finally:
-        driver.quit()
+            print(f"🔎 Checking for Apply button on Wellfound...")
+            with TIMINGS.step("wellfound", "click_apply"):
+                clicked = safe_click(driver, By.XPATH, "//button[contains(., 'Apply') or contains(., 'Apply now') or contains(., 'Quick Apply')]")
+            if clicked:
+                return True, "Clicked apply"
+            return False, "No standard apply button found"
+        except Exception as e:
+            print(f"⚠️ Wellfound apply error: {e}")
+            traceback.print_exc()
+            session.broken = True
+            return False, str(e)
 
 
 # ======================================
 # JOBRIGHT APPLY
 # ======================================
-def apply_jobright(job_url, email=None, password=None, headless=False):
+def apply_jobright(job_url, email=None, password=None, headless=False, pool=None):
     """Basic Jobright apply automation."""
-    driver = create_driver(headless=headless)
-    try:
-        driver.get(job_url)
-        time.sleep(3)
-
-        print(f"🔎 Checking for Apply link on Jobright...")
+    with borrow_driver("jobright", headless, pool) as session:
+        driver = session.driver
         try:
-            apply_btn = driver.find_element(By.XPATH, "//a[contains(., 'Apply') or contains(., 'Apply now') or contains(., 'Apply on company site')]")
-            apply_btn.click()
-            time.sleep(3)
-            return True, "Clicked apply"
-        except NoSuchElementException:
-            return False, "Apply button not found"
-    except Exception as e:
-        print(f"⚠️ Jobright apply error: {e}")
-        traceback.print_exc()
-        return False, str(e)
-    finally:
-        driver.quit()
+            open_page(driver, "jobright", job_url)
+
+            print(f"🔎 Checking for Apply link on Jobright...")
+            try:
+                apply_btn = driver.find_element(By.XPATH, "//a[contains(., 'Apply') or contains(., 'Apply now') or contains(., 'Apply on company site')]")
+                windows, url = len(driver.window_handles), driver.current_url
+                with TIMINGS.step("jobright", "click_apply"):
+                    apply_btn.click()
+                    try:
+                        # the link opens the company site in a new tab or the same one
+                        WebDriverWait(driver, config.APPLY_WAIT_TIMEOUT).until(
+                            lambda d: len(d.window_handles) > windows or d.current_url != url
+                        )
+                    except TimeoutException:
+                        pass
+                return True, "Clicked apply"
+            except NoSuchElementException:
+                return False, "Apply button not found"
+        except Exception as e:
+            print(f"⚠️ Jobright apply error: {e}")
+            traceback.print_exc()
+            session.broken = True
+            return False, str(e)
@@ -0,0 +1,186 @@
+# batch_scorer.py
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import config
+from llm_router import LLMRouter
+from structured_output import STATS, parse_batch
+
+# Bump when BATCH_PROMPT changes so cached scores from the old prompt are not reused
+PROMPT_VERSION = "batch-v1"
+
+SYSTEM_PROMPT = "You are a precise AI/ML relevance evaluator."
+
+BATCH_PROMPT = """
+You are an AI internship analyzer. Rate each job description below from 1 to 10 for AI/ML relevance.
+Return JSON only, with exactly one entry per job id:
+{{
+  "results": [
+    {{"id": <job id>, "score": <number>, "summary": "<short reasoning>"}}
+  ]
+}}
+Jobs:
+{jobs}
+"""
+
+FAILED = {"score": 0, "summary": "Analysis failed"}
+# result placeholder for items whose LLM call raised (not worth re-querying at once)
+_CALL_FAILED = object()
+
+
+# ======================================
+# PROMPT / RESPONSE
+# ======================================
+def build_batch_prompt(descriptions):
+    jobs = "\n".join(f"{i}. {d}" for i, d in enumerate(descriptions, 1))
+    return BATCH_PROMPT.format(jobs=jobs)
+
+
+# ======================================
+# RATE LIMITER
+# ======================================
+class RateLimiter:
+    """Thread-safe limiter spacing calls at least 60/per_minute seconds apart."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+# ======================================
+# BATCH SCORING
+# ======================================
+def _complete(client, prompt, models):
+    """(reply text, the "provider:model" or model that gave it)."""
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+    if isinstance(client, LLMRouter):
+        # the router picks the model and fails over on its own
+        completion = client.complete(messages, json_mode=config.LLM_JSON_MODE)
+        return completion.text.strip(), f"{completion.provider}:{completion.model}"
+    last_error = None
+    for model in models:
+        try:
+            response = client.chat.completions.create(model=model, messages=messages)
+            return response.choices[0].message.content.strip(), model
+        except Exception as e:
+            print(f"⚠️ Batch scoring with {model} failed: {e}")
+            last_error = e
+    raise last_error
+
+
+def score_batch(client, descriptions, batch_size=None, models=None, limiter=None, max_workers=None):
+    """
+    Score many job descriptions with few LLM calls.
+
+    Descriptions are packed `batch_size` to a prompt and the prompts run
+    concurrently under `limiter`. Items missing or malformed in a batch reply
+    (after local repair) are re-queried on their own, up to LLM_PARSE_RETRIES
+    times; items whose call failed outright are not. Anything still unparsed
+    gets a score of 0. Results come back in input order, each with the
+    `model` that scored it.
+    """
+    descriptions = list(descriptions)
+    if not descriptions:
+        return []
+    batch_size = batch_size or config.LLM_BATCH_SIZE
+    models = models or config.GROQ_MODELS
+    # a router enforces each provider's own limits
+    limiter = limiter or RateLimiter(0 if isinstance(client, LLMRouter) else config.LLM_REQUESTS_PER_MINUTE)
+    max_workers = max_workers or config.LLM_CONCURRENCY
+
+    def _run(chunk):
+        limiter.wait()
+        try:
+            text, model = _complete(client, build_batch_prompt(chunk), models)
+        except Exception:
+            return [_CALL_FAILED] * len(chunk)
+        return [{**r, "model": model} if r else r for r in parse_batch(text, len(chunk))]
+
+    def _score(items):
+        chunks = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return [r for part in pool.map(_run, chunks) for r in part]
+
+    results = _score(descriptions)
+    for _ in range(config.LLM_PARSE_RETRIES):
+        missing = [i for i, r in enumerate(results) if r is None]
+        if not missing:
+            break
+        print(f"🔁 Re-querying {len(missing)} unparsed batch item(s)")
+        STATS.count(requeried=len(missing))
+        for i, r in zip(missing, _score([descriptions[i] for i in missing])):
+            results[i] = r
+
+    return [dict(r) if isinstance(r, dict) else dict(FAILED) for r in results]
+
+
+# ======================================
+# REPLAYABLE STUB CLIENT
+# ======================================
+def _reply(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class ReplayClient:
+    """
+    Offline stand-in for the Groq client (`client.chat.completions.create`).
+
+    With `client` set, calls are forwarded and every reply is appended to
+    the JSONL file at `path` (record mode). Without it, replies are served
+    from that file by prompt hash (replay mode); prompts that were never
+    recorded go to `responder(messages)` if given, else raise KeyError.
+    """
+
+    def __init__(self, path, client=None, responder=None):
+        self.path = path
+        self.client = client
+        self.responder = responder
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._recorded = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._recorded[entry["key"]] = entry["content"]
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    @staticmethod
+    def key(messages):
+        return hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _create(self, model=None, messages=None, **kwargs):
+        key = self.key(messages)
+        with self._lock:
+            self.calls += 1
+        if self.client is not None:
+            content = self.client.chat.completions.create(model=model, messages=messages, **kwargs) \
+                .choices[0].message.content
+            with self._lock:
+                self._recorded[key] = content
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"key": key, "model": model, "content": content}) + "\n")
+            return _reply(content)
+        if key in self._recorded:
+            return _reply(self._recorded[key])
+        if self.responder is not None:
+            return _reply(self.responder(messages))
+        raise KeyError(f"No recorded reply for prompt {key[:12]}")
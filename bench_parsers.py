@@ -0,0 +1,118 @@
+# bench_parsers.py
+"""
+Parser backend benchmark over the recorded board pages in fixtures/http.
+
+Every installed backend runs in its own process (so peak RSS is not shared)
+and parses the pages for a fixed time. "soup" is the old path: a full
+html.parser BeautifulSoup tree per page.
+
+    python bench_parsers.py [--seconds 3] [--inflate 1] [--json out.json]
+
+--inflate repeats each page's listing N times to stand in for the long
+result pages the live boards serve.
+"""
+import argparse
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import config
+
+
+def load_pages(inflate):
+    with open(os.path.join(config.HTTP_FIXTURE_DIR, "index.json"), "r", encoding="utf-8") as f:
+        index = json.load(f)
+    pages = []
+    for url, name in sorted(index.items()):
+        with open(os.path.join(config.HTTP_FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+            html = f.read()
+        start, end = html.find("<main>"), html.find("</main>")
+        if inflate > 1 and start != -1 and end != -1:
+            body = html[start + len("<main>"):end]
+            html = html[:start + len("<main>")] + body * inflate + html[end:]
+        pages.append((url, html))
+    return pages
+
+
+def _parsers():
+    import sources
+    return {a.search_url: a.parse for a in sources.enabled()}
+
+
+def run_one(backend, seconds, inflate):
+    """Child process (HTML_PARSER=<backend>): parse the pages, print a JSON result line."""
+    from html_backend import get_backend
+    parsers = _parsers()
+    pages = [(parsers[url], html) for url, html in load_pages(inflate) if url in parsers]
+    name = get_backend().name
+
+    # first round: warm-up + the output we compare across backends
+    jobs = [parse(html) for parse, html in pages]
+    digest = hashlib.sha1(json.dumps(jobs, sort_keys=True).encode("utf-8")).hexdigest()
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    parsed = nbytes = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        for parse, html in pages:
+            parse(html)
+            parsed += 1
+            nbytes += len(html)
+    elapsed = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        "backend": name,
+        "pages": parsed,
+        "seconds": round(elapsed, 3),
+        "pages_per_s": round(parsed / elapsed, 1),
+        "mb_per_s": round(nbytes / elapsed / 1e6, 2),
+        "peak_rss_kb": rss_after,
+        "rss_growth_kb": rss_after - rss_before,
+        "jobs": sum(len(j) for j in jobs),
+        "digest": digest,
+    }))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--inflate", type=int, default=1)
+    ap.add_argument("--json", help="also write the results to this file")
+    ap.add_argument("--backend", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.backend:
+        run_one(args.backend, args.seconds, args.inflate)
+        return
+
+    from html_backend import available_backends
+    results = []
+    for backend in available_backends():
+        out = subprocess.run(
+            [sys.executable, __file__, "--backend", backend, "--seconds", str(args.seconds),
+             "--inflate", str(args.inflate)],
+            capture_output=True, text=True, check=True, env={**os.environ, "HTML_PARSER": backend},
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    baseline = next(r for r in results if r["backend"] == "soup")
+    print(f"📊 Parser benchmark ({len(load_pages(1))} fixture pages, inflate x{args.inflate}, "
+          f"{args.seconds:.0f}s per backend)")
+    print(f"   {'backend':<14}{'pages/s':>10}{'MB/s':>8}{'speedup':>9}{'peak RSS':>11}{'jobs':>6}  same output")
+    for r in results:
+        print(f"   {r['backend']:<14}{r['pages_per_s']:>10}{r['mb_per_s']:>8}"
+              f"{r['pages_per_s'] / baseline['pages_per_s']:>8.1f}x{r['peak_rss_kb'] / 1024:>9.1f}MB"
+              f"{r['jobs']:>6}  {'yes' if r['digest'] == baseline['digest'] else 'NO'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"inflate": args.inflate, "seconds": args.seconds, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
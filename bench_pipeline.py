@@ -0,0 +1,300 @@
+# bench_pipeline.py
+"""
+End-to-end pipeline benchmark, fully offline.
+
+For each size, synthetic result pages for all four boards are generated
+from the recorded pages in fixtures/http (same markup, new titles,
+companies and posting ids) and the full `run` pipeline crawls them in
+replay mode: dedup, pre-filter, fake LLM provider with LLM_FAKE_LATENCY
+per call, and dry-run applies against the local pages in fixtures/apply.
+Every size runs in its own process, so peak RSS is per size.
+
+    python bench_pipeline.py [--sizes 100,1000,10000] [--save baseline.json]
+                             [--compare baseline.json] [--tolerance 0.15]
+
+--save writes the results (with the git commit) as JSON; --compare checks
+a run against such a file and exits 1 if jobs/s or peak RSS regressed by
+more than --tolerance. Runs are compared against the committed
+bench_baseline.json unless --compare names another file (or is given "").
+"""
+import argparse
+import html as htmllib
+import json
+import os
+import random
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "bench_baseline.json")
+QUERY = ("machine learning intern", "India")
+# the pipeline stages as they show up in tracing spans
+STAGES = {"fetch": "fetch_page", "parse": "parse", "score": "analyze_batch_with_groq",
+          "llm": "llm_call", "apply": "apply"}
+
+_ROW = re.compile(r'<div class="result-row".*?Share</button></div></div></div>\n', re.S)
+_POSTING_ID = re.compile(r"[0-9a-f]{24}|\d{7,}")
+
+ROLES = ["Machine Learning", "Data Science", "NLP", "Computer Vision", "MLOps", "AI Research",
+         "Deep Learning", "Data Analytics", "Generative AI", "Backend Engineering",
+         "Business Development", "Content Writing", "Graphic Design", "Sales", "Marketing", "HR"]
+AREAS = ["Speech", "Search", "Ranking", "Fraud", "Vision", "Recommendations", "Forecasting", "Robotics",
+         "Health", "Payments", "Ads", "Maps", "Chatbot", "Retail", "Climate", "Security", "Mobile", "Legal"]
+TEAMS = ["Platform", "Insights", "Labs", "Core", "Growth", "Infra", "Studio", "Ops", "Cloud", "Edge"]
+COMPANY_A = ["Quantum", "Pixel", "Verdant", "Lumen", "Nimbus", "Aster", "Cobalt", "Helix", "Orbit", "Saffron"]
+COMPANY_B = ["Analytics", "Forge", "Labs", "Systems", "Works", "Robotics", "Health", "Edtech", "Dynamics", "AI"]
+
+
+# ======================================
+# SYNTHETIC FIXTURES
+# ======================================
+def _templates():
+    """{adapter: (page head, [row html, parsed job], page tail)} from the recorded pages."""
+    import sources
+    with open(os.path.join(HERE, "fixtures", "http", "index.json"), "r", encoding="utf-8") as f:
+        index = json.load(f)
+    templates = {}
+    for adapter in sources.enabled():
+        with open(os.path.join(HERE, "fixtures", "http", index[adapter.search_url]), "r", encoding="utf-8") as f:
+            page = f.read()
+        rows = _ROW.findall(page)
+        jobs = adapter.parse(page)
+        if not rows or len(rows) != len(jobs):
+            raise ValueError(f"{adapter.name} fixture: {len(rows)} rows but {len(jobs)} parsed jobs")
+        head, tail = page[:page.find(rows[0])], page[page.rfind(rows[-1]) + len(rows[-1]):]
+        templates[adapter] = (head, list(zip(rows, jobs)), tail)
+    return templates
+
+
+def _listing(row, job, n, rng):
+    title = f"{rng.choice(ROLES)} Intern - {rng.choice(AREAS)} {rng.choice(TEAMS)}"
+    row = row.replace(htmllib.escape(job["title"], quote=False), htmllib.escape(title, quote=False))
+    if job["company"] != job["source"]:
+        company = f"{rng.choice(COMPANY_A)} {rng.choice(COMPANY_B)}"
+        row = row.replace(htmllib.escape(job["company"], quote=False), company)
+    posting_id = _POSTING_ID.findall(job["link"])[-1]
+    new_id = f"{n:024x}" if len(posting_id) == 24 and not posting_id.isdigit() else str(4_000_000_000 + n)
+    return row.replace(posting_id, new_id)
+
+
+def write_fixtures(fixture_dir, listings, seed=7):
+    """
+    Result pages holding `listings` jobs split over the boards, recorded
+    under `fixture_dir` for HTTP_MODE=replay. Each board's pages have as
+    many rows as its recorded page and end with an empty page, as a real
+    board would. Returns the number of pages per board.
+    """
+    from crawler import page_urls
+    from http_client import HttpClient
+
+    client = HttpClient(fixture_dir=fixture_dir, mode="record")
+    rng = random.Random(seed)
+    templates = _templates()
+    pages = {}
+    for i, (adapter, (head, rows, tail)) in enumerate(templates.items()):
+        count = listings // len(templates) + (1 if i < listings % len(templates) else 0)
+        per_page = len(rows)
+        n_pages = -(-count // per_page)
+        urls = list(page_urls(adapter, *QUERY, max_pages=n_pages + 1))
+        for p, url in enumerate(urls):
+            body = [_listing(*rows[n % per_page], n, rng) for n in range(p * per_page, min(count, (p + 1) * per_page))]
+            client._record(url, head + "".join(body) + tail)
+        pages[adapter.name] = n_pages
+    return pages
+
+
+# ======================================
+# ONE SIZE (child process)
+# ======================================
+def _stage_stats(registry):
+    from tracing import percentile
+    out = {}
+    for stage, span in STAGES.items():
+        samples = registry.samples(span)
+        if samples:
+            out[stage] = {"count": len(samples), "total": round(sum(samples), 3),
+                          "p50": round(percentile(samples, 50), 4), "p95": round(percentile(samples, 95), 4)}
+    return out
+
+
+def run_one(size, log_path):
+    """Child process (cwd = a scratch dir, env = bench settings): run the pipeline, print a JSON result line."""
+    import job_agent
+    import sources
+    import tracing
+
+    started = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log, redirect_stdout(log):
+        job_agent.main(crawl=True, resume=False, incremental=False)
+    elapsed = time.perf_counter() - started
+
+    # "fetched" is counted after dedup, so the raw listing count comes from the adapters
+    fetched = sum(s["jobs"] for s in sources.stats().values())
+    counts = Counter()
+    for c in tracing.REGISTRY.snapshot()["counters"]:
+        if c["name"] == "jobs":
+            counts[c["labels"]["stage"]] += c["value"]
+    print(json.dumps({
+        "listings": size,
+        "fetched": fetched,
+        "unique": counts["fetched"],
+        "scored": counts["scored"],
+        "applied": counts["applied"],
+        "seconds": round(elapsed, 3),
+        "jobs_per_s": round(fetched / elapsed, 1),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "stages": _stage_stats(tracing.REGISTRY),
+    }))
+
+
+def bench_size(size, args):
+    workdir = tempfile.mkdtemp(prefix=f"bench-{size}-")
+    try:
+        pages = write_fixtures(os.path.join(workdir, "fixtures"), size)
+        env = {
+            **os.environ,
+            "HTTP_MODE": "replay",
+            "HTTP_FIXTURE_DIR": os.path.join(workdir, "fixtures"),
+            "CRAWL_MODE": "true",
+            "CRAWL_QUERIES": "|".join(QUERY),
+            "CRAWL_MAX_PAGES": str(max(pages.values()) + 1),
+            "LLM_ROUTES": "fake:fake-model",
+            "LLM_FAKE_LATENCY": str(args.llm_latency),
+            "DRY_RUN": "true",
+            "DRY_RUN_LATENCY": str(args.apply_latency),
+            "APPLY_FIXTURE_DIR": os.path.join(HERE, "fixtures", "apply"),
+            "APPLY_SITE_INTERVALS": "linkedin=0,internshala=0,wellfound=0,jobright=0",
+            # a full apply budget, so the run scores every candidate instead of stopping early
+            "MAX_JOBS_TO_APPLY": str(size),
+            "SKILLS_JSON": os.path.join(HERE, "skills.json"),
+            "RESUME_FILE": os.path.join(HERE, "resume.txt"),
+            "RESUME_RUNS": "false",
+            "INCREMENTAL": "false",
+            "SCORE_CACHE_ENABLED": "false",
+            # score every candidate, streamed, rather than the resume top-k
+            "RANK_TOP_K": "0",
+            # synthetic listings have no detail pages to enrich from
+            "ENRICH_ENABLED": "false",
+            "METRICS_FILE": "",
+            "GMAIL_USER": "",
+            "GMAIL_PASS": "",
+        }
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--size", str(size), "--child"],
+            cwd=workdir, env=env, capture_output=True, text=True,
+        )
+        if out.returncode:
+            sys.exit(f"❌ {size} listings: benchmark run failed\n{out.stderr[-2000:]}\n"
+                     f"(log kept in {workdir}/run.log)")
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+    except BaseException:
+        args.keep = True
+        raise
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return result
+
+
+# ======================================
+# BASELINE
+# ======================================
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Print the change against a saved baseline; returns the regressions found."""
+    before = {r["listings"]: r for r in baseline["results"]}
+    regressions = []
+    print(f"\n📏 Against baseline {baseline.get('commit') or '?'} ({baseline.get('created', '?')}):")
+    for r in results:
+        old = before.get(r["listings"])
+        if not old:
+            print(f"   {r['listings']:>6} listings: not in baseline")
+            continue
+        speed = r["jobs_per_s"] / old["jobs_per_s"] - 1 if old["jobs_per_s"] else 0.0
+        rss = r["peak_rss_kb"] / old["peak_rss_kb"] - 1 if old["peak_rss_kb"] else 0.0
+        flags = []
+        if speed < -tolerance:
+            flags.append("slower")
+        if rss > tolerance:
+            flags.append("more memory")
+        print(f"   {r['listings']:>6} listings: jobs/s {speed:+.1%}, peak RSS {rss:+.1%}"
+              + (f"  ⚠️ {', '.join(flags)}" if flags else ""))
+        regressions += [(r["listings"], f) for f in flags]
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="100,1000,10000", help="comma-separated listing counts")
+    ap.add_argument("--llm-latency", type=float, default=0.05, help="seconds per fake LLM call")
+    ap.add_argument("--apply-latency", type=float, default=0.005, help="seconds per dry-run apply")
+    ap.add_argument("--save", help="write the results to this JSON file")
+    ap.add_argument("--compare", default=BASELINE if os.path.exists(BASELINE) else None,
+                    help="baseline JSON file to compare against (default: bench_baseline.json; \"\" to skip)")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    ap.add_argument("--keep", action="store_true", help="keep the scratch dirs (fixtures, run.log)")
+    ap.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        run_one(args.size, "run.log")
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = []
+    for size in sizes:
+        print(f"⏱️ {size} listings...", flush=True)
+        results.append(bench_size(size, args))
+
+    print(f"\n📊 Pipeline benchmark (fake LLM {args.llm_latency * 1000:.0f}ms/call, "
+          f"dry-run apply {args.apply_latency * 1000:.0f}ms)")
+    print(f"   {'listings':>8}{'fetched':>9}{'unique':>8}{'scored':>8}{'applied':>9}{'seconds':>9}{'jobs/s':>9}"
+          f"{'peak RSS':>11}")
+    for r in results:
+        print(f"   {r['listings']:>8}{r['fetched']:>9}{r['unique']:>8}{r['scored']:>8}{r['applied']:>9}{r['seconds']:>9.2f}"
+              f"{r['jobs_per_s']:>9.1f}{r['peak_rss_kb'] / 1024:>9.1f}MB")
+    print(f"\n   {'listings':>8} {'stage':<7}{'calls':>8}{'total s':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for r in results:
+        for stage, s in r["stages"].items():
+            print(f"   {r['listings']:>8} {stage:<7}{s['count']:>8}{s['total']:>9.2f}"
+                  f"{s['p50'] * 1000:>9.1f}{s['p95'] * 1000:>9.1f}")
+
+    report = {
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "llm_latency": args.llm_latency,
+        "apply_latency": args.apply_latency,
+        "results": results,
+    }
+    # read before --save, which may be refreshing the very same file
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\n📝 Results written to {args.save}")
+    if baseline and compare(results, baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
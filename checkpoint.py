@@ -0,0 +1,193 @@
+# checkpoint.py
+import json
+import os
+import struct
+import time
+
+import config
+
+_OFFSET = struct.Struct("<Q")
+_STATE = "state.json"
+
+
+class JsonlLog:
+    """
+    Append-only JSONL file with an offset index next to it (<path>.idx, one
+    little-endian uint64 byte offset per record), so a reader can seek
+    straight to record n instead of re-reading the file.
+
+    Records are flushed as they are appended, so a killed process loses at
+    most the line it was writing. On open, a torn last line is cut off and
+    the index is rebuilt if it does not describe the data exactly.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._offsets = self._recover()
+        self._data = open(self.path, "ab")
+        self._index = open(self.index_path, "ab")
+        self._end = self._data.seek(0, os.SEEK_END)
+
+    # ---------- crash recovery ----------
+    def _complete_end(self):
+        """Byte length of the data file up to and including its last newline."""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            while pos > 0:
+                step = min(65536, pos)
+                f.seek(pos - step)
+                chunk = f.read(step)
+                nl = chunk.rfind(b"\n")
+                if nl != -1:
+                    return pos - step + nl + 1
+                pos -= step
+        return 0
+
+    def _recover(self):
+        end = self._complete_end()
+        with open(self.path, "ab") as f:
+            f.truncate(end)
+
+        offsets = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+            offsets = [o for (o,) in _OFFSET.iter_unpack(raw[:len(raw) - len(raw) % _OFFSET.size]) if o < end]
+
+        if not self._index_matches(offsets, end):
+            offsets = []
+            with open(self.path, "rb") as f:
+                pos = 0
+                for line in f:
+                    offsets.append(pos)
+                    pos += len(line)
+        with open(self.index_path, "wb") as f:
+            f.write(b"".join(_OFFSET.pack(o) for o in offsets))
+        return offsets
+
+    def _index_matches(self, offsets, end):
+        if not offsets:
+            return end == 0
+        if offsets[0] != 0:
+            return False
+        # the last indexed record must be exactly the last line of the file
+        with open(self.path, "rb") as f:
+            f.seek(offsets[-1])
+            tail = f.read(end - offsets[-1])
+        return tail.count(b"\n") == 1
+
+    # ---------- writing / reading ----------
+    def append(self, record):
+        self.extend([record])
+
+    def extend(self, records):
+        lines, offsets = [], []
+        for record in records:
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            offsets.append(self._end)
+            self._end += len(line)
+            lines.append(line)
+        if not lines:
+            return
+        # data before index: a crash in between only leaves the index short, which _recover repairs
+        self._data.write(b"".join(lines))
+        self._data.flush()
+        self._index.write(b"".join(_OFFSET.pack(o) for o in offsets))
+        self._index.flush()
+        self._offsets.extend(offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def read(self, start=0):
+        """Records start, start+1, ... as of now (records appended meanwhile are not included)."""
+        count = len(self._offsets)
+        if start >= count:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[start])
+            for _ in range(count - start):
+                yield json.loads(f.readline())
+
+    def close(self, fsync=True):
+        for f in (self._data, self._index):
+            if fsync:
+                os.fsync(f.fileno())
+            f.close()
+
+
+class Run:
+    """
+    One resumable pipeline run: runs/<run_id>/ holds a JsonlLog per stage
+    output (fetched, scored, applied) and state.json with the stage
+    bookkeeping (which stages finished, how far each one has read its input).
+    """
+
+    def __init__(self, run_id, root=None):
+        self.run_id = run_id
+        self.dir = os.path.join(root or config.RUNS_DIR, run_id)
+        os.makedirs(self.dir, exist_ok=True)
+        self._logs = {}
+        self.state = {"run_id": run_id, "created_at": time.time(), "finished": False, "done": [], "cursors": {}}
+        path = os.path.join(self.dir, _STATE)
+        self.resumed = os.path.exists(path)
+        if self.resumed:
+            with open(path, "r", encoding="utf-8") as f:
+                self.state.update(json.load(f))
+        else:
+            self._save()
+
+    @classmethod
+    def open(cls, resume=True, root=None):
+        """The latest run if `resume` is set and it did not finish, otherwise a new one."""
+        root = root or config.RUNS_DIR
+        existing = sorted(os.listdir(root)) if os.path.isdir(root) else []
+        if resume and existing:
+            run = cls(existing[-1], root)
+            if not run.state["finished"]:
+                return run
+        run_id = time.strftime("%Y%m%d-%H%M%S")
+        while run_id in existing:
+            run_id += "x"
+        return cls(run_id, root)
+
+    def log(self, name):
+        if name not in self._logs:
+            self._logs[name] = JsonlLog(os.path.join(self.dir, f"{name}.jsonl"))
+        return self._logs[name]
+
+    def _save(self):
+        path = os.path.join(self.dir, _STATE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def is_done(self, stage):
+        return stage in self.state["done"]
+
+    def mark_done(self, stage):
+        if stage not in self.state["done"]:
+            self.state["done"].append(stage)
+            self._save()
+
+    def cursor(self, stage):
+        return self.state["cursors"].get(stage, 0)
+
+    def set_cursor(self, stage, position):
+        self.state["cursors"][stage] = position
+        self._save()
+
+    def finish(self):
+        self.state["finished"] = True
+        self.state["finished_at"] = time.time()
+        self._save()
+
+    def close(self):
+        for log in self._logs.values():
+            log.close()
+        self._logs = {}
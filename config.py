@@ -23,6 +23,21 @@ JOBRIGHT_PASSWORD = os.getenv("JOBRIGHT_PASSWORD")
 # Email notify
 GMAIL_USER = os.getenv("GMAIL_USER")
 GMAIL_PASS = os.getenv("GMAIL_PASS")
+NOTIFY_TO = os.getenv("NOTIFY_TO") or ""  # default: GMAIL_USER
+SMTP_HOST = os.getenv("SMTP_HOST") or "smtp.gmail.com"
+SMTP_PORT = int(os.getenv("SMTP_PORT") or 587)
+SMTP_STARTTLS = (os.getenv("SMTP_STARTTLS") or "true").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT") or 30)
+# close the pooled SMTP connection after this long without mail (servers drop idle ones anyway)
+SMTP_IDLE_CLOSE = float(os.getenv("SMTP_IDLE_CLOSE") or 120)
+# events within this many seconds of the first pending one go out as one digest (0 = one email each)
+NOTIFY_DIGEST_SECONDS = float(os.getenv("NOTIFY_DIGEST_SECONDS") or 600)
+NOTIFY_RETRIES = int(os.getenv("NOTIFY_RETRIES") or 4)
+NOTIFY_BACKOFF = float(os.getenv("NOTIFY_BACKOFF") or 2)  # seconds, doubled per retry
+NOTIFY_BACKOFF_MAX = float(os.getenv("NOTIFY_BACKOFF_MAX") or 60)
+NOTIFY_QUEUE_SIZE = int(os.getenv("NOTIFY_QUEUE_SIZE") or 1000)
+# how long the end of a run waits for the last digest to go out
+NOTIFY_CLOSE_TIMEOUT = float(os.getenv("NOTIFY_CLOSE_TIMEOUT") or 60)
 
 # Scraper URLs
 INTERNSHALA_SEARCH_URL = "https://internshala.com/internships/keywords-ai-machine-learning"
@@ -30,12 +45,180 @@ LINKEDIN_SEARCH_URL = "https://www.linkedin.com/jobs/search/?keywords=AI%20Machi
 WELLFOUND_SEARCH_URL = "https://wellfound.com/role/machine-learning-intern"
 JOBRIGHT_SEARCH_URL = "https://www.jobright.ai/jobs?q=machine+learning+intern"
 
+# Enabled job boards, one sources/<name>.py adapter each (imported on first use)
+SOURCES = [s.strip().lower() for s in (os.getenv("SOURCES") or "internshala,linkedin,wellfound,jobright").split(",")
+           if s.strip()]
+
+# Shared HTTP client (pooled session, conditional-request cache, retries)
+# HTTP_MODE: live | record (also save pages to HTTP_FIXTURE_DIR) | replay (offline, fixtures only)
+HTTP_MODE = os.getenv("HTTP_MODE") or "live"
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR") or ".http_cache"
+HTTP_CACHE_TTL = int(os.getenv("HTTP_CACHE_TTL") or 300)
+HTTP_FIXTURE_DIR = os.getenv("HTTP_FIXTURE_DIR") or os.path.join("fixtures", "http")
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT") or 10)
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES") or 3)
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF") or 1.0)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE") or 10)
+
+# HTML parser backend for the board parsers:
+# auto | selectolax | lxml | soup-strained | soup (full BeautifulSoup parse, the old path)
+HTML_PARSER = (os.getenv("HTML_PARSER") or "auto").lower()
+
+# Crawl mode: walk result pages for many keyword/location queries
+# (CRAWL_QUERIES="machine learning intern|India;ai intern|Remote")
+CRAWL_MODE = (os.getenv("CRAWL_MODE") or "false").lower() == "true"
+CRAWL_QUERIES = [
+    tuple((part.split("|", 1) + [""])[:2])
+    for part in (os.getenv("CRAWL_QUERIES") or "machine learning intern|India;ai intern|Remote").split(";")
+    if part.strip()
+]
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES") or 5)
+CRAWL_QUEUE_SIZE = int(os.getenv("CRAWL_QUEUE_SIZE") or 100)
+# Incremental mode: only postings new or changed since the last run reach scoring,
+# and crawls stop paging at the first page of known postings
+INCREMENTAL = (os.getenv("INCREMENTAL") or "false").lower() == "true"
+INTERNSHALA_CRAWL_URL = "https://internshala.com/internships/keywords-{keyword_slug}/page-{page}"
+LINKEDIN_CRAWL_URL = "https://www.linkedin.com/jobs/search/?keywords={keyword}&location={location}&start={offset}"
+WELLFOUND_CRAWL_URL = "https://wellfound.com/role/{keyword_slug}?page={page}"
+JOBRIGHT_CRAWL_URL = "https://www.jobright.ai/jobs?q={keyword}&location={location}&page={page}"
+
 # Runtime settings
 MAX_JOBS_TO_APPLY = int(os.getenv("MAX_JOBS_TO_APPLY") or 20)
 AI_RELEVANCE_THRESHOLD = int(os.getenv("AI_RELEVANCE_THRESHOLD") or 6)
 
+# Fetch engine (all boards are fetched concurrently)
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS") or 8)
+FETCH_PER_HOST_LIMIT = int(os.getenv("FETCH_PER_HOST_LIMIT") or 2)
+FETCH_DEADLINE = float(os.getenv("FETCH_DEADLINE") or 30)
+
+def _site_map(value, cast):
+    # "linkedin=1,internshala=2" -> {"linkedin": 1, "internshala": 2}
+    pairs = (item.split("=", 1) for item in value.split(",") if "=" in item)
+    return {k.strip().lower(): cast(v) for k, v in pairs}
+
+# Politeness (see politeness.py): per-host token buckets, requests/second; 0 = unpaced.
+# Rates adapt: +POLITENESS_STEP x base per success up to POLITENESS_SPEEDUP x base,
+# x POLITENESS_SLOWDOWN on a 429 (never below POLITENESS_FLOOR x base)
+FETCH_HOST_RATES = _site_map(os.getenv("FETCH_HOST_RATES") or
+                             "linkedin.com=0.5,internshala.com=1,wellfound.com=1,jobright.ai=1", float)
+FETCH_DEFAULT_RATE = float(os.getenv("FETCH_DEFAULT_RATE") or 1)
+POLITENESS_BURST = float(os.getenv("POLITENESS_BURST") or 3)
+POLITENESS_SPEEDUP = float(os.getenv("POLITENESS_SPEEDUP") or 2)
+POLITENESS_STEP = float(os.getenv("POLITENESS_STEP") or 0.05)
+POLITENESS_SLOWDOWN = float(os.getenv("POLITENESS_SLOWDOWN") or 0.5)
+POLITENESS_FLOOR = float(os.getenv("POLITENESS_FLOOR") or 0.1)
+# pause after a 429 without Retry-After, and after a CAPTCHA/OTP challenge
+THROTTLE_PAUSE = float(os.getenv("THROTTLE_PAUSE") or 30)
+CHALLENGE_PAUSE = float(os.getenv("CHALLENGE_PAUSE") or 900)
+
+# LLM scoring (jobs are packed LLM_BATCH_SIZE to a prompt)
+GROQ_MODELS = ["llama-3.3-70b-versatile", "llama-3.3-8b-instant"]
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE") or 10)
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY") or 2)
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE") or 30)
+
+# LLM router (llm_router.py): "provider:model" routes, "," within a tier, "|" between
+# fallback tiers. Within a tier calls go to the cheapest route by LLM_ROUTING
+# (latency | cost | balanced); the next tier is only used when a whole tier is down.
+LLM_ROUTES = os.getenv("LLM_ROUTES") or \
+    "groq:llama-3.3-70b-versatile,gemini:gemini-1.5-flash-latest|groq:llama-3.3-8b-instant"
+LLM_ROUTING = os.getenv("LLM_ROUTING") or "balanced"
+LLM_COST_WEIGHT = float(os.getenv("LLM_COST_WEIGHT") or 1000)  # seconds of latency one dollar is worth
+LLM_PROVIDER_RPM = _site_map(os.getenv("LLM_PROVIDER_RPM") or "groq=30,gemini=15,fake=0", float)
+LLM_PROVIDER_TPM = _site_map(os.getenv("LLM_PROVIDER_TPM") or "groq=12000,gemini=1000000,fake=0", float)
+LLM_PROVIDER_CONCURRENCY = _site_map(os.getenv("LLM_PROVIDER_CONCURRENCY") or "groq=2,gemini=2,fake=8", int)
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES") or 3)
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN") or 30)
+LLM_FAKE_LATENCY = float(os.getenv("LLM_FAKE_LATENCY") or 0.05)
+# Ask providers for JSON output where they support it (Groq response_format, Gemini mime type)
+LLM_JSON_MODE = (os.getenv("LLM_JSON_MODE") or "true").lower() == "true"
+# Batch items whose reply still does not parse after local repair are re-queried this many times
+LLM_PARSE_RETRIES = int(os.getenv("LLM_PARSE_RETRIES") or 1)
+# USD per million (input, output) tokens, used for cost routing and the metrics
+LLM_PRICES = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.3-8b-instant": (0.05, 0.08),
+    "gemini-1.5-flash-latest": (0.075, 0.30),
+}
+
+# Cross-source dedup (MinHash over title shingles + company check)
+DEDUP_ENABLED = (os.getenv("DEDUP_ENABLED") or "true").lower() == "true"
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD") or 0.8)
+
+# Local pre-filter (skills.json keyword score needed before any LLM call)
+PREFILTER_ENABLED = (os.getenv("PREFILTER_ENABLED") or "true").lower() == "true"
+PREFILTER_MIN_SCORE = int(os.getenv("PREFILTER_MIN_SCORE") or 2)
+PREFILTER_EXTRA_TERMS = [
+    t.strip() for t in (os.getenv("PREFILTER_EXTRA_TERMS") or "ai,ml,artificial intelligence,data science").split(",")
+    if t.strip()
+]
+
+# Enrichment: fetch each candidate's detail page (after the pre-filter and ranking) for its
+# description, company, location and stipend; kept in the job store, so fetched once per posting
+ENRICH_ENABLED = (os.getenv("ENRICH_ENABLED") or "true").lower() == "true"
+ENRICH_MAX_WORKERS = int(os.getenv("ENRICH_MAX_WORKERS") or 4)
+# description length sent to the LLM per job (0 = whole description)
+ENRICH_DESCRIPTION_TOKENS = int(os.getenv("ENRICH_DESCRIPTION_TOKENS") or 300)
+
+# Resume similarity ranking: only the RANK_TOP_K candidates closest to the resume reach the LLM.
+# Ranking needs every candidate first, so `run` fetches in full before scoring starts;
+# 0 turns it off and keeps fetch and scoring streamed together.
+RANK_TOP_K = int(os.getenv("RANK_TOP_K", "50") or 0)
+RANK_FEATURES = int(os.getenv("RANK_FEATURES") or 4096)
+
+# Score cache (SQLite, keyed by description + model + prompt version)
+SCORE_CACHE_ENABLED = (os.getenv("SCORE_CACHE_ENABLED") or "true").lower() == "true"
+SCORE_CACHE_FILE = os.getenv("SCORE_CACHE_FILE") or "score_cache.sqlite3"
+SCORE_CACHE_TTL = int(os.getenv("SCORE_CACHE_TTL_DAYS") or 14) * 86400
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("SCORE_CACHE_MAX_ENTRIES") or 50000)
+
+# Browser pool for auto-apply (one logged-in Chrome per site, reused across applies)
+DRIVER_POOL_PER_SITE = int(os.getenv("DRIVER_POOL_PER_SITE") or 1)
+DRIVER_MAX_USES = int(os.getenv("DRIVER_MAX_USES") or 25)
+DRIVER_COOKIE_DIR = os.getenv("DRIVER_COOKIE_DIR") or ".sessions"
+DRIVER_PROFILE_DIR = os.getenv("DRIVER_PROFILE_DIR") or ""
+
+# Apply executor (sites are applied to in parallel, each with its own cap and pacing)
+DRY_RUN = (os.getenv("DRY_RUN") or "false").split("#")[0].strip().lower() == "true"
+APPLY_HEADLESS = (os.getenv("APPLY_HEADLESS") or "true").lower() == "true"
+APPLY_MAX_WORKERS = int(os.getenv("APPLY_MAX_WORKERS") or 4)
+APPLY_SITE_LIMITS = _site_map(os.getenv("APPLY_SITE_LIMITS") or "linkedin=1,internshala=1,wellfound=2,jobright=2", int)
+APPLY_SITE_INTERVALS = _site_map(os.getenv("APPLY_SITE_INTERVALS") or "linkedin=20,internshala=10,wellfound=5,jobright=5", float)
+APPLY_FIXTURE_DIR = os.getenv("APPLY_FIXTURE_DIR") or os.path.join("fixtures", "apply")
+DRY_RUN_LATENCY = float(os.getenv("DRY_RUN_LATENCY") or 0.2)
+# an apply whose site is paused (see CHALLENGE_PAUSE) longer than this is skipped, not waited for
+APPLY_MAX_WAIT = float(os.getenv("APPLY_MAX_WAIT") or 120)
+
+# Daemon mode (`job_agent.py daemon`): a fetch cycle every DAEMON_INTERVAL seconds feeding
+# fetch -> filter -> enrich -> score -> apply -> notify stages over bounded queues of DAEMON_QUEUE_SIZE
+DAEMON_INTERVAL = float(os.getenv("DAEMON_INTERVAL") or 1800)
+DAEMON_WORKERS = _site_map(os.getenv("DAEMON_WORKERS") or "fetch=1,filter=1,enrich=4,score=2,apply=4,notify=1", int)
+DAEMON_QUEUE_SIZE = int(os.getenv("DAEMON_QUEUE_SIZE") or 100)
+# how long a score worker waits for a batch to fill before scoring what it has
+DAEMON_BATCH_WAIT = float(os.getenv("DAEMON_BATCH_WAIT") or 2)
+DAEMON_INCREMENTAL = (os.getenv("DAEMON_INCREMENTAL") or "true").lower() == "true"
+# status endpoint (GET /status JSON, /metrics Prometheus); empty port disables it
+DAEMON_STATUS_HOST = os.getenv("DAEMON_STATUS_HOST") or "127.0.0.1"
+DAEMON_STATUS_PORT = os.getenv("DAEMON_STATUS_PORT", "8765")
+
+# Apply waits (explicit WebDriverWait conditions instead of fixed sleeps)
+APPLY_WAIT_TIMEOUT = float(os.getenv("APPLY_WAIT_TIMEOUT") or 10)
+NETWORK_IDLE_QUIET = float(os.getenv("NETWORK_IDLE_QUIET") or 0.5)
+APPLY_TIMINGS_FILE = os.getenv("APPLY_TIMINGS_FILE") or "apply_timings.json"
+
 # Files
-APPLIED_JOBS_FILE = "applied_jobs.txt"
+APPLIED_JOBS_FILE = "applied_jobs.txt"  # legacy; imported once into JOB_STORE_FILE
+JOB_STORE_FILE = os.getenv("JOB_STORE_FILE") or "jobs.sqlite3"
 MATCHED_CSV = "matched_jobs.csv"
+# Resumable runs: each `run` checkpoints its stages under RUNS_DIR/<run id>/;
+# with RESUME_RUNS a restarted run continues the last unfinished one
+RUNS_DIR = os.getenv("RUNS_DIR") or "runs"
+RESUME_RUNS = (os.getenv("RESUME_RUNS") or "true").lower() == "true"
+# Run metrics (spans + counters) written at the end of each command; ".prom" = Prometheus textfile
+METRICS_FILE = os.getenv("METRICS_FILE", "run_metrics.json")
+# Profile every command with cprofile | pyinstrument (or pass --profile)
+PROFILE = os.getenv("PROFILE") or ""
+PROFILE_DIR = os.getenv("PROFILE_DIR") or "profiles"
 RESUME_FILE = os.getenv("RESUME_FILE") or "resume.txt"
+SKILLS_JSON = os.getenv("SKILLS_JSON") or "skills.json"
 MAX_JOBS_PER_SITE = 20
@@ -0,0 +1,119 @@
+# crawler.py
+import queue
+import re
+import threading
+from collections import namedtuple
+from urllib.parse import quote_plus
+
+import config
+from http_client import get_client
+
+# url_template may use {keyword}, {keyword_slug}, {location}, {location_slug},
+# {page} (1-based) and {offset} ((page - 1) * page_size).
+# Source adapters (sources.SourceAdapter) provide the same attributes and
+# fetch_page(), so they can be crawled directly.
+class CrawlSource(namedtuple("CrawlSource", ["name", "url_template", "parse", "page_size"])):
+    def fetch_page(self, url):
+        return get_client().get_parsed(url, self.parse)
+
+
+_DONE = object()
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", (text or "").lower()).strip("-")
+
+
+def page_urls(source, keyword, location="", max_pages=None):
+    """Yield the search page URLs of one query, page 1 first."""
+    max_pages = max_pages or config.CRAWL_MAX_PAGES
+    for page in range(1, max_pages + 1):
+        yield source.url_template.format(
+            keyword=quote_plus(keyword),
+            keyword_slug=_slug(keyword),
+            location=quote_plus(location),
+            location_slug=_slug(location),
+            page=page,
+            offset=(page - 1) * source.page_size,
+        )
+
+
+def crawl_source(source, queries, max_pages=None, tracker=None):
+    """
+    Walk the result pages of every query on one board, yielding job dicts.
+
+    A query stops early on an empty page, a failed request, or a page whose
+    links all repeat the previous page (boards that ignore the page param).
+    With an incremental.Tracker only new or changed postings are yielded,
+    and a query also stops at the first page of known postings.
+    """
+    for keyword, location in queries:
+        prev_links = set()
+        for page, url in enumerate(page_urls(source, keyword, location, max_pages)):
+            try:
+                jobs = source.fetch_page(url)
+            except Exception as e:
+                print(f"⚠️ {source.name} crawl stopped on {url}: {e}")
+                break
+            links = {j.get("link") for j in jobs}
+            if not jobs or links <= prev_links:
+                break
+            prev_links = links
+            if tracker is None:
+                yield from jobs
+                continue
+            fresh, reached_known = tracker.check(source.name, f"{keyword}|{location}", jobs, first_page=page == 0)
+            yield from fresh
+            if reached_known:
+                break
+
+
+def crawl_jobs(sources, queries, max_pages=None, queue_size=None, tracker=None):
+    """
+    Crawl all boards in parallel and stream jobs through a bounded queue.
+
+    Each board gets one producer thread (pages of a board are fetched in
+    order, boards overlap). The queue applies backpressure, so memory stays
+    bounded by `queue_size` however many pages are crawled, and the consumer
+    can start scoring the first jobs while later pages are still downloading.
+    Closing the generator early stops the producers.
+    """
+    q = queue.Queue(maxsize=queue_size or config.CRAWL_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def _put(item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(source):
+        try:
+            for job in crawl_source(source, queries, max_pages, tracker):
+                if not _put(job):
+                    return
+        except Exception as e:
+            print(f"⚠️ {source.name} crawler crashed: {e}")
+        finally:
+            _put(_DONE)
+
+    threads = [
+        threading.Thread(target=_produce, args=(s,), name=f"crawl-{s.name}", daemon=True)
+        for s in sources
+    ]
+    for t in threads:
+        t.start()
+
+    running = len(threads)
+    try:
+        while running:
+            item = q.get()
+            if item is _DONE:
+                running -= 1
+                continue
+            yield item
+    finally:
+        stop.set()
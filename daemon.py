@@ -0,0 +1,343 @@
+# daemon.py
+"""
+Long-running mode: `python job_agent.py daemon`.
+
+Instead of paying startup and logins on every cron run, one process keeps
+them warm: the HTTP session, the LLM router and the apply backend
+(logged-in browsers) live for the whole process. Every DAEMON_INTERVAL
+seconds a fetch cycle starts (new or changed postings only, with
+DAEMON_INCREMENTAL) and its jobs flow through
+
+    fetch -> filter -> enrich -> score -> apply -> notify
+
+Each stage has DAEMON_WORKERS threads and a bounded inbox of
+DAEMON_QUEUE_SIZE, so a slow stage blocks the one feeding it instead of
+piling work up in memory. Cross-board duplicates are merged within a
+cycle; across cycles the job store and the incremental Tracker decide what
+is worth another look: an edited posting is scored again, and one that
+missed a cycle's apply budget or could not be scored comes back in the
+next cycle (see Tracker.defer). A cycle's fetch therefore waits for the
+previous cycle's jobs to clear the later stages. GET /status on
+DAEMON_STATUS_PORT shows queue depths and per-stage throughput; /metrics has the tracing registry in
+Prometheus format. SIGINT/SIGTERM finish the work in flight and exit.
+"""
+import json
+import queue
+import signal
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import config
+import job_agent
+import tracing
+
+_STOP = object()
+
+
+class Stage:
+    """
+    `workers` threads taking items from a bounded inbox and passing results
+    on with emit() to the next stage's inbox, blocking while it is full.
+    With `batch` > 1, handle() gets a list of up to `batch` items, collected
+    for at most `linger` seconds after the first.
+    """
+
+    def __init__(self, name, handle, workers=1, maxsize=None, batch=1, linger=0.0):
+        self.name = name
+        self.handle = handle
+        self.workers = max(1, workers)
+        self.batch = batch
+        self.linger = linger
+        self.inbox = queue.Queue(maxsize=maxsize or config.DAEMON_QUEUE_SIZE)
+        self.next = None
+        self.processed = self.emitted = self.errors = 0
+        self.busy = 0.0
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def emit(self, item):
+        if self.next is not None:
+            self.next.inbox.put(item)
+        with self._lock:
+            self.emitted += 1
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        for _ in self._threads:
+            self.inbox.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _take(self):
+        """(items, stop): the next batch, and whether this worker was told to stop."""
+        items = []
+        item = self.inbox.get()
+        deadline = time.monotonic() + self.linger
+        while item is not _STOP:
+            items.append(item)
+            if len(items) >= self.batch:
+                return items, False
+            try:
+                item = self.inbox.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return items, False
+        return items, True
+
+    def _work(self):
+        while True:
+            items, stop = self._take()
+            if items:
+                started = time.monotonic()
+                try:
+                    self.handle(items if self.batch > 1 else items[0], self.emit)
+                except Exception as e:
+                    with self._lock:
+                        self.errors += 1
+                    print(f"⚠️ {self.name} stage failed on {len(items)} item(s): {e}")
+                finally:
+                    now = time.monotonic()
+                    with self._lock:
+                        self.processed += len(items)
+                        self.busy += now - started
+                        self._recent.append((now, len(items)))
+                    for _ in items:
+                        self.inbox.task_done()
+            if stop:
+                self.inbox.task_done()
+                return
+
+    def status(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0][0] > 60:
+                self._recent.popleft()
+            return {
+                "workers": self.workers,
+                "queued": self.inbox.qsize(),
+                "capacity": self.inbox.maxsize,
+                "processed": self.processed,
+                "emitted": self.emitted,
+                "errors": self.errors,
+                "busy_seconds": round(self.busy, 2),
+                "per_minute": sum(n for _, n in self._recent),
+            }
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path in ("/", "/status"):
+            body, kind = json.dumps(self.server.agent.status(), indent=2), "application/json"
+        elif path == "/metrics":
+            body, kind = tracing.to_prometheus(tracing.REGISTRY.snapshot()), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", kind)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class Daemon:
+    def __init__(self, interval=None, workers=None, crawl=None, incremental=None, port=None):
+        from apply_executor import ApplyExecutor, create_backend
+        from prefilter import PreFilter
+
+        self.interval = config.DAEMON_INTERVAL if interval is None else interval
+        self.crawl = crawl
+        self.incremental = config.DAEMON_INCREMENTAL if incremental is None else incremental
+        self.port = config.DAEMON_STATUS_PORT if port is None else port
+        workers = {**config.DAEMON_WORKERS, **(workers or {})}
+
+        # warm state, kept for the life of the process
+        self.store = job_agent.open_store()
+        self.prefilter = PreFilter() if config.PREFILTER_ENABLED else None
+        self.enricher = job_agent.open_enricher(self.store)
+        self.executor = ApplyExecutor(create_backend(), max_workers=workers.get("apply", 1))
+        # up front: score workers racing to build the router on first use would each build one
+        job_agent.get_llm_router()
+
+        self.stages = [
+            Stage("fetch", self._fetch, workers.get("fetch", 1), maxsize=1),
+            Stage("filter", self._filter, workers.get("filter", 1), batch=50, linger=0.2),
+            Stage("enrich", self._enrich, workers.get("enrich", 1)),
+            Stage("score", self._score, workers.get("score", 1), batch=config.LLM_BATCH_SIZE,
+                  linger=config.DAEMON_BATCH_WAIT),
+            Stage("apply", self._apply, workers.get("apply", 1)),
+            Stage("notify", self._notify, workers.get("notify", 1), batch=20, linger=0.5),
+        ]
+        for stage, following in zip(self.stages, self.stages[1:]):
+            stage.next = following
+
+        self.started = time.time()
+        self.cycles = 0
+        self.last_cycle = None
+        self.applied = 0
+        self.counts = {"fetched": 0}
+        self._budget = config.MAX_JOBS_TO_APPLY
+        self._lock = threading.Lock()
+        self._filter_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server = None
+        self.status_url = None
+
+    # ---------- stages ----------
+    def _fetch(self, cycle, emit):
+        from dedup import Deduplicator, dedup_stream
+        from incremental import Tracker
+        # the previous cycle's jobs first: until their outcomes are stored, the Tracker would pass them on again
+        for stage in self.stages[1:]:
+            stage.inbox.join()
+        with self._lock:
+            self._budget = config.MAX_JOBS_TO_APPLY
+        tracker = Tracker(self.store) if self.incremental else None
+        # a fresh index per cycle: one kept across cycles would swallow postings the Tracker
+        # passes on as changed, and grow for as long as the process runs
+        deduper = Deduplicator() if config.DEDUP_ENABLED else None
+        jobs = job_agent.source_stream(self.crawl, tracker)
+        if deduper:
+            jobs = dedup_stream(jobs, deduper)
+        if tracker:
+            # hashes of the jobs passed on are stored with their score or apply outcome, not by save()
+            jobs = tracker.defer(jobs)
+        started, n = time.monotonic(), 0
+        for job in jobs:
+            emit(job)
+            n += 1
+        if tracker:
+            tracker.save()
+        with self._lock:
+            self.cycles += 1
+            self.last_cycle = {"cycle": cycle, "jobs": n, "seconds": round(time.monotonic() - started, 2),
+                               "finished_at": time.time()}
+        print(f"🔁 Cycle {cycle}: {n} {'new or changed ' if tracker else ''}listing(s) "
+              f"in {time.monotonic() - started:.1f}s")
+        if deduper:
+            print(deduper.report())
+
+    def _filter(self, jobs, emit):
+        # the pre-filter counters are not thread-safe
+        with self._filter_lock:
+            kept = list(job_agent.iter_candidates(jobs, self.store, self.prefilter, self.counts))
+        for job in kept:
+            emit(job)
+
+    def _enrich(self, job, emit):
+        # the stage's workers are the concurrency; each one fetches a single detail page at a time
+        emit(self.enricher.enrich_one(job) if self.enricher else job)
+
+    def _score(self, jobs, emit):
+        # reserve apply budget up front, so parallel score workers cannot overspend it
+        with self._lock:
+            room = min(self._budget, len(jobs))
+            self._budget -= room
+        queued = job_agent.process_batch(jobs, SimpleNamespace(submit=emit), room, self.store)
+        with self._lock:
+            self._budget += room - queued
+
+    def _apply(self, job, emit):
+        self.executor.submit(job).result()
+        for outcome in self.executor.poll():
+            emit(outcome)
+
+    def _notify(self, outcomes, emit):
+        applied = job_agent.record_outcomes(outcomes, self.store)
+        with self._lock:
+            self.applied += applied
+
+    # ---------- control ----------
+    def status(self):
+        with self._lock:
+            info = {
+                "uptime_seconds": round(time.time() - self.started),
+                "cycles": self.cycles,
+                "last_cycle": self.last_cycle,
+                "interval_seconds": self.interval,
+                "applied": self.applied,
+                "apply_budget_left": self._budget,
+            }
+        info["stages"] = {stage.name: stage.status() for stage in self.stages}
+        return info
+
+    def _serve_status(self):
+        if self.port in ("", None):
+            return
+        self._server = ThreadingHTTPServer((config.DAEMON_STATUS_HOST, int(self.port)), _StatusHandler)
+        self._server.agent = self
+        host, port = self._server.server_address[:2]
+        self.status_url = f"http://{host}:{port}/status"
+        threading.Thread(target=self._server.serve_forever, name="status", daemon=True).start()
+        print(f"📟 Status endpoint: {self.status_url}")
+
+    def _tick(self, max_cycles):
+        cycle = 0
+        while not self._stop.is_set():
+            cycle += 1
+            try:
+                self.stages[0].inbox.put_nowait(cycle)
+            except queue.Full:
+                print(f"⏭️ Cycle {cycle} skipped: the previous one is still fetching")
+            if max_cycles and cycle >= max_cycles:
+                self._stop.set()
+                return
+            self._stop.wait(self.interval)
+
+    def stop(self, *_):
+        if not self._stop.is_set():
+            print("\n🛑 Stopping: finishing the work in flight (Ctrl-C again to abort)")
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+        self._stop.set()
+
+    def run(self, max_cycles=None):
+        """Run until stopped (or for `max_cycles` cycles), then drain every stage and shut down."""
+        print(f"👹 Daemon: a cycle every {self.interval:g}s, workers "
+              + ", ".join(f"{s.name}={s.workers}" for s in self.stages))
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+        for stage in self.stages:
+            stage.start()
+        self._serve_status()
+        ticker = threading.Thread(target=self._tick, args=(max_cycles,), name="ticker", daemon=True)
+        ticker.start()
+        try:
+            self._stop.wait()
+            ticker.join()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        # upstream first: once a stage's inbox is empty and idle, nothing more reaches the next one
+        for stage in self.stages:
+            stage.inbox.join()
+            stage.stop()
+        self.executor.shutdown()
+        job_agent.close_notifier()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        print(f"\n📊 Daemon: {self.cycles} cycle(s), {self.counts['fetched']} listing(s) past dedup, "
+              f"{self.applied} applied")
+        if self.prefilter:
+            print(self.prefilter.report())
+        if self.enricher:
+            print(self.enricher.report())
+        job_agent.print_store_counts(self.store)
+        job_agent.print_apply_summary(self.executor)
+        job_agent.print_llm_stats()
+        self.store.close()
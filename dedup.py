@@ -0,0 +1,146 @@
+# dedup.py
+import re
+import zlib
+from collections import Counter, defaultdict
+
+import numpy as np
+
+import config
+import sources
+
+_MERSENNE = (1 << 61) - 1
+_PLACEHOLDER_COMPANIES = {"", "unknown", "linkedin", "internshala", "wellfound", "jobright"}
+_NOISE = re.compile(r"\b(?:internship|intern|trainee|remote|work from home|wfh|part time|full time|paid|unpaid)\b")
+
+
+def normalize_text(text):
+    text = re.sub(r"[^a-z0-9 ]+", " ", (text or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def company_of(job):
+    """The real company name, or "" when the board only gave its own name."""
+    company = normalize_text(job.get("company"))
+    return "" if company in _PLACEHOLDER_COMPANIES or company == normalize_text(job.get("source")) else company
+
+
+def shingles(text, k=3):
+    text = f" {text} "
+    return {text[i:i + k] for i in range(max(1, len(text) - k + 1))}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+class MinHasher:
+    """Fixed-seed MinHash over character shingles (vectorised with NumPy)."""
+
+    def __init__(self, num_perm=32, seed=7):
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+    def signature(self, shingle_set):
+        h = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set), dtype=np.uint64,
+                        count=len(shingle_set))
+        return ((self.a[:, None] * h[None, :] + self.b[:, None]) % _MERSENNE).min(axis=1)
+
+
+class Deduplicator:
+    """
+    Collapses the same posting seen on several boards into one record.
+
+    Exact matches are found by canonical URL. Near-duplicates are found by
+    MinHash-LSH over title shingles: only jobs sharing a band bucket are
+    compared (at most `max_scan` per bucket), so the cost stays
+    near-linear. Candidates must also match on company; when either side
+    has no real company name (LinkedIn/Wellfound/Jobright cards only carry
+    the board name), the titles must match more strictly instead.
+
+    The first copy is kept and gains `links`/`sources` lists holding every
+    copy's URL and board.
+    """
+
+    def __init__(self, threshold=None, num_perm=32, bands=8, max_scan=20):
+        self.threshold = threshold or config.DEDUP_THRESHOLD
+        self.max_scan = max_scan
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self._by_url = {}
+        self._buckets = defaultdict(list)
+        self._records = []
+        self.collapsed = Counter()
+
+    def _fingerprint(self, job):
+        title = normalize_text(_NOISE.sub(" ", normalize_text(job.get("title"))))
+        company = company_of(job)
+        return title, shingles(title), shingles(company) if company else None
+
+    def _is_same(self, fp, other):
+        (title, title_sh, company_sh), (_, other_title_sh, other_company_sh) = fp, other
+        if company_sh and other_company_sh:
+            return (jaccard(company_sh, other_company_sh) >= self.threshold
+                    and jaccard(title_sh, other_title_sh) >= self.threshold)
+        # no real company on one side: only merge long, near-identical titles
+        return len(title.split()) >= 3 and jaccard(title_sh, other_title_sh) >= 0.9
+
+    def add(self, job):
+        """Returns (record, is_new). Duplicates are merged into the existing record."""
+        url_key = sources.canonicalize(job.get("link"))
+        record = self._by_url.get(url_key) if url_key else None
+
+        fp = self._fingerprint(job)
+        keys = []
+        if record is None and fp[0]:
+            sig = self.hasher.signature(fp[1])
+            keys = [(i, sig[i * self.rows:(i + 1) * self.rows].tobytes()) for i in range(self.bands)]
+            for key in keys:
+                # newest entries first; the scan cap keeps generic titles from going quadratic
+                for idx in reversed(self._buckets.get(key, [])[-self.max_scan:]):
+                    if self._is_same(fp, self._records[idx][1]):
+                        record = self._records[idx][0]
+                        break
+                if record is not None:
+                    break
+
+        if record is not None:
+            if job.get("link") and job["link"] not in record["links"]:
+                record["links"].append(job["link"])
+            if job.get("source") and job["source"] not in record["sources"]:
+                record["sources"].append(job["source"])
+            if url_key:
+                self._by_url[url_key] = record
+            self.collapsed[job.get("source") or "unknown"] += 1
+            return record, False
+
+        job["links"] = [job["link"]] if job.get("link") else []
+        job["sources"] = [job["source"]] if job.get("source") else []
+        idx = len(self._records)
+        self._records.append((job, fp))
+        if url_key:
+            self._by_url[url_key] = job
+        for key in keys:
+            self._buckets[key].append(idx)
+        return job, True
+
+    def report(self):
+        total = sum(self.collapsed.values())
+        if not total:
+            return f"🧬 Dedup: {len(self._records)} unique jobs, no duplicates"
+        per_source = ", ".join(f"{s} {n}" for s, n in self.collapsed.most_common())
+        return f"🧬 Dedup: {len(self._records)} unique jobs, collapsed {total} duplicate(s) ({per_source})"
+
+
+def dedup_stream(jobs, deduper=None):
+    """Yield only the first copy of each posting; later copies are merged into it."""
+    deduper = deduper or Deduplicator()
+    for job in jobs:
+        record, is_new = deduper.add(job)
+        if is_new:
+            yield record
+
+
+def dedup_jobs(jobs, deduper=None):
+    return list(dedup_stream(jobs, deduper))
@@ -0,0 +1,193 @@
+# driver_pool.py
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import config
+import tracing
+
+# Where to check whether restored cookies still hold a session: (page, marker in
+# the URL we get bounced to when logged out)
+SESSION_CHECKS = {
+    "linkedin": ("https://www.linkedin.com/feed/", "login"),
+    "internshala": ("https://internshala.com/student/dashboard", "sign_in"),
+}
+
+
+class DriverSession:
+    """A browser owned by the pool plus the bookkeeping the pool needs."""
+
+    def __init__(self, site, driver):
+        self.site = site
+        self.driver = driver
+        self.uses = 0
+        self.logged_in = False
+        self.broken = False
+
+    def mark_logged_in(self):
+        self.logged_in = True
+
+    def healthy(self):
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class DriverPool:
+    """
+    Keeps logged-in Chrome instances per site across apply calls.
+
+    Up to `max_per_site` browsers are kept per site. Each one is
+    health-checked before being lent out and recycled after `max_uses`
+    applications or as soon as a caller marks it broken. Cookies are saved
+    to `cookie_dir` after a successful login and restored into fresh
+    browsers, so a recycled driver usually skips the login form.
+    """
+
+    def __init__(self, headless=False, max_per_site=None, max_uses=None, cookie_dir=None, factory=None):
+        self.headless = headless
+        self.max_per_site = max_per_site or config.DRIVER_POOL_PER_SITE
+        self.max_uses = max_uses or config.DRIVER_MAX_USES
+        self.cookie_dir = config.DRIVER_COOKIE_DIR if cookie_dir is None else cookie_dir
+        self._factory = factory
+        self._idle = {}
+        self._count = {}
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def _create(self, site):
+        with tracing.span("browser_start", site=site):
+            if self._factory:
+                driver = self._factory(site, self.headless)
+            else:
+                from auto_apply_agent import create_driver
+                profile = os.path.join(config.DRIVER_PROFILE_DIR, site) if config.DRIVER_PROFILE_DIR else None
+                driver = create_driver(headless=self.headless, profile_dir=profile)
+            session = DriverSession(site, driver)
+            self._restore_cookies(session)
+        return session
+
+    def _acquire(self, site):
+        while True:
+            session = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is closed")
+                    idle = self._idle.setdefault(site, [])
+                    if idle:
+                        session = idle.pop()
+                        break
+                    if self._count.get(site, 0) < self.max_per_site:
+                        self._count[site] = self._count.get(site, 0) + 1
+                        break
+                    self._cond.wait()
+            if session is None:
+                break
+            # outside the lock: a hung browser holds up this borrow only, not every site's
+            if session.healthy():
+                return session
+            print(f"♻️ Dropping dead {site} browser")
+            session.quit()
+            with self._cond:
+                self._count[site] -= 1
+                self._cond.notify()
+        try:
+            return self._create(site)
+        except Exception:
+            with self._cond:
+                self._count[site] -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, session):
+        session.uses += 1
+        recycle = session.broken or session.uses >= self.max_uses
+        with self._cond:
+            if recycle or self._closed:
+                self._count[session.site] -= 1
+            else:
+                self._idle[session.site].append(session)
+            self._cond.notify()
+        if recycle or self._closed:
+            session.quit()
+
+    @contextmanager
+    def borrow(self, site):
+        session = self._acquire(site)
+        try:
+            yield session
+        except Exception:
+            session.broken = True
+            raise
+        finally:
+            if session.logged_in and not session.broken:
+                self.save_cookies(session)
+            self._release(session)
+
+    def _cookie_path(self, site):
+        return os.path.join(self.cookie_dir, f"{site}.json") if self.cookie_dir else None
+
+    def save_cookies(self, session):
+        path = self._cookie_path(session.site)
+        if not path:
+            return
+        try:
+            os.makedirs(self.cookie_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(session.driver.get_cookies(), f)
+        except Exception as e:
+            print(f"⚠️ Could not save {session.site} cookies: {e}")
+
+    def _restore_cookies(self, session):
+        path = self._cookie_path(session.site)
+        check = SESSION_CHECKS.get(session.site)
+        if not path or not check or not os.path.exists(path):
+            return
+        url, logged_out_marker = check
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cookies = json.load(f)
+            session.driver.get(url)
+            for cookie in cookies:
+                cookie.pop("sameSite", None)
+                session.driver.add_cookie(cookie)
+            session.driver.get(url)
+            if logged_out_marker not in session.driver.current_url:
+                session.mark_logged_in()
+                print(f"🍪 Restored {session.site} session from cookies")
+        except Exception as e:
+            print(f"⚠️ Could not restore {session.site} cookies: {e}")
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            sessions = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for session in sessions:
+            session.quit()
+
+
+@contextmanager
+def borrow_driver(site, headless=False, pool=None):
+    """Borrow from `pool`, or fall back to a one-off browser that is quit afterwards."""
+    if pool is not None:
+        with pool.borrow(site) as session:
+            yield session
+        return
+    from auto_apply_agent import create_driver
+    session = DriverSession(site, create_driver(headless=headless))
+    try:
+        yield session
+    finally:
+        session.quit()
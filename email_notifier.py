@@ -1,28 +1,271 @@
 # email_notifier.py
+"""
+Email notifications, sent from a background thread.
+
+    notifier = Notifier()
+    notifier.notify("Applied to ML Intern at Acme", body)   # never blocks
+    ...
+    notifier.close()                                        # flush the last digest
+
+Events are queued and a worker thread coalesces them into digest emails:
+everything that arrives within NOTIFY_DIGEST_SECONDS of the first pending
+event goes out as one email (a lone event keeps its own subject). The
+worker keeps one authenticated SMTP connection open between digests and
+retries transient failures (4xx replies, dropped connections) with
+exponential backoff. If the queue is full, events are dropped and counted
+rather than stalling the apply loop.
+"""
+import queue
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from collections import Counter
+
 import config
+import tracing
+
+
+def _message(subject, body, sender, to_addr):
+    msg = MIMEMultipart()
+    msg["From"] = sender
+    msg["To"] = to_addr
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "plain"))
+    return msg
+
+
+def _transient(error):
+    """Worth retrying: the server said "try later" or the connection went away."""
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    return isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError))
+
+
+# ======================================
+# CONNECTION
+# ======================================
+class Mailer:
+    """One SMTP connection, opened (STARTTLS + login) on first use and reused until closed."""
+
+    def __init__(self, host=None, port=None, user=None, password=None, starttls=None, timeout=None):
+        self.host = host or config.SMTP_HOST
+        self.port = port or config.SMTP_PORT
+        self.user = config.GMAIL_USER if user is None else user
+        self.password = config.GMAIL_PASS if password is None else password
+        self.starttls = config.SMTP_STARTTLS if starttls is None else starttls
+        self.timeout = timeout or config.SMTP_TIMEOUT
+        self._smtp = None
+        self.connects = 0
+
+    @property
+    def connected(self):
+        return self._smtp is not None
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                smtp.starttls()
+            if self.password:
+                smtp.login(self.user, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        self.connects += 1
+
+    def send(self, msg):
+        # a reused connection may have been dropped by the server while idle: reconnect once
+        for fresh in ((False, True) if self.connected else (True,)):
+            if not self.connected:
+                self._connect()
+            try:
+                self._smtp.send_message(msg)
+                return
+            except smtplib.SMTPResponseException:
+                raise  # the server answered, so the connection itself is fine
+            except (OSError, smtplib.SMTPException) as e:
+                self.close()
+                if fresh or not isinstance(e, smtplib.SMTPServerDisconnected):
+                    raise
+
+    def close(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (OSError, smtplib.SMTPException):
+            smtp.close()
+
+
+# ======================================
+# BACKGROUND NOTIFIER
+# ======================================
+_FLUSH = object()
+_STOP = object()
+
+
+class Notifier:
+    def __init__(self, mailer=None, to_addr=None, sender=None, digest_seconds=None, retries=None,
+                 backoff=None, queue_size=None, idle_close=None):
+        self.mailer = mailer or Mailer()
+        self.sender = sender or self.mailer.user or ""
+        self.to_addr = to_addr or config.NOTIFY_TO or self.sender
+        self.digest_seconds = config.NOTIFY_DIGEST_SECONDS if digest_seconds is None else digest_seconds
+        self.retries = config.NOTIFY_RETRIES if retries is None else retries
+        self.backoff = config.NOTIFY_BACKOFF if backoff is None else backoff
+        self.idle_close = config.SMTP_IDLE_CLOSE if idle_close is None else idle_close
+        self._queue = queue.Queue(maxsize=queue_size or config.NOTIFY_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._flushed = threading.Condition(self._lock)
+        self._flushes_requested = self._flushes_done = 0
+        self.stats = Counter()
+
+    @property
+    def enabled(self):
+        return bool(self.to_addr and (self.mailer.password or not self.mailer.user))
+
+    def notify(self, subject, body):
+        """Queue one event for the next digest; returns at once."""
+        if not self.enabled:
+            if not self.stats["disabled"]:
+                print("⚠️ Email not sent: Gmail credentials not set in .env")
+            self.stats["disabled"] += 1
+            return False
+        self._start()
+        try:
+            self._queue.put_nowait((subject, body))
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+        self.stats["events"] += 1
+        return True
+
+    def flush(self, timeout=None):
+        """Send whatever is pending now and wait (up to `timeout`) until it is out."""
+        if self._thread is None:
+            return True
+        with self._lock:
+            self._flushes_requested += 1
+            ticket = self._flushes_requested
+        try:
+            self._queue.put(_FLUSH, timeout=timeout)
+        except queue.Full:
+            return False
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._flushes_done >= ticket, timeout)
+
+    def close(self, timeout=None):
+        """Flush the last digest, close the SMTP connection and stop the worker."""
+        if self._thread is None:
+            return
+        timeout = config.NOTIFY_CLOSE_TIMEOUT if timeout is None else timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print("⚠️ Notification queue still full at shutdown; pending emails dropped")
+            return
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"⚠️ Notifications still sending after {timeout:.0f}s; giving up on them")
+        self._thread = None
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="notifier", daemon=True)
+                self._thread.start()
+
+    # --- worker thread ---
+    def _worker(self):
+        pending, first_at = [], None
+        while True:
+            if pending:
+                timeout = max(0.0, first_at + self.digest_seconds - time.monotonic())
+            else:
+                timeout = self.idle_close if self.mailer.connected else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, tuple):
+                pending.append(item)
+                first_at = first_at or time.monotonic()
+                if self.digest_seconds > 0:
+                    continue
+            elif item is None and not pending:
+                self.mailer.close()  # idle long enough that the server would drop it anyway
+                continue
+            if pending:
+                self._deliver(pending)
+                pending, first_at = [], None
+            if item is _FLUSH:
+                with self._flushed:
+                    self._flushes_done += 1
+                    self._flushed.notify_all()
+            elif item is _STOP:
+                self.mailer.close()
+                return
+
+    def _digest(self, events):
+        if len(events) == 1:
+            return events[0]
+        subject = f"Job agent: {len(events)} updates ({events[0][0]}, ...)"
+        body = "\n\n".join(f"{i}. {subj}\n{text}" for i, (subj, text) in enumerate(events, 1))
+        return subject, body
+
+    def _deliver(self, events):
+        subject, body = self._digest(events)
+        msg = _message(subject, body, self.sender, self.to_addr)
+        for attempt in range(self.retries + 1):
+            try:
+                with tracing.span("smtp_send"):
+                    self.mailer.send(msg)
+            except Exception as e:
+                if attempt < self.retries and _transient(e):
+                    self.stats["retries"] += 1
+                    time.sleep(min(self.backoff * 2 ** attempt, config.NOTIFY_BACKOFF_MAX))
+                    continue
+                self.stats["failed"] += len(events)
+                print(f"⚠️ Failed to send email ({len(events)} update(s)): {e}")
+                return False
+            self.stats["emails"] += 1
+            self.stats["sent"] += len(events)
+            print(f"📧 Notification sent to {self.to_addr} ({len(events)} update(s))")
+            return True
+
+    def report(self):
+        s = self.stats
+        if not s["events"] and not s["dropped"]:
+            return "📧 Notifications: none queued"
+        line = (f"📧 Notifications: {s['sent']}/{s['events']} updates sent in {s['emails']} email(s) "
+                f"over {self.mailer.connects} SMTP connection(s)")
+        for key in ("retries", "failed", "dropped"):
+            if s[key]:
+                line += f", {s[key]} {key}"
+        return line
+
 
+@tracing.traced()
 def send_email(subject: str, body: str, to_addr: str = None):
-    to_addr = to_addr or config.GMAIL_USER
+    """Send one email right away, on its own connection (for one-off scripts)."""
+    to_addr = to_addr or config.NOTIFY_TO or config.GMAIL_USER
     if not config.GMAIL_USER or not config.GMAIL_PASS:
         print("⚠️ Email not sent: Gmail credentials not set in .env")
         return False
+    mailer = Mailer()
     try:
-        msg = MIMEMultipart()
-        msg["From"] = config.GMAIL_USER
-        msg["To"] = to_addr
-        msg["Subject"] = subject
-        msg.attach(MIMEText(body, "plain"))
-
-        server = smtplib.SMTP("smtp.gmail.com", 587)
-        server.starttls()
-        server.login(config.GMAIL_USER, config.GMAIL_PASS)
-        server.send_message(msg)
-        server.quit()
+        mailer.send(_message(subject, body, config.GMAIL_USER, to_addr))
         print(f"📧 Notification sent to {to_addr}")
         return True
     except Exception as e:
         print(f"⚠️ Failed to send email: {e}")
         return False
+    finally:
+        mailer.close()
@@ -0,0 +1,128 @@
+# enrich.py
+"""
+Detail-page enrichment for the jobs that passed the pre-filter.
+
+A listing card gives little more than a title and a link (LinkedIn,
+Wellfound and Jobright cards not even the company), which is too little to
+score on. Enricher fetches each job's detail page through the shared
+HttpClient (so per-host pacing and replay still apply) on a pool of
+ENRICH_MAX_WORKERS threads, has the board's adapter pull out description,
+company, location and stipend (SourceAdapter.parse_detail), and keeps them
+in the job store with the listing's content hash: a posting's page is
+fetched once, not once per run, and again only after the listing changed.
+The description is cut to ENRICH_DESCRIPTION_TOKENS before it reaches the
+scoring prompt (see job_agent.describe_job).
+
+    enricher = Enricher(store)
+    for job in enricher.stream(candidates):   # same jobs, same order
+        ...
+"""
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+import sources
+import tracing
+from http_client import get_client
+from incremental import content_hash
+from llm_router import CHARS_PER_TOKEN
+
+
+def truncate_tokens(text, budget):
+    """`text` cut on a word boundary to about `budget` tokens; a budget of 0 keeps it whole."""
+    limit = budget * CHARS_PER_TOKEN
+    if not text or budget <= 0 or len(text) <= limit:
+        return text or ""
+    cut = text.rfind(" ", 0, limit + 1)
+    return text[:cut if cut > limit // 2 else limit].rstrip() + " …"
+
+
+class Enricher:
+    def __init__(self, store, max_workers=None, token_budget=None, client=None):
+        self.store = store
+        self.max_workers = max_workers or config.ENRICH_MAX_WORKERS
+        self.token_budget = config.ENRICH_DESCRIPTION_TOKENS if token_budget is None else token_budget
+        self.client = client or get_client()
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, **amounts):
+        with self._lock:
+            self.stats.update(amounts)
+
+    def fetch(self, job, digest=None):
+        """
+        Details from the job's detail page, saved to the store with the
+        listing's `digest`; {} without an adapter or if the fetch fails.
+        """
+        adapter = sources.find(job)
+        if adapter is None:
+            self._count(skipped=1)
+            return {}
+        try:
+            with tracing.span("enrich", source=adapter.name):
+                details = adapter.parse_detail(self.client.get(job["link"]).text)
+        except Exception as e:
+            # not saved: the next run tries again
+            with self._lock:
+                self.stats["failed"] += 1
+                failed = self.stats["failed"]
+            if failed <= 3:
+                print(f"⚠️ No details for {job['title']} ({job['link']}): {e}")
+            return {}
+        self._count(fetched=1)
+        self.store.save_details(job["link"], details, digest)
+        return details
+
+    def merge(self, job, details):
+        """A copy of `job` with the details filled in; the description is truncated to the token budget."""
+        enriched = {**job}
+        for field in ("company", "location", "stipend"):
+            if details.get(field):
+                enriched[field] = details[field]
+        if details.get("description"):
+            enriched["description"] = truncate_tokens(details["description"], self.token_budget)
+        return enriched
+
+    def enrich_one(self, job):
+        if not job.get("link"):
+            self._count(skipped=1)
+            return job
+        # the listing card's hash: an edited posting's page is fetched again
+        digest = content_hash(job)
+        cached = self.store.details([job["link"]]).get(self.store.key(job["link"]))
+        if cached is not None and cached.get("content_hash") == digest:
+            self._count(cached=1)
+            details = cached
+        else:
+            if cached is not None:
+                self._count(stale=1)
+            details = self.fetch(job, digest)
+        tracing.count("jobs", stage="enriched" if details else "not_enriched")
+        return self.merge(job, details)
+
+    def stream(self, jobs):
+        """Yield `jobs` enriched, in their order, with up to 2 x max_workers detail pages in flight."""
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="enrich")
+        window = deque()
+        try:
+            for job in jobs:
+                window.append(pool.submit(self.enrich_one, job))
+                if len(window) >= 2 * self.max_workers:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def enrich(self, jobs):
+        return list(self.stream(jobs))
+
+    def report(self):
+        s = self.stats
+        line = f"🔎 Enrichment: {s['fetched']} detail page(s) fetched, {s['cached']} from the store"
+        for key in ("stale", "failed", "skipped"):
+            if s[key]:
+                line += f", {s[key]} {key}"
+        return line
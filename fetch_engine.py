@@ -0,0 +1,71 @@
+# fetch_engine.py
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+import config
+
+# A single unit of fetch work: `fn()` returns a list of job dicts.
+FetchTask = namedtuple("FetchTask", ["name", "url", "fn"])
+
+
+def _host(url):
+    return urlparse(url or "").netloc.lower() or "unknown"
+
+
+def run_fetchers(tasks, deadline=None, max_workers=None, per_host=None):
+    """
+    Run fetch tasks concurrently on a bounded thread pool.
+
+    Yields (task_name, jobs) as each task finishes. At most `per_host` tasks
+    hit the same host at once, and anything still running when `deadline`
+    seconds have passed is abandoned.
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return
+    deadline = config.FETCH_DEADLINE if deadline is None else deadline
+    max_workers = max_workers or config.FETCH_MAX_WORKERS
+    per_host = per_host or config.FETCH_PER_HOST_LIMIT
+
+    host_limits = {}
+    for task in tasks:
+        host_limits.setdefault(_host(task.url), threading.BoundedSemaphore(per_host))
+
+    def _run(task):
+        with host_limits[_host(task.url)]:
+            return task.fn() or []
+
+    started = time.monotonic()
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)), thread_name_prefix="fetch")
+    futures = {pool.submit(_run, t): t for t in tasks}
+    pending = set(futures)
+    try:
+        while pending:
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in done:
+                task = futures[fut]
+                try:
+                    jobs = fut.result()
+                except Exception as e:
+                    print(f"⚠️ {task.name} fetch crashed: {e}")
+                    jobs = []
+                yield task.name, jobs
+        if pending:
+            names = ", ".join(sorted(futures[f].name for f in pending))
+            print(f"⏱️ Fetch deadline ({deadline}s) reached, skipping: {names}")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_all(tasks, **kwargs):
+    """Convenience wrapper: run all tasks and return one flat job list."""
+    jobs = []
+    for _, batch in run_fetchers(tasks, **kwargs):
+        jobs += batch
+    return jobs
@@ -1,40 +1,52 @@
 # gemini_analyzer.py
-import os
-import json
-import google.generativeai as genai
-from dotenv import load_dotenv
+from functools import lru_cache
 
-load_dotenv()
-API_KEY = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-if API_KEY:
-    genai.configure(api_key=API_KEY)
-else:
-    print("⚠️ No Gemini key found in env.")
+import config
+from llm_router import LLMRouter, LLMUnavailable, ProviderUnavailable, Route, provider
+from score_cache import cached_score
+from structured_output import STATS, parse_score
 
 MODEL = "gemini-1.5-flash-latest"  # try this; if failing, switch to a model your key supports
+PROMPT_VERSION = "gemini-v1"
+
+
+@lru_cache(maxsize=None)
+def get_router():
+    """Gemini-only router on the shared provider, so the client and its rate limits are built once."""
+    try:
+        return LLMRouter([[Route(provider("gemini"), MODEL)]])
+    except ProviderUnavailable as e:
+        print("⚠️ Gemini unavailable:", e)
+        return None
 
 def analyze_with_gemini(description):
     """
     Returns dict: {'score': int, 'summary': str}
     """
-    try:
-        model = genai.GenerativeModel(MODEL)
-        prompt = f"""
+    return cached_score(description, MODEL, PROMPT_VERSION, _analyze_with_gemini)
+
+def _analyze_with_gemini(description):
+    router = get_router()
+    if not router:
+        return {"score": 0, "summary": "Analysis failed"}
+    prompt = f"""
 You are an AI internship analyzer. Score this internship description from 1 to 10 for relevance to AI/ML.
 Return output strictly as JSON with keys "score" and "summary".
 
 Description:
 {description}
 """
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        # try parse JSON
+    for attempt in range(1 + config.LLM_PARSE_RETRIES):
+        if attempt:
+            STATS.count(requeried=1)
         try:
-            data = json.loads(text)
-            return {"score": int(data.get("score", 0)), "summary": data.get("summary", "")}
-        except Exception:
-            # fallback: return 0 score with raw text as summary
-            return {"score": 0, "summary": text}
-    except Exception as e:
-        print("⚠️ Gemini analysis failed:", e)
-        return {"score": 0, "summary": "Analysis failed"}
+            text = router.complete([{"role": "user", "content": prompt}]).text.strip()
+        except LLMUnavailable as e:
+            print("⚠️ Gemini analysis failed:", e)
+            return {"score": 0, "summary": "Analysis failed"}
+        # fenced / prose-wrapped / slightly broken JSON is recovered here
+        result = parse_score(text)
+        if result:
+            return result
+    # fallback: return 0 score with raw text as summary
+    return {"score": 0, "summary": text}
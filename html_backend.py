@@ -0,0 +1,249 @@
+# html_backend.py
+import html as _html
+import re
+from collections import namedtuple
+from functools import lru_cache
+from importlib.util import find_spec
+
+import config
+
+# Parser libraries are imported by the backend that uses them, so only one
+# of them is loaded per run. BeautifulSoup is always there as the fallback.
+
+
+def _installed(*modules):
+    return all(find_spec(m) is not None for m in modules)
+
+
+# css: selectors tried in order until one matches.
+# strainer: (name, attrs) for SoupStrainer, so the soup backends only build
+# the job-card elements instead of the whole page.
+CardSpec = namedtuple("CardSpec", ["css", "strainer"])
+
+# Bump when a board's selectors or parse() change: http_client.get_parsed
+# reuses a page's parsed jobs only for the same backend and version.
+PARSER_VERSION = 1
+
+_MARKUP = re.compile(r"<(script|style)\b.*?</\1\s*>|<[^>]+>", re.S | re.I)
+_WIDGETS = re.compile(r"\b(?:show more|show less|see more|see less)\b", re.I)
+
+
+def clean_text(markup):
+    """
+    Readable text of an HTML fragment or plain string: tags become spaces,
+    entities are decoded (markup escaped inside JSON-LD too), "show more"
+    widgets are dropped and whitespace is collapsed.
+    """
+    if not markup:
+        return ""
+    # twice over: JSON-LD descriptions are often escaped HTML, entities and all
+    text = _html.unescape(_MARKUP.sub(" ", _html.unescape(_MARKUP.sub(" ", markup))))
+    return " ".join(_WIDGETS.sub(" ", text).split())
+
+
+# ======================================
+# NODES (same small interface for every backend)
+# ======================================
+class _SoupNode:
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    @property
+    def text(self):
+        return self.el.get_text()
+
+    @property
+    def html(self):
+        return str(self.el)
+
+    def attr(self, name):
+        return self.el.get(name)
+
+    def first(self, css):
+        found = self.el.select_one(css)
+        return _SoupNode(found) if found is not None else None
+
+    def all(self, css):
+        return [_SoupNode(el) for el in self.el.select(css)]
+
+
+class _LxmlNode:
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    @property
+    def text(self):
+        return self.el.text_content()
+
+    @property
+    def html(self):
+        from lxml.html import tostring
+        return tostring(self.el, encoding="unicode", with_tail=False)
+
+    def attr(self, name):
+        return self.el.get(name)
+
+    def first(self, css):
+        # "descendant::" so the card itself never matches (same as bs4's select_one)
+        found = _xpath(css, "descendant::")(self.el)
+        return _LxmlNode(found[0]) if found else None
+
+    def all(self, css):
+        return [_LxmlNode(el) for el in _xpath(css, "descendant::")(self.el)]
+
+
+class _LexborNode:
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    @property
+    def text(self):
+        return self.el.text()
+
+    @property
+    def html(self):
+        return self.el.html
+
+    def attr(self, name):
+        return self.el.attributes.get(name)
+
+    def first(self, css):
+        found = self.el.css_first(css)
+        return _LexborNode(found) if found is not None else None
+
+    def all(self, css):
+        seen = set()
+        return [_LexborNode(n) for n in self.el.css(css) if not (n.mem_id in seen or seen.add(n.mem_id))]
+
+
+@lru_cache(maxsize=None)
+def _xpath(css, prefix="descendant-or-self::"):
+    """CSS selector compiled to an lxml XPath once and reused for every page."""
+    from cssselect import HTMLTranslator
+    from lxml import etree
+    return etree.XPath(HTMLTranslator().css_to_xpath(css, prefix=prefix))
+
+
+# ======================================
+# BACKENDS
+# ======================================
+class SoupBackend:
+    """
+    BeautifulSoup backend. With `strain=True` only the elements named by the
+    spec's strainer are built (and lxml is used as the tokenizer when it is
+    installed); otherwise the whole page is parsed with html.parser.
+    """
+
+    def __init__(self, strain=False):
+        self.strain = strain
+        self.name = "soup-strained" if strain else "soup"
+        self.features = "lxml" if strain and _installed("lxml") else "html.parser"
+
+    def cards(self, html, spec):
+        from bs4 import BeautifulSoup, SoupStrainer
+        parse_only = SoupStrainer(*spec.strainer) if self.strain and spec.strainer else None
+        soup = BeautifulSoup(html, self.features, parse_only=parse_only)
+        for css in spec.css:
+            found = soup.select(css)
+            if found:
+                return [_SoupNode(el) for el in found]
+        return []
+
+    def page(self, html):
+        from bs4 import BeautifulSoup
+        return _SoupNode(BeautifulSoup(html, self.features))
+
+
+class LxmlBackend:
+    """lxml tree + precompiled CSS->XPath selectors."""
+
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        self._fromstring = lxml.html.fromstring
+
+    def cards(self, html, spec):
+        if not html or not html.strip():
+            return []
+        root = self._fromstring(html)
+        for css in spec.css:
+            found = _xpath(css)(root)
+            if found:
+                return [_LxmlNode(el) for el in found]
+        return []
+
+    def page(self, html):
+        if not html or not html.strip():
+            html = "<html></html>"
+        return _LxmlNode(self._fromstring(html).getroottree().getroot())
+
+
+class SelectolaxBackend:
+    """selectolax (lexbor) - a C parser with native CSS matching."""
+
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def cards(self, html, spec):
+        tree = self._parser(html)
+        for css in spec.css:
+            found = tree.css(css)
+            if found:
+                # lexbor reports a node once per selector of a group that it matches
+                seen = set()
+                return [_LexborNode(n) for n in found if not (n.mem_id in seen or seen.add(n.mem_id))]
+        return []
+
+    def page(self, html):
+        return _LexborNode(self._parser(html).root)
+
+
+_FACTORIES = {
+    "selectolax": (lambda: _installed("selectolax"), SelectolaxBackend),
+    "lxml": (lambda: _installed("lxml", "cssselect"), LxmlBackend),
+    "soup-strained": (lambda: True, lambda: SoupBackend(strain=True)),
+    "soup": (lambda: True, SoupBackend),
+}
+# "auto" picks the first installed one
+_PREFERENCE = ["selectolax", "lxml", "soup-strained"]
+_backends = {}
+
+
+def available_backends():
+    return [name for name, (installed, _) in _FACTORIES.items() if installed()]
+
+
+def get_backend(name=None):
+    name = (name or config.HTML_PARSER).lower()
+    if name not in _backends:
+        if name == "auto":
+            chosen = next(n for n in _PREFERENCE if _FACTORIES[n][0]())
+        elif name not in _FACTORIES:
+            raise ValueError(f"Unknown HTML parser backend {name!r} (choose from {', '.join(_FACTORIES)})")
+        elif not _FACTORIES[name][0]():
+            chosen = next(n for n in _PREFERENCE if _FACTORIES[n][0]())
+            print(f"⚠️ HTML parser {name!r} is not installed, using {chosen!r}")
+        else:
+            chosen = name
+        _backends[name] = _FACTORIES[chosen][1]()
+    return _backends[name]
+
+
+def parse_cards(html, spec, backend=None):
+    """Job-card nodes of a listing page (each has .text, .html, .attr(name), .first(css), .all(css))."""
+    return get_backend(backend).cards(html, spec)
+
+
+def parse_page(html, backend=None):
+    """Root node of a whole page (a job's detail page), with the same interface as a card."""
+    return get_backend(backend).page(html)
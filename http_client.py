@@ -0,0 +1,235 @@
+# http_client.py
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import config
+import html_backend
+import tracing
+from politeness import THROTTLE_STATUSES, get_scheduler, retry_after_seconds
+
+Page = namedtuple("Page", ["url", "status", "text", "from_cache", "not_modified"])
+
+RETRY_STATUSES = {429, 500, 502, 503, 504, 999}
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class HttpClient:
+    """
+    Shared HTTP layer for the scrapers.
+
+    - one pooled requests.Session (keep-alive, gzip) for every board
+    - on-disk response cache: responses younger than `ttl` are served
+      without a request, older ones are revalidated with
+      If-None-Match / If-Modified-Since, so an unchanged page costs a 304
+    - retries with exponential backoff + jitter on errors and 5xx; every
+      request is paced per host by a politeness.Scheduler, which also
+      takes 429s (and their Retry-After) and challenge redirects
+    - mode "record" also saves every page under `fixture_dir`; mode
+      "replay" serves only from there and never touches the network
+    """
+
+    def __init__(self, cache_dir=None, ttl=None, mode=None, fixture_dir=None, retries=None, backoff=None,
+                 scheduler=None):
+        self.cache_dir = config.HTTP_CACHE_DIR if cache_dir is None else cache_dir
+        self.ttl = config.HTTP_CACHE_TTL if ttl is None else ttl
+        self.mode = (mode or config.HTTP_MODE).lower()
+        self.fixture_dir = fixture_dir or config.HTTP_FIXTURE_DIR
+        self.retries = config.HTTP_RETRIES if retries is None else retries
+        self.backoff = config.HTTP_BACKOFF if backoff is None else backoff
+        self.scheduler = scheduler or get_scheduler()
+        self.stats = {"requests": 0, "not_modified": 0, "fresh_hits": 0, "retries": 0, "parse_skipped": 0}
+        self._lock = threading.Lock()
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0",
+            "Accept-Encoding": "gzip, deflate",
+            "Accept": "text/html,application/xhtml+xml,*/*;q=0.8",
+        })
+        adapter = HTTPAdapter(pool_connections=config.HTTP_POOL_SIZE, pool_maxsize=config.HTTP_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    # ---------- on-disk cache ----------
+    def _cache_paths(self, url):
+        base = os.path.join(self.cache_dir, _digest(url))
+        return base + ".json", base + ".html"
+
+    def _load_cached(self, url):
+        if not self.cache_dir:
+            return None, None
+        meta_path, body_path = self._cache_paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "r", encoding="utf-8") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _store_cached(self, url, response, text):
+        if not self.cache_dir:
+            return
+        meta_path, body_path = self._cache_paths(url)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "body_hash": _digest(text),
+        }
+        with open(body_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def _touch_cached(self, url, meta):
+        meta["fetched_at"] = time.time()
+        with open(self._cache_paths(url)[0], "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    # ---------- record / replay ----------
+    def _fixture_path(self, url):
+        return os.path.join(self.fixture_dir, _digest(url)[:16] + ".html")
+
+    def _record(self, url, text):
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        path = self._fixture_path(url)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        index_path = os.path.join(self.fixture_dir, "index.json")
+        with self._lock:
+            index = {}
+            if os.path.exists(index_path):
+                with open(index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            index[url] = os.path.basename(path)
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=2, sort_keys=True)
+
+    def _replay(self, url):
+        path = self._fixture_path(url)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No recorded page for {url} (expected {path})")
+        with open(path, "r", encoding="utf-8") as f:
+            return Page(url, 200, f.read(), True, False)
+
+    # ---------- fetching ----------
+    def _request(self, url, headers, timeout):
+        host = urlsplit(url).hostname or "unknown"
+        attempt = 0
+        while True:
+            self.scheduler.acquire(host)
+            r = retry_after = None
+            try:
+                self._count("requests")
+                r = self.session.get(url, headers=headers, timeout=timeout)
+                retry_after = retry_after_seconds(r.headers.get("Retry-After"))
+                self.scheduler.feedback(host, r.status_code, retry_after, r.url if r.url != url else None)
+                if r.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    return r
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+            attempt += 1
+            self._count("retries")
+            if r is not None and (r.status_code in THROTTLE_STATUSES or retry_after is not None):
+                continue  # the scheduler paused the host; the next acquire() waits it out
+            time.sleep(self.backoff * (2 ** (attempt - 1)) + random.uniform(0, self.backoff))
+
+    def get(self, url, timeout=None):
+        """Fetch a page as text, going through the cache. Raises on HTTP errors."""
+        if self.mode == "replay":
+            return self._replay(url)
+
+        meta, body = self._load_cached(url)
+        if meta and self.ttl and time.time() - meta["fetched_at"] < self.ttl:
+            self._count("fresh_hits")
+            return Page(url, 200, body, True, True)
+
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        r = self._request(url, headers, timeout or config.HTTP_TIMEOUT)
+        if r.status_code == 304 and meta:
+            self._count("not_modified")
+            self._touch_cached(url, meta)
+            page = Page(url, 304, body, True, True)
+        else:
+            r.raise_for_status()
+            text = r.text
+            changed = not meta or meta.get("body_hash") != _digest(text)
+            self._store_cached(url, r, text)
+            page = Page(url, r.status_code, text, False, not changed)
+
+        if self.mode == "record":
+            self._record(url, page.text)
+        return page
+
+    def get_parsed(self, url, parse, timeout=None):
+        """
+        Fetch and parse a page. When the page has not changed since the last
+        fetch, the stored result of the previous `parse` call is returned
+        instead of parsing the HTML again, provided it came from the same
+        HTML backend and html_backend.PARSER_VERSION.
+        """
+        host = urlsplit(url).hostname or "unknown"
+        with tracing.span("http", host=host):
+            page = self.get(url, timeout)
+        if not self.cache_dir or self.mode == "replay":
+            with tracing.span("parse", host=host):
+                return parse(page.text)
+        parsed_path = self._cache_paths(url)[0][:-len(".json")] + f".{parse.__name__}.json"
+        body_hash = _digest(page.text)
+        parser = f"{html_backend.get_backend().name}/{html_backend.PARSER_VERSION}"
+        if page.not_modified and os.path.exists(parsed_path):
+            try:
+                with open(parsed_path, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                if saved.get("body_hash") == body_hash and saved.get("parser") == parser:
+                    self._count("parse_skipped")
+                    return saved["jobs"]
+            except (OSError, ValueError):
+                pass
+        with tracing.span("parse", host=host):
+            jobs = parse(page.text)
+        with open(parsed_path, "w", encoding="utf-8") as f:
+            json.dump({"body_hash": body_hash, "parser": parser, "jobs": jobs}, f)
+        return jobs
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide client so every fetcher shares one connection pool and cache."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,104 @@
+# incremental.py
+import hashlib
+import threading
+from collections import Counter
+
+import sources
+
+# Fields that make up a posting's content; the ones a board does not fill are skipped
+HASH_FIELDS = ("title", "company", "location", "stipend", "description")
+# How many of the newest postings of a query are remembered as its high-water mark
+MARK_SIZE = 5
+
+
+def content_hash(job):
+    """Digest of a posting's visible content: equal hashes mean nothing worth re-scoring changed."""
+    text = "\x1f".join(" ".join(str(job.get(f) or "").split()).lower() for f in HASH_FIELDS)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class Tracker:
+    """
+    "New since last run" filter for incremental fetches.
+
+    For every fetched page, postings already in the job store with the same
+    content hash are dropped; new ones and ones whose content changed are
+    passed on. Each (board, query) also keeps a high-water mark, the keys
+    of the newest postings on its first page last time. Result pages are
+    newest first, so once a page has nothing new, or contains the old mark,
+    the rest of the query is known territory and paging stops there.
+
+    Hashes and marks are only written by save(), once the fetched jobs have
+    been handed on, so an interrupted run is fetched again in full. Jobs
+    passed through defer() are left out: they go on to be scored, carrying
+    their hash as `content_hash`, and the store records it with their
+    final state (scored below the threshold, or an apply outcome). A job
+    that missed the apply budget, could not be scored or never got that
+    far is passed on again next run.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._marks = {}
+        self._new_marks = {}
+        self._pending = {}
+        self._seen = set()
+        self.counts = Counter()
+
+    def _old_mark(self, source, query):
+        with self._lock:
+            if source not in self._marks:
+                self._marks[source] = {q: set(keys) for q, keys in self.store.watermarks(source).items()}
+            return self._marks[source].get(query, set())
+
+    def check(self, source, query, jobs, first_page=True):
+        """
+        Returns (fresh_jobs, reached_known): the new or changed postings of
+        one page, and whether paging past this page can be skipped.
+        """
+        keyed = [(sources.canonicalize(job.get("link")), job) for job in jobs if job.get("link")]
+        stored = self.store.content_hashes({key for key, _ in keyed})
+        fresh, counts = [], Counter()
+        with self._lock:
+            for key, job in keyed:
+                digest = content_hash(job)
+                if key in self._seen or stored.get(key) == digest:
+                    counts["known"] += 1
+                    continue
+                counts["changed" if key in stored else "new"] += 1
+                self._seen.add(key)
+                self._pending[key] = job = {**job, "content_hash": digest}
+                fresh.append(job)
+            if first_page and keyed:
+                self._new_marks[(source, query)] = [key for key, _ in keyed[:MARK_SIZE]]
+
+        old_mark = self._old_mark(source, query)
+        reached = bool(keyed) and (not fresh or any(key in old_mark for key, _ in keyed))
+        with self._lock:
+            self.counts.update(counts)
+            self.counts["pages"] += 1
+            if reached:
+                self.counts["stopped"] += 1
+        return fresh, reached
+
+    def defer(self, jobs):
+        """Yield `jobs`, leaving their hashes to be stored with their final state instead of by save()."""
+        for job in jobs:
+            if job.get("link"):
+                with self._lock:
+                    self._pending.pop(sources.canonicalize(job["link"]), None)
+            yield job
+
+    def save(self):
+        """Record high-water marks, and hashes of everything fetched so far except deferred jobs."""
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+            marks, self._new_marks = self._new_marks, {}
+        self.store.bulk_upsert(pending, "seen")
+        self.store.set_watermarks(marks)
+
+    def report(self):
+        c = self.counts
+        return (f"🆕 Incremental: {c['new']} new, {c['changed']} changed, {c['known']} already known "
+                f"({c['pages']} pages, {c['stopped']} stopped at known postings)")
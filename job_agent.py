@@ -1,127 +1,93 @@
 # job_agent.py
-import os
+import argparse
 import csv
+import os
+import sys
 import time
-import requests
-from bs4 import BeautifulSoup
-from groq import Groq
-from dotenv import load_dotenv
+from functools import lru_cache
+
+if "--profile-startup" in sys.argv:
+    import startup_profile
+    startup_profile.install()
 
 import config
-from auto_apply_agent import apply_linkedin, apply_internshala, apply_wellfound, apply_jobright
-from email_notifier import send_email
-
-# Load environment
-load_dotenv()
-
-# Configure Groq client
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-if not GROQ_API_KEY:
-    print("⚠️ No Groq API key found! Please set GROQ_API_KEY in .env file.")
-    client = None
-else:
-    client = Groq(api_key=GROQ_API_KEY)
-    print("✅ Groq client initialized successfully (LLaMA 3.3 70B + fallback)")
-
-# --- Helper Functions ---
-def load_applied():
-    if not os.path.exists(config.APPLIED_JOBS_FILE):
-        return set()
-    with open(config.APPLIED_JOBS_FILE, "r", encoding="utf-8") as f:
-        return set(line.strip() for line in f if line.strip())
-
-def save_applied(url):
-    with open(config.APPLIED_JOBS_FILE, "a", encoding="utf-8") as f:
-        f.write(url + "\n")
-
-# --- Job Fetchers ---
-def fetch_internshala():
-    print("🔍 Fetching Internshala...")
-    jobs = []
-    try:
-        r = requests.get(config.INTERNSHALA_SEARCH_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        cards = soup.select(".individual_internship") or soup.select(".internship_meta")
-        for card in cards[:config.MAX_JOBS_TO_APPLY]:
-            title = card.select_one(".job-internship-name") or card.select_one(".heading_4_5")
-            company = card.select_one(".link_display_like_text")
-            link_tag = card.select_one("a")
-            link = "https://internshala.com" + link_tag["href"] if link_tag and link_tag.get("href") else None
-            jobs.append({
-                "source": "Internshala",
-                "title": title.text.strip() if title else "Untitled",
-                "company": company.text.strip() if company else "Unknown",
-                "link": link
-            })
-    except Exception as e:
-        print("⚠️ Error fetching Internshala jobs:", e)
-    return jobs
-
-
-def fetch_linkedin():
-    print("🔍 Fetching LinkedIn (best-effort)...")
-    jobs = []
-    try:
-        r = requests.get(config.LINKEDIN_SEARCH_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        items = soup.find_all("a", class_="base-card__full-link")
-        for a in items[:config.MAX_JOBS_PER_SITE]:
-            jobs.append({
-                "source": "LinkedIn",
-                "title": a.text.strip(),
-                "company": "LinkedIn",
-                "link": a.get("href")
-            })
-    except Exception as e:
-        print("⚠️ LinkedIn fetch failed:", e)
-    return jobs
-
-
-def fetch_wellfound():
-    print("🔍 Fetching Wellfound...")
-    jobs = []
-    try:
-        r = requests.get(config.WELLFOUND_SEARCH_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        items = soup.find_all("a")
-        for a in items[:config.MAX_JOBS_PER_SITE]:
-            text = a.text.strip()
-            if "intern" in text.lower() or "machine learning" in text.lower():
-                link = "https://wellfound.com" + a.get("href", "")
-                jobs.append({"source": "Wellfound", "title": text, "company": "Wellfound", "link": link})
-    except Exception as e:
-        print("⚠️ Wellfound fetch failed:", e)
-    return jobs
-
-
-def fetch_jobright():
-    print("🔍 Fetching Jobright...")
-    jobs = []
-    try:
-        r = requests.get(config.JOBRIGHT_SEARCH_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        items = soup.find_all("a")
-        for a in items[:config.MAX_JOBS_PER_SITE]:
-            text = a.text.strip()
-            if text and ("machine learning" in text.lower() or "intern" in text.lower()):
-                link = a.get("href")
-                if link and link.startswith("/"):
-                    link = "https://www.jobright.ai" + link
-                jobs.append({"source": "Jobright", "title": text, "company": "Jobright", "link": link})
-    except Exception as e:
-        print("⚠️ Jobright fetch failed:", e)
-    return jobs
-
-
-# --- AI Analysis using Groq (LLaMA 3.3 with fallback) ---
+import tracing
+
+# Everything heavier (HTTP + HTML parsing, NumPy, the LLM SDKs, Selenium) is
+# imported inside the functions that use it, so each subcommand only pays
+# for what it runs. `--profile-startup` shows the breakdown.
+
+
+@lru_cache(maxsize=None)
+def get_llm_router():
+    """LLM router over the configured providers (LLM_ROUTES), built on first use; None if none is usable."""
+    from llm_router import build_router
+    router = build_router()
+    if not router:
+        print("⚠️ No LLM provider available! Set GROQ_API_KEY or GEMINI_API_KEY in .env file.")
+        return None
+    print(f"✅ LLM router ready: {router.name} ({router.policy})")
+    return router
+
+
+@lru_cache(maxsize=None)
+def get_notifier():
+    """Background email notifier; its worker thread starts with the first notification."""
+    from email_notifier import Notifier
+    return Notifier()
+
+
+def close_notifier():
+    """Send the last digest and print what was sent (no-op if nothing was ever notified)."""
+    if get_notifier.cache_info().currsize:
+        notifier = get_notifier()
+        notifier.close()
+        print(notifier.report())
+
+
+# --- Job Fetching (one adapter per board, see sources/) ---
+def fetch_jobs(tracker=None):
+    """Single-page fetch of every enabled board; yields jobs as each board finishes."""
+    import sources
+    from fetch_engine import FetchTask, run_fetchers
+    tasks = [FetchTask(a.name, a.search_url, a.fetch) for a in sources.enabled()]
+    for name, jobs in run_fetchers(tasks):
+        if tracker:
+            fresh, _ = tracker.check(name, "", jobs)
+            print(f"  ✔ {name}: {len(jobs)} jobs, {len(fresh)} new or changed")
+            jobs = fresh
+        else:
+            print(f"  ✔ {name}: {len(jobs)} jobs")
+        yield from jobs
+
+
+def source_stream(crawl=None, tracker=None):
+    """Jobs from every enabled board: one search page each, or a paginated crawl."""
+    crawl = config.CRAWL_MODE if crawl is None else crawl
+    if not crawl:
+        return fetch_jobs(tracker)
+    import sources
+    from crawler import crawl_jobs
+    print(f"🕸️ Crawl mode: {len(config.CRAWL_QUERIES)} queries x up to {config.CRAWL_MAX_PAGES} pages")
+    return crawl_jobs([a for a in sources.enabled() if a.url_template], config.CRAWL_QUERIES, tracker=tracker)
+
+
+# --- AI Analysis (routed over Groq / Gemini, see llm_router.py) ---
+GROQ_PROMPT_VERSION = "groq-v1"
+
+
+@tracing.traced()
 def analyze_with_groq(description):
-    if not client:
+    from score_cache import cached_score
+    router = get_llm_router()
+    if not router:
         return {"score": 0, "summary": "No API client configured"}
+    return cached_score(description, router.primary, GROQ_PROMPT_VERSION, _analyze_with_groq)
+
 
+def _analyze_with_groq(description):
+    from llm_router import LLMUnavailable
+    from structured_output import STATS, parse_score
     prompt = f"""
     You are an AI internship analyzer. Rate this job description from 1 to 10 for AI/ML relevance.
     Return JSON only:
@@ -132,111 +98,569 @@ def analyze_with_groq(description):
     Job Description:
     {description}
     """
-
-    try:
-        # Try primary model first (70B)
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": "You are a precise AI/ML relevance evaluator."},
-                {"role": "user", "content": prompt}
-            ]
-        )
-    except Exception as e1:
-        print("⚠️ 70B model failed, retrying with 8B-instant:", e1)
-        # Fallback model (lighter)
+    messages = [
+        {"role": "system", "content": "You are a precise AI/ML relevance evaluator."},
+        {"role": "user", "content": prompt}
+    ]
+    for attempt in range(1 + config.LLM_PARSE_RETRIES):
+        if attempt:
+            STATS.count(requeried=1)
         try:
-            response = client.chat.completions.create(
-                model="llama-3.3-8b-instant",
-                messages=[
-                    {"role": "system", "content": "You are a precise AI/ML relevance evaluator."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-        except Exception as e2:
-            print(f"❌ Both Groq models failed: {e2}")
+            completion = get_llm_router().complete(messages)
+        except LLMUnavailable as e:
+            print(f"❌ All LLM routes failed: {e}")
             return {"score": 0, "summary": "Analysis failed"}
+        text = completion.text.strip()
+        result = parse_score(text)
+        if result:
+            return {**result, "model": f"{completion.provider}:{completion.model}"}
+    return {"score": 0, "summary": text}
 
-    try:
-        text = response.choices[0].message.content.strip()
-        import json
-        return json.loads(text)
-    except Exception:
-        return {"score": 0, "summary": response.choices[0].message.content.strip()}
 
+@tracing.traced()
+def analyze_batch_with_groq(descriptions):
+    """Score many descriptions in packed prompts; returns one {score, summary} per input, in order."""
+    from batch_scorer import score_batch, PROMPT_VERSION as BATCH_PROMPT_VERSION
+    from score_cache import cached_batch
+    router = get_llm_router()
+    if not router:
+        return [{"score": 0, "summary": "No API client configured"} for _ in descriptions]
+    return cached_batch(descriptions, router.primary, BATCH_PROMPT_VERSION,
+                        lambda todo: score_batch(router, todo))
 
-# --- Main Function ---
-def main():
-    print("🚀 Starting AI Internship Finder Agent...\n")
-    applied = load_applied()
-    all_jobs = []
-    all_jobs += fetch_internshala()
-    all_jobs += fetch_linkedin()
-    all_jobs += fetch_wellfound()
-    all_jobs += fetch_jobright()
-    print(f"\n📊 Total internships fetched: {len(all_jobs)}")
-
-    matched = []
-    applied_count = 0
-
-    for job in all_jobs:
-        if applied_count >= config.MAX_JOBS_TO_APPLY:
-            break
-        url = job.get("link")
-        if not url or url in applied:
-            continue
 
-        desc = f"{job['title']} at {job['company']} ({job['source']})"
-        score_obj = analyze_with_groq(desc)
+def describe_job(job):
+    """One line per job for the scoring prompt; enriched jobs also carry location, stipend and description."""
+    text = f"{job['title']} at {job['company']} ({job['source']})"
+    extras = [f"{label}: {job[key]}" for label, key in (("Location", "location"), ("Stipend", "stipend"))
+              if job.get(key)]
+    if job.get("description"):
+        extras.append(job["description"])
+    return " | ".join([text] + extras)
+
+
+def process_batch(batch, executor, budget, store, scored_log=None):
+    """Score a batch of jobs in one go and queue applications for the relevant ones (at most `budget`)."""
+    queued = 0
+    scores = analyze_batch_with_groq([describe_job(job) for job in batch])
+    tracing.count("jobs", len(batch), stage="scored")
+    # a job's content hash (incremental mode) is only kept once it is dealt with: scored below the
+    # threshold here, or by record_outcomes; a score of 0 means it could not be scored at all
+    store.bulk_upsert([{**job, "score": s.get("score", 0), "reason": s.get("summary"),
+                        "content_hash": job.get("content_hash")
+                        if 0 < s.get("score", 0) < config.AI_RELEVANCE_THRESHOLD else None}
+                       for job, s in zip(batch, scores)], "scored")
+    if scored_log is not None:
+        scored_log.extend([{**job, "score": s.get("score", 0), "summary": s.get("summary", "")}
+                           for job, s in zip(batch, scores)])
+    for job, score_obj in zip(batch, scores):
         score = score_obj.get("score", 0)
         summary = score_obj.get("summary", "")
         print(f"→ {job['source']} | {job['title']} | score {score}")
 
-        if score >= config.AI_RELEVANCE_THRESHOLD:
-            print("  ⭐ Selected for apply:", job['title'])
-            success = False
-            reason = "Not attempted"
-            try:
-                if job['source'] == "LinkedIn":
-                    ok, reason = apply_linkedin(url, config.LINKEDIN_EMAIL, config.LINKEDIN_PASSWORD, headless=False)
-                    success = ok
-                elif job['source'] == "Internshala":
-                    ok, reason = apply_internshala(url, config.INTERNSHALA_EMAIL, config.INTERNSHALA_PASSWORD, headless=False)
-                    success = ok
-                elif job['source'] == "Wellfound":
-                    ok, reason = apply_wellfound(url, config.WELLFOUND_EMAIL, config.WELLFOUND_PASSWORD, headless=False)
-                    success = ok
-                elif job['source'] == "Jobright":
-                    ok, reason = apply_jobright(url, config.JOBRIGHT_EMAIL, config.JOBRIGHT_PASSWORD, headless=False)
-                    success = ok
-            except Exception as e:
-                reason = str(e)
-
-            if success:
-                save_applied(url)
-                applied.add(url)
-                applied_count += 1
-                print(f"✅ Applied to {job['title']} ({job['source']})")
-                subj = f"Applied to {job['title']} at {job['company']}"
-                body = f"Applied to {job['title']} ({job['source']})\nLink: {url}\nReason: {reason}\nScore: {score}\nSummary: {summary}"
-                send_email(subj, body)
-            else:
-                print(f"⚠️ Could not auto-apply ({reason}). Saving for manual review.")
-                matched.append({**job, "score": score, "summary": summary, "apply_status": reason})
-
-        time.sleep(2)
-
-    if matched:
-        keys = ["source", "title", "company", "link", "score", "summary", "apply_status"]
-        with open(config.MATCHED_CSV, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
+        if score < config.AI_RELEVANCE_THRESHOLD or queued >= budget:
+            continue
+
+        print("  ⭐ Selected for apply:", job['title'])
+        executor.submit({**job, "score": score, "summary": summary})
+        queued += 1
+    return queued
+
+
+def record_outcomes(outcomes, store, log=None):
+    """Persist finished applications (runs on the main thread); returns how many succeeded."""
+    succeeded = 0
+    manual = []
+    for outcome in outcomes:
+        job, reason = outcome.job, outcome.reason
+        url, score, summary = job["link"], job["score"], job["summary"]
+        tracing.count("jobs", stage="skipped" if outcome.skipped else "applied" if outcome.ok else "failed",
+                      site=(job.get("source") or "unknown").lower())
+        if outcome.skipped:
+            # never tried: it stays "scored" (and keeps no content hash) for `apply` or the next run
+            print(f"⏭️ {job['title']} ({job['source']}) left for a later run: {reason}")
+        elif outcome.ok and config.DRY_RUN:
+            # not applied to for real, but dealt with: record its content hash all the same
+            store.bulk_upsert([job], "scored")
+            succeeded += 1
+            print(f"🧪 Dry run: would apply to {job['title']} ({job['source']})")
+        elif outcome.ok:
+            store.mark(job, "applied", reason)
+            succeeded += 1
+            print(f"✅ Applied to {job['title']} ({job['source']})")
+            subj = f"Applied to {job['title']} at {job['company']}"
+            body = f"Applied to {job['title']} ({job['source']})\nLink: {url}\nReason: {reason}\nScore: {score}\nSummary: {summary}"
+            get_notifier().notify(subj, body)
+        else:
+            print(f"⚠️ Could not auto-apply {job['title']} ({reason}). Saving for manual review.")
+            if not config.DRY_RUN:
+                store.mark(job, "failed", reason)
+            manual.append({**job, "apply_status": reason})
+        if log is not None:
+            log.append({"link": url, "title": job["title"], "source": job["source"], "ok": outcome.ok,
+                        "skipped": outcome.skipped, "reason": reason})
+    append_matched(manual)
+    return succeeded
+
+
+def iter_candidates(job_stream, store, prefilter, counts):
+    """Yield fetched jobs that are new, not yet applied to and pass the pre-filter."""
+    queued = set()
+    seen = []
+    try:
+        for job in job_stream:
+            counts["fetched"] += 1
+            tracing.count("jobs", stage="fetched", source=job.get("source") or "unknown")
+            url = job.get("link")
+            if not url:
+                continue
+            key = store.key(url)
+            if key in queued:
+                continue
+            queued.add(key)
+            dropped = store.has_applied(url) or (prefilter and not prefilter.keep(job))
+            # a job passed on has its content hash (incremental mode) stored with its score or apply outcome
+            seen.append(job if dropped else {**job, "content_hash": None})
+            if len(seen) >= 50:
+                store.bulk_upsert(seen, "seen")
+                seen = []
+            if not dropped:
+                yield job
+    finally:
+        store.bulk_upsert(seen, "seen")
+
+
+def append_matched(matched):
+    """Add jobs that need a manual application to MATCHED_CSV (earlier runs' rows are kept)."""
+    if not matched:
+        return
+    keys = ["source", "title", "company", "link", "score", "summary", "apply_status"]
+    new_file = not os.path.exists(config.MATCHED_CSV) or os.path.getsize(config.MATCHED_CSV) == 0
+    with open(config.MATCHED_CSV, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=keys)
+        if new_file:
             writer.writeheader()
-            for m in matched:
-                writer.writerow({k: m.get(k, "") for k in keys})
-        print(f"💾 Saved {len(matched)} manual-review entries to {config.MATCHED_CSV}")
+        for m in matched:
+            writer.writerow({k: m.get(k, "") for k in keys})
+    print(f"💾 Added {len(matched)} manual-review entries to {config.MATCHED_CSV}")
+
+
+def print_cache_stats():
+    from score_cache import get_cache, close_cache
+    cache = get_cache()
+    if cache:
+        stats = cache.stats()
+        print(f"🗃️ Score cache: {stats['hits']} hits / {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%}), {stats['entries']} entries")
+        close_cache()
+
+
+def print_llm_stats():
+    # only if something was scored: building the router just to report on it would load the SDKs
+    if get_llm_router.cache_info().currsize and get_llm_router():
+        from structured_output import STATS
+        print(get_llm_router().report())
+        print(STATS.report())
+
+
+def print_store_counts(store):
+    print("🗄️ Job store: " + ", ".join(f"{k} {v}" for k, v in sorted(store.counts().items())))
+
+
+def print_pacing():
+    """Per-host pacing of the live HTTP fetches (nothing in replay mode)."""
+    from politeness import get_scheduler
+    if get_scheduler().used:
+        print(get_scheduler().report())
+
+
+def print_apply_summary(executor):
+    from apply_timing import TIMINGS
+    summary = executor.outcomes.summary()
+    if summary:
+        print("🧾 Apply outcomes: " + ", ".join(f"{site} {s['ok']} ok / {s['failed']} failed"
+                                                + (f" / {s['skipped']} skipped" if s["skipped"] else "")
+                                                for site, s in summary.items()))
+    if executor.scheduler.used:
+        print(executor.scheduler.report())
+    if TIMINGS.summary():
+        print(TIMINGS.report())
+        TIMINGS.save(config.APPLY_TIMINGS_FILE)
+
+
+def open_store():
+    from job_store import JobStore
+    store = JobStore()
+    store.import_legacy()
+    return store
+
+
+def open_tracker(store, incremental=None):
+    """incremental.Tracker when incremental mode is on (flag or INCREMENTAL), else None."""
+    if not (config.INCREMENTAL if incremental is None else incremental):
+        return None
+    from incremental import Tracker
+    print("🆕 Incremental mode: only postings that are new or changed since the last run")
+    return Tracker(store)
+
+
+def open_enricher(store):
+    """enrich.Enricher when ENRICH_ENABLED, else None."""
+    if not config.ENRICH_ENABLED:
+        return None
+    from enrich import Enricher
+    return Enricher(store)
+
+
+def candidate_jobs(store, prefilter, counts, deduper=None, crawl=None, tracker=None):
+    """Fetched jobs, cross-board duplicates merged, filtered by iter_candidates."""
+    from dedup import dedup_stream
+    jobs = source_stream(crawl, tracker)
+    deduped = dedup_stream(jobs, deduper) if deduper else jobs
+    try:
+        # closing this generator closes iter_candidates first, which flushes its "seen" rows
+        yield from iter_candidates(tracker.defer(deduped) if tracker else deduped, store, prefilter, counts)
+        # only a fetch that ran to the end moves the high-water marks
+        if tracker:
+            tracker.save()
+    finally:
+        deduped.close()
+        jobs.close()
+
+
+def fetch_stage(run, live_jobs, deduper=None):
+    """
+    Fetch stage of a checkpointed run: replays the jobs an earlier attempt of
+    this run already logged, then (unless fetching had finished) continues
+    with `live_jobs`, logging each new job before passing it on. Replayed
+    jobs are fed to `deduper` (the one `live_jobs` uses) so later copies of
+    them are merged, not logged again.
+    """
+    import sources
+    log = run.log("fetched")
+    logged = set()
+    try:
+        for job in log.read():
+            logged.update(sources.canonicalize(link) for link in job.get("links") or [job["link"]])
+            if deduper:
+                deduper.add({**job})
+            yield job
+        if run.is_done("fetch"):
+            return
+        for job in live_jobs:
+            keys = {sources.canonicalize(link) for link in job.get("links") or [job["link"]]}
+            if keys & logged:
+                continue
+            logged.update(keys)
+            log.append(job)
+            yield job
+        run.mark_done("fetch")
+    finally:
+        live_jobs.close()
+
+
+# --- Subcommands ---
+def fetch(crawl=None, incremental=None):
+    """Fetch (or crawl) every board and record new jobs as "seen"; no LLM, no browser."""
+    import sources
+    from dedup import Deduplicator
+
+    store = open_store()
+    deduper = Deduplicator() if config.DEDUP_ENABLED else None
+    tracker = open_tracker(store, incremental)
+    counts = {"fetched": 0}
+    jobs = list(candidate_jobs(store, None, counts, deduper, crawl, tracker))
+    # kept for `score`, which is all this command does with them: their content hashes can be stored now
+    store.bulk_upsert(jobs, "seen")
+    new = len(jobs)
+    # counts["fetched"] is counted after dedup (and the incremental filter); the boards' own totals are raw
+    fetched = sum(s["jobs"] for s in sources.stats().values())
+    print(f"\n📊 Fetched {fetched} listings: {counts['fetched']} after "
+          f"{'dedup and the incremental filter' if tracker else 'dedup'}, {new} not applied to yet")
+    print(sources.report())
+    print_pacing()
+    if tracker:
+        print(tracker.report())
+    if deduper:
+        print(deduper.report())
+    print_store_counts(store)
+    store.close()
+
+
+def score(limit=None):
+    """LLM-score the stored "seen" jobs (after the pre-filter) and mark them "scored"."""
+    from prefilter import PreFilter
+
+    store = open_store()
+    jobs = store.jobs("seen", limit=limit)
+    prefilter = PreFilter() if config.PREFILTER_ENABLED else None
+    if prefilter:
+        jobs = [job for job in jobs if prefilter.keep(job)]
+    enricher = open_enricher(store)
+    if enricher:
+        jobs = enricher.enrich(jobs)
+    for i in range(0, len(jobs), config.LLM_BATCH_SIZE):
+        batch = jobs[i:i + config.LLM_BATCH_SIZE]
+        scores = analyze_batch_with_groq([describe_job(job) for job in batch])
+        tracing.count("jobs", len(batch), stage="scored")
+        store.bulk_upsert([{**job, "score": s.get("score", 0), "reason": s.get("summary")}
+                           for job, s in zip(batch, scores)], "scored")
+        for job, s in zip(batch, scores):
+            print(f"→ {job['source']} | {job['title']} | score {s.get('score', 0)}")
+    print(f"\n🧠 Scored {len(jobs)} jobs")
+    if prefilter:
+        print(prefilter.report())
+    if enricher:
+        print(enricher.report())
+    print_store_counts(store)
+    store.close()
+    print_llm_stats()
+    print_cache_stats()
+
+
+def apply():
+    """Apply to the best-scoring stored jobs, up to MAX_JOBS_TO_APPLY."""
+    from apply_executor import ApplyExecutor, create_backend
+
+    store = open_store()
+    jobs = store.jobs("scored", min_score=config.AI_RELEVANCE_THRESHOLD, limit=config.MAX_JOBS_TO_APPLY)
+    if not jobs:
+        print("📭 No scored jobs above the relevance threshold; run `score` first.")
+        store.close()
+        return 0
+    executor = ApplyExecutor(create_backend())
+    for job in jobs:
+        print(f"  ⭐ Queued for apply: {job['title']} ({job['source']}, score {job['score']})")
+        executor.submit(job)
+    applied_count = record_outcomes(executor.drain(), store)
+    executor.shutdown()
+    close_notifier()
+    print_apply_summary(executor)
+    print_store_counts(store)
+    store.close()
+    print(f"\n🎉 Completed. Applied to {applied_count} jobs (attempted).")
+    return applied_count
+
+
+def report(limit=10):
+    """Job-store summary: counts, best jobs not applied to yet, latest status changes."""
+    store = open_store()
+    print_store_counts(store)
+    pending = store.jobs("scored", min_score=config.AI_RELEVANCE_THRESHOLD, limit=limit)
+    if pending:
+        print("\n⭐ Top scored, not applied yet:")
+        for job in pending:
+            print(f"   {job['score']:>3}  {job['title']} ({job['source']}) {job['link']}")
+    recent = store.recent(limit)
+    if recent:
+        print("\n🕒 Latest changes:")
+        for at, status, title, source, detail in recent:
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(at))
+            print(f"   {when}  {status:<8} {title or '?'} ({source or '?'})" + (f" - {detail}" if detail else ""))
+    store.close()
+
+
+def main(crawl=None, resume=None, incremental=None):
+    """
+    Full pipeline: fetch -> dedup -> pre-filter -> (rank) -> enrich -> score -> apply, streamed.
+
+    Every stage logs its output under RUNS_DIR/<run id>/ as it goes, so a run
+    that crashed or was killed picks up where it stopped: fetched jobs are
+    replayed from the log, already-scored jobs are not sent to the LLM
+    again, and jobs with a recorded apply outcome are not applied to twice.
+    """
+    import sources
+    from apply_executor import ApplyExecutor, create_backend
+    from checkpoint import Run
+    from dedup import Deduplicator
+    from prefilter import PreFilter
+
+    print("🚀 Starting AI Internship Finder Agent...\n")
+    run = Run.open(config.RESUME_RUNS if resume is None else resume)
+    scored_log, applied_log = run.log("scored"), run.log("applied")
+    if run.resumed:
+        print(f"♻️ Resuming run {run.run_id}: {len(run.log('fetched'))} fetched, "
+              f"{len(scored_log)} scored, {len(applied_log)} apply outcome(s) already checkpointed")
+    else:
+        print(f"🆕 Run {run.run_id} (checkpoints in {run.dir})")
+
+    store = open_store()
+    deduper = Deduplicator() if config.DEDUP_ENABLED else None
+    prefilter = PreFilter() if config.PREFILTER_ENABLED else None
+    tracker = open_tracker(store, incremental)
+    counts = {"fetched": 0}
+    candidate_stream = fetch_stage(run, candidate_jobs(store, prefilter, counts, deduper, crawl, tracker), deduper)
+    candidates = candidate_stream
+
+    if config.RANK_TOP_K and not os.path.exists(config.RESUME_FILE):
+        print(f"⚠️ {config.RESUME_FILE} not found; scoring every candidate without resume ranking")
+    elif config.RANK_TOP_K:
+        from ranker import ResumeRanker
+        ranker = ResumeRanker.from_resume_file()
+        # top-k needs every candidate: this waits for the whole fetch before anything is scored
+        ranker.add_jobs(candidates)
+        candidates = []
+        for job, similarity in ranker.top_k(config.RANK_TOP_K):
+            job["resume_similarity"] = round(similarity, 3)
+            candidates.append(job)
+        print(f"📐 Ranked {len(ranker)} candidates against resume; top {len(candidates)} go to the LLM")
+
+    # after ranking, so only jobs that can still reach the LLM cost a detail-page fetch
+    enricher = open_enricher(store)
+    if enricher:
+        candidates = enricher.stream(candidates)
+
+    outcomes = list(applied_log.read())
+    # a skipped job was never tried, so a resumed run may queue it again
+    finished = {o["link"] for o in outcomes if not o.get("skipped")}
+    applied_count = sum(1 for o in outcomes if o["ok"])
+    executor = ApplyExecutor(create_backend())
+
+    def _apply_room():
+        # applications may still be running; never queue more than can count toward the cap
+        nonlocal applied_count
+        applied_count += record_outcomes(executor.poll(), store, applied_log)
+        while executor.pending and applied_count + executor.pending >= config.MAX_JOBS_TO_APPLY:
+            applied_count += record_outcomes(executor.wait_any(), store, applied_log)
+        return config.MAX_JOBS_TO_APPLY - applied_count - executor.pending
+
+    # jobs an earlier attempt scored and selected but never got an outcome for
+    for job in scored_log.read():
+        if (job["score"] >= config.AI_RELEVANCE_THRESHOLD and job["link"] not in finished
+                and not store.has_applied(job["link"])):
+            if _apply_room() <= 0:
+                break
+            print("  ⭐ Resuming apply:", job["title"])
+            finished.add(job["link"])
+            executor.submit(job)
+
+    # jobs before the cursor were scored by an earlier attempt
+    consumed = run.cursor("score")
+    batch = []
+    stopped = False
+    for i, job in enumerate(candidates):
+        if i < consumed:
+            continue
+        batch.append(job)
+        if len(batch) >= config.LLM_BATCH_SIZE:
+            room = _apply_room()
+            if room <= 0:
+                stopped = True
+                break
+            process_batch(batch, executor, room, store, scored_log)
+            consumed = i + 1
+            run.set_cursor("score", consumed)
+            batch = []
+    if batch and not stopped:
+        room = _apply_room()
+        if room > 0:
+            process_batch(batch, executor, room, store, scored_log)
+            run.set_cursor("score", consumed + len(batch))
+
+    if enricher:
+        candidates.close()
+    candidate_stream.close()
+    applied_count += record_outcomes(executor.drain(), store, applied_log)
+    executor.shutdown()
+    close_notifier()
+    run.finish()
+    run.close()
+
+    print(f"\n📊 Total internships fetched: {counts['fetched']}")
+    print(sources.report())
+    print_pacing()
+    if tracker:
+        print(tracker.report())
+    if deduper:
+        print(deduper.report())
+    if prefilter:
+        print(prefilter.report())
+    if enricher:
+        print(enricher.report())
+
+    print_store_counts(store)
+    store.close()
+    print_apply_summary(executor)
+    print_llm_stats()
+    print_cache_stats()
 
     print(f"\n🎉 Completed. Applied to {applied_count} jobs (attempted).")
 
 
+# --- Command line ---
+def build_parser():
+    parser = argparse.ArgumentParser(prog="job_agent.py", description="AI internship finder and auto-apply agent.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print an import-time breakdown when the command finishes")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile the command (PROFILE, default cprofile) and dump its hot paths to PROFILE_DIR")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write run metrics here (.prom: Prometheus textfile, else JSON; default METRICS_FILE)")
+    sub = parser.add_subparsers(dest="command", metavar="{fetch,score,apply,report,run,daemon}")
+
+    p = sub.add_parser("fetch", help="fetch every board and store new jobs (no LLM, no browser)")
+    p.add_argument("--crawl", action="store_true", default=None, help="paginated crawl (CRAWL_QUERIES)")
+    p.add_argument("--incremental", action="store_true", default=None,
+                   help="only postings new or changed since the last run; stop paging at known ones")
+
+    p = sub.add_parser("score", help="LLM-score stored jobs that have not been scored yet")
+    p.add_argument("--limit", type=int, help="score at most this many jobs")
+
+    p = sub.add_parser("apply", help="apply to the best-scoring stored jobs")
+    p.add_argument("--dry-run", action="store_true", help="apply against local fixture pages only")
+
+    p = sub.add_parser("report", help="show job-store counts, top pending jobs and recent changes")
+    p.add_argument("--limit", type=int, default=10)
+
+    p = sub.add_parser("run", help="full pipeline, streamed and checkpointed (the default)")
+    p.add_argument("--crawl", action="store_true", default=None, help="paginated crawl (CRAWL_QUERIES)")
+    p.add_argument("--fresh", action="store_true", help="start a new run instead of resuming an unfinished one")
+    p.add_argument("--incremental", action="store_true", default=None,
+                   help="only postings new or changed since the last run; stop paging at known ones")
+    p.add_argument("--dry-run", action="store_true", help="apply against local fixture pages only")
+
+    p = sub.add_parser("daemon", help="keep running: a fetch cycle every DAEMON_INTERVAL seconds, warm state")
+    p.add_argument("--interval", type=float, help="seconds between fetch cycles (default DAEMON_INTERVAL)")
+    p.add_argument("--cycles", type=int, help="exit after this many cycles (default: run until stopped)")
+    p.add_argument("--port", help="status endpoint port (default DAEMON_STATUS_PORT; empty disables it)")
+    p.add_argument("--crawl", action="store_true", default=None, help="paginated crawl (CRAWL_QUERIES)")
+    p.add_argument("--dry-run", action="store_true", help="apply against local fixture pages only")
+    return parser
+
+
+def cli(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, "dry_run", False):
+        config.DRY_RUN = True
+    command = args.command or "run"
+    profiler = (config.PROFILE or "cprofile") if args.profile else None
+    with tracing.profiled(profiler, name=command), tracing.span("command", command=command):
+        if command == "fetch":
+            fetch(args.crawl, args.incremental)
+        elif command == "score":
+            score(args.limit)
+        elif command == "apply":
+            apply()
+        elif command == "report":
+            report(args.limit)
+        elif command == "daemon":
+            from daemon import Daemon
+            Daemon(args.interval, crawl=args.crawl, port=args.port).run(args.cycles)
+        else:
+            main(getattr(args, "crawl", None), False if getattr(args, "fresh", False) else None,
+                 getattr(args, "incremental", None))
+
+    if command != "report":
+        print(tracing.report())
+        path = tracing.export(args.metrics)
+        if path:
+            print(f"📝 Run metrics written to {path}")
+
+    if args.profile_startup:
+        import startup_profile
+        print(startup_profile.report())
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(cli())
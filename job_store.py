@@ -0,0 +1,270 @@
+# job_store.py
+import os
+import sqlite3
+import threading
+import time
+
+import config
+import sources
+
+# Later statuses win; a job that was applied to never drops back to "seen"
+STATUS_RANK = {"seen": 0, "scored": 1, "failed": 2, "applied": 3}
+# what enrich.Enricher takes from a job's detail page
+DETAIL_FIELDS = ("description", "company", "location", "stipend")
+
+_UPSERT = """
+INSERT INTO jobs (key, url, source, title, company, status, score, reason, content_hash, first_seen, updated_at)
+VALUES (:key, :url, :source, :title, :company, :status, :score, :reason, :content_hash, :now, :now)
+ON CONFLICT(key) DO UPDATE SET
+    status = CASE WHEN :rank >= (SELECT rank FROM status_rank WHERE status = jobs.status)
+                  THEN excluded.status ELSE jobs.status END,
+    score = COALESCE(excluded.score, jobs.score),
+    reason = COALESCE(excluded.reason, jobs.reason),
+    title = COALESCE(excluded.title, jobs.title),
+    company = COALESCE(excluded.company, jobs.company),
+    content_hash = COALESCE(excluded.content_hash, jobs.content_hash),
+    updated_at = excluded.updated_at
+"""
+
+
+class JobStore:
+    """
+    SQLite-backed job state, keyed by canonical URL (sources.canonicalize).
+
+    Lookups hit the primary-key index, so nothing is loaded into memory at
+    startup. Every status change is also appended to `transitions` with a
+    timestamp.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or config.JOB_STORE_FILE
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                source TEXT,
+                title TEXT,
+                company TEXT,
+                status TEXT NOT NULL,
+                score INTEGER,
+                reason TEXT,
+                content_hash TEXT,
+                first_seen REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+            CREATE TABLE IF NOT EXISTS transitions (
+                key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                at REAL NOT NULL,
+                detail TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_transitions_key ON transitions(key);
+            CREATE TABLE IF NOT EXISTS status_rank (status TEXT PRIMARY KEY, rank INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS watermarks (
+                source TEXT NOT NULL,
+                query TEXT NOT NULL,
+                keys TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (source, query)
+            );
+            CREATE TABLE IF NOT EXISTS details (
+                key TEXT PRIMARY KEY,
+                description TEXT,
+                company TEXT,
+                location TEXT,
+                stipend TEXT,
+                content_hash TEXT,
+                fetched_at REAL NOT NULL
+            );
+            """
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "content_hash" not in columns:
+            # stores created before incremental mode
+            self._db.execute("ALTER TABLE jobs ADD COLUMN content_hash TEXT")
+        if "content_hash" not in {row[1] for row in self._db.execute("PRAGMA table_info(details)")}:
+            # details saved without the listing's hash are fetched again once
+            self._db.execute("ALTER TABLE details ADD COLUMN content_hash TEXT")
+        self._db.executemany("INSERT OR REPLACE INTO status_rank VALUES (?, ?)", STATUS_RANK.items())
+        self._db.commit()
+
+    @staticmethod
+    def key(url):
+        return sources.canonicalize(url)
+
+    def status(self, url):
+        with self._lock:
+            row = self._db.execute("SELECT status FROM jobs WHERE key = ?", (self.key(url),)).fetchone()
+        return row[0] if row else None
+
+    def has_applied(self, url):
+        return self.status(url) == "applied"
+
+    def bulk_upsert(self, jobs, status, detail=None):
+        """Insert or update many jobs in one transaction; per-job score/reason are read from the dicts."""
+        now = time.time()
+        rows = []
+        for job in jobs:
+            if not job.get("link"):
+                continue
+            rows.append({
+                "key": self.key(job["link"]),
+                "url": job["link"],
+                "source": job.get("source"),
+                "title": job.get("title"),
+                "company": job.get("company"),
+                "status": status,
+                "rank": STATUS_RANK[status],
+                "score": job.get("score"),
+                "reason": job.get("apply_status") or job.get("reason"),
+                "content_hash": job.get("content_hash"),
+                "now": now,
+            })
+        if not rows:
+            return
+        with self._lock:
+            before = self._statuses([r["key"] for r in rows])
+            self._db.executemany(_UPSERT, rows)
+            # only real status changes go into the history
+            changed = [r for r in rows if before.get(r["key"]) != status
+                       and STATUS_RANK[status] >= STATUS_RANK.get(before.get(r["key"]), -1)]
+            self._db.executemany(
+                "INSERT INTO transitions (key, status, at, detail) VALUES (?, ?, ?, ?)",
+                [(r["key"], status, now, detail or r["reason"]) for r in changed],
+            )
+            self._db.commit()
+
+    def _statuses(self, keys):
+        return self._lookup("status", keys)
+
+    def _lookup(self, column, keys):
+        found = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(self._db.execute(f"SELECT key, {column} FROM jobs WHERE key IN ({marks})", chunk))
+        return found
+
+    def content_hashes(self, keys):
+        """{key: content hash} for the stored ones among `keys` (None for rows stored before hashing)."""
+        with self._lock:
+            return self._lookup("content_hash", list(keys))
+
+    def watermarks(self, source):
+        """{query: [job keys]} recorded for a board by set_watermarks()."""
+        with self._lock:
+            rows = self._db.execute("SELECT query, keys FROM watermarks WHERE source = ?", (source,)).fetchall()
+        return {query: keys.split("\n") for query, keys in rows}
+
+    def set_watermarks(self, marks):
+        """marks: {(source, query): [job keys]}; replaces what was stored for those queries."""
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO watermarks (source, query, keys, updated_at) VALUES (?, ?, ?, ?)",
+                [(source, query, "\n".join(keys), now) for (source, query), keys in marks.items() if keys],
+            )
+            self._db.commit()
+
+    def details(self, urls):
+        """
+        {key: {description, company, location, stipend, content_hash}} for
+        those of `urls` whose detail page was fetched; content_hash is the
+        listing's when it was.
+        """
+        keys = list({self.key(url) for url in urls if url})
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for key, *values in self._db.execute(
+                        "SELECT key, description, company, location, stipend, content_hash FROM details "
+                        f"WHERE key IN ({marks})", chunk):
+                    found[key] = {k: v for k, v in zip(DETAIL_FIELDS + ("content_hash",), values) if v}
+        return found
+
+    def save_details(self, url, details, content_hash=None):
+        """
+        Remember what a job's detail page held (even nothing), so it is not
+        fetched again while the listing's `content_hash` stays the same.
+        """
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO details "
+                "(key, description, company, location, stipend, content_hash, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.key(url), *(details.get(k) for k in DETAIL_FIELDS), content_hash, time.time()),
+            )
+            self._db.commit()
+
+    def mark(self, job, status, reason=None):
+        """Set the status of a job and of every duplicate link merged into it."""
+        extra = {"reason": reason} if reason else {}
+        links = job.get("links") or [job.get("link")]
+        # a content hash belongs to the job's own posting, not to the copies on other boards
+        self.bulk_upsert([{**job, **extra, "link": link,
+                           "content_hash": job.get("content_hash") if link == job.get("link") else None}
+                          for link in links], status)
+
+    def jobs(self, status, min_score=None, limit=None):
+        """Stored jobs with a status as job dicts, highest score first."""
+        sql = "SELECT url, source, title, company, score, reason FROM jobs WHERE status = ?"
+        params = [status]
+        if min_score is not None:
+            sql += " AND score >= ?"
+            params.append(min_score)
+        sql += " ORDER BY score DESC, updated_at"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [{"link": url, "source": source, "title": title, "company": company, "score": score, "summary": reason}
+                for url, source, title, company, score, reason in rows]
+
+    def recent(self, limit=10):
+        """Latest status changes as (at, status, title, source, detail)."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT t.at, t.status, j.title, j.source, t.detail FROM transitions t JOIN jobs j ON j.key = t.key "
+                "ORDER BY t.at DESC LIMIT ?", (limit,)
+            ).fetchall()
+
+    def counts(self):
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def history(self, url):
+        with self._lock:
+            return self._db.execute(
+                "SELECT status, at, detail FROM transitions WHERE key = ? ORDER BY at", (self.key(url),)
+            ).fetchall()
+
+    def import_legacy(self, path=None):
+        """One-time import of the old applied_jobs.txt URL list."""
+        path = path or config.APPLIED_JOBS_FILE
+        with self._lock:
+            done = self._db.execute("SELECT value FROM meta WHERE name = 'legacy_import'").fetchone()
+        if done or not os.path.exists(path):
+            return 0
+        with open(path, "r", encoding="utf-8") as f:
+            jobs = [{"link": line.strip()} for line in f if line.strip()]
+        self.bulk_upsert(jobs, "applied", detail=f"imported from {path}")
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('legacy_import', ?)", (str(time.time()),))
+            self._db.commit()
+        print(f"📥 Imported {len(jobs)} applied URLs from {path}")
+        return len(jobs)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
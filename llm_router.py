@@ -0,0 +1,439 @@
+# llm_router.py
+"""
+One entry point for every LLM call, over all configured providers.
+
+Providers (Groq, Gemini, and a deterministic fake for offline runs) hold
+one long-lived client each and are shared process-wide. Each has its own
+request and token buckets and a cap on calls in flight. Config.LLM_ROUTES
+lists "provider:model" routes in fallback tiers. A call goes to the best
+route of the first tier that has one available (by LLM_ROUTING). A route
+that errors is skipped for the rest of that call. One that keeps failing,
+or is rate limited (429), has its circuit breaker opened for a cooldown.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, deque, namedtuple
+from functools import lru_cache
+from types import SimpleNamespace
+
+import config
+import tracing
+from politeness import TokenBucket
+
+Completion = namedtuple("Completion", ["text", "provider", "model", "latency", "tokens_in", "tokens_out"])
+
+
+class ProviderUnavailable(Exception):
+    """The provider cannot be used at all (no API key, SDK not installed)."""
+
+
+class RateLimited(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMUnavailable(RuntimeError):
+    """Every route failed or is switched off."""
+
+
+def _rate_limit_info(error):
+    """(is_rate_limit, retry_after_seconds) for an exception raised by a provider SDK."""
+    if isinstance(error, RateLimited):
+        return True, error.retry_after
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    text = str(error).lower()
+    if status != 429 and "429" not in text and "rate limit" not in text and "resource exhausted" not in text:
+        return False, None
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return True, float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return True, None
+
+
+# rough size of a token in English text, for budgets that have to be set before a call
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return max(1, len(text or "") // CHARS_PER_TOKEN)
+
+
+# ======================================
+# LIMITS
+# ======================================
+class CircuitBreaker:
+    """
+    Opens after `failures` errors in a row, or at once on a rate limit, and
+    stays open for `cooldown` seconds (or the provider's Retry-After). After
+    that calls are let through again; the first failure re-opens it.
+    """
+
+    def __init__(self, failures=None, cooldown=None):
+        self.max_failures = failures or config.LLM_BREAKER_FAILURES
+        self.cooldown = config.LLM_BREAKER_COOLDOWN if cooldown is None else cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self.trips = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._failures < self.max_failures:
+                return "closed"
+            return "open" if time.monotonic() < self._open_until else "half-open"
+
+    def available(self):
+        return self.state != "open"
+
+    def success(self):
+        with self._lock:
+            self._failures = 0
+
+    def failure(self, cooldown=None, trip=False):
+        with self._lock:
+            self._failures = self.max_failures if trip else self._failures + 1
+            if self._failures >= self.max_failures:
+                self._open_until = time.monotonic() + (self.cooldown if cooldown is None else cooldown)
+                self.trips += 1
+
+
+# ======================================
+# PROVIDERS
+# ======================================
+class Provider:
+    """One LLM API: a long-lived client plus its rate limits and concurrency cap."""
+
+    name = None
+
+    def __init__(self, rpm=None, tpm=None, concurrency=None):
+        rpm = config.LLM_PROVIDER_RPM.get(self.name, 0) if rpm is None else rpm
+        tpm = config.LLM_PROVIDER_TPM.get(self.name, 0) if tpm is None else tpm
+        self.requests = TokenBucket(rpm / 60.0, capacity=max(1.0, rpm / 60.0 * 5))
+        self.tokens = TokenBucket(tpm / 60.0, capacity=tpm / 6.0)
+        self.slots = threading.BoundedSemaphore(concurrency or config.LLM_PROVIDER_CONCURRENCY.get(self.name, 2))
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens):
+        """Take one request and `tokens` tokens if both buckets allow it now; else seconds to wait."""
+        with self._lock:
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if wait == 0:
+                self.requests.take(1)
+                self.tokens.take(tokens)
+            return wait
+
+    def complete(self, model, messages, json_mode=False):
+        """
+        Returns (text, tokens_in, tokens_out); token counts may be None if the
+        API does not report them. With `json_mode` the API is asked for a JSON
+        object where it supports that.
+        """
+        raise NotImplementedError
+
+
+class GroqProvider(Provider):
+    name = "groq"
+
+    def __init__(self, api_key=None, **limits):
+        api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ProviderUnavailable("GROQ_API_KEY is not set")
+        try:
+            from groq import Groq
+        except ImportError:
+            raise ProviderUnavailable("the groq package is not installed") from None
+        super().__init__(**limits)
+        # one client for the whole process, so its HTTP connections are reused
+        self.client = Groq(api_key=api_key)
+
+    def complete(self, model, messages, json_mode=False):
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        response = self.client.chat.completions.create(model=model, messages=messages, **extra)
+        usage = getattr(response, "usage", None)
+        return (response.choices[0].message.content,
+                getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None))
+
+
+class GeminiProvider(Provider):
+    name = "gemini"
+
+    def __init__(self, api_key=None, **limits):
+        api_key = api_key or config.GEMINI_API_KEY
+        if not api_key:
+            raise ProviderUnavailable("GEMINI_API_KEY is not set")
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            raise ProviderUnavailable("the google-generativeai package is not installed") from None
+        super().__init__(**limits)
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        self._models = {}
+
+    def _model(self, model, system):
+        # GenerativeModel objects are reused across calls, one per (model, system prompt)
+        with self._lock:
+            key = (model, system)
+            if key not in self._models:
+                self._models[key] = self._genai.GenerativeModel(model, system_instruction=system)
+            return self._models[key]
+
+    def complete(self, model, messages, json_mode=False):
+        system = "\n".join(m["content"] for m in messages if m["role"] == "system") or None
+        prompt = "\n\n".join(m["content"] for m in messages if m["role"] != "system")
+        extra = {"generation_config": {"response_mime_type": "application/json"}} if json_mode else {}
+        response = self._model(model, system).generate_content(prompt, **extra)
+        usage = getattr(response, "usage_metadata", None)
+        return (response.text,
+                getattr(usage, "prompt_token_count", None), getattr(usage, "candidates_token_count", None))
+
+
+_JOB_LINE = re.compile(r"^\s*(\d+)\.\s+(.*)$", re.M)
+
+
+def _fake_score(text):
+    return 1 + int(hashlib.sha1(text.strip().lower().encode("utf-8")).hexdigest(), 16) % 10
+
+
+def fake_reply(prompt):
+    """Deterministic reply to the scoring prompts: the same job always gets the same score."""
+    if "Jobs:" in prompt:
+        jobs = _JOB_LINE.findall(prompt.split("Jobs:", 1)[1])
+        return json.dumps({"results": [{"id": int(i), "score": _fake_score(d), "summary": "fake provider score"}
+                                       for i, d in jobs]})
+    description = prompt.split("Job Description:", 1)[-1]
+    return json.dumps({"score": _fake_score(description), "summary": "fake provider score"})
+
+
+class FakeProvider(Provider):
+    """
+    Offline provider for tests and benchmarks. Replies come from `responder`
+    (default fake_reply) after `latency` seconds; every `fail_every`-th call
+    raises and every `rate_limit_every`-th call is a 429.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency=None, fail_every=0, rate_limit_every=0, responder=None, name=None, **limits):
+        if name:
+            self.name = name
+        super().__init__(**limits)
+        self.latency = config.LLM_FAKE_LATENCY if latency is None else latency
+        self.fail_every = fail_every
+        self.rate_limit_every = rate_limit_every
+        self.responder = responder or (lambda messages: fake_reply(messages[-1]["content"]))
+        self.calls = 0
+
+    def complete(self, model, messages, json_mode=False):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        time.sleep(self.latency)
+        if self.rate_limit_every and n % self.rate_limit_every == 0:
+            raise RateLimited(f"{self.name}: 429 Too Many Requests", retry_after=1.0)
+        if self.fail_every and n % self.fail_every == 0:
+            raise RuntimeError(f"{self.name}: simulated provider error")
+        text = self.responder(messages)
+        return text, estimate_tokens(" ".join(m["content"] for m in messages)), estimate_tokens(text)
+
+
+PROVIDERS = {"groq": GroqProvider, "gemini": GeminiProvider, "fake": FakeProvider}
+
+
+@lru_cache(maxsize=None)
+def provider(name):
+    """Shared provider instance by name; raises ProviderUnavailable if it cannot be used."""
+    if name not in PROVIDERS:
+        raise ProviderUnavailable(f"unknown LLM provider {name!r}")
+    return PROVIDERS[name]()
+
+
+# ======================================
+# ROUTER
+# ======================================
+class Route:
+    """One provider + model, with its breaker and metrics."""
+
+    def __init__(self, provider, model):
+        self.provider = provider
+        self.model = model
+        self.key = f"{provider.name}:{model}"
+        self.breaker = CircuitBreaker()
+        self.latencies = deque(maxlen=256)
+        self.ewma = None
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def price(self, tokens_in, tokens_out):
+        per_in, per_out = config.LLM_PRICES.get(self.model, (0.0, 0.0))
+        return (tokens_in * per_in + tokens_out * per_out) / 1e6
+
+    def expected(self, policy, tokens):
+        """Routing score for a call of about `tokens` prompt tokens; lower is better."""
+        # optimistic for a route never used yet, so every route gets measured
+        latency = 0.0 if self.ewma is None else self.ewma
+        cost = self.price(tokens, tokens // 2)
+        if policy == "latency":
+            return latency
+        if policy == "cost":
+            return cost
+        return latency + config.LLM_COST_WEIGHT * cost
+
+    def record(self, latency, tokens_in=0, tokens_out=0, error=None, rate_limited=False):
+        with self._lock:
+            self.counters["calls"] += 1
+            if error:
+                self.counters["rate_limited" if rate_limited else "errors"] += 1
+                return
+            self.latencies.append(latency)
+            self.ewma = latency if self.ewma is None else 0.8 * self.ewma + 0.2 * latency
+            self.counters.update(ok=1, tokens_in=tokens_in, tokens_out=tokens_out)
+            self.counters["cost_micro_usd"] += round(self.price(tokens_in, tokens_out) * 1e6)
+
+    def metrics(self):
+        with self._lock:
+            c = dict(self.counters)
+            lat = sorted(self.latencies)
+        pick = lambda q: round(lat[min(len(lat) - 1, int(q * len(lat)))], 3) if lat else None
+        return {
+            "calls": c.get("calls", 0),
+            "ok": c.get("ok", 0),
+            "errors": c.get("errors", 0),
+            "rate_limited": c.get("rate_limited", 0),
+            "tokens_in": c.get("tokens_in", 0),
+            "tokens_out": c.get("tokens_out", 0),
+            "cost_usd": round(c.get("cost_micro_usd", 0) / 1e6, 6),
+            "latency_p50": pick(0.5),
+            "latency_p95": pick(0.95),
+            "breaker": self.breaker.state,
+            "breaker_trips": self.breaker.trips,
+        }
+
+
+class LLMRouter:
+    """
+    Routes chat calls over `tiers` (lists of Routes). Thread-safe; use one
+    per process (get_router()).
+    """
+
+    def __init__(self, tiers, policy=None, max_wait=30.0):
+        self.tiers = [list(t) for t in tiers if t]
+        self.policy = policy or config.LLM_ROUTING
+        self.max_wait = max_wait
+        self.name = "|".join(",".join(r.key for r in tier) for tier in self.tiers)
+        # the route scores are cached for; answers from the fallbacks are not (see score_cache)
+        self.primary = self.tiers[0][0].key if self.tiers else None
+        # batch_scorer and older callers use the OpenAI-style client interface
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def routes(self):
+        return [r for tier in self.tiers for r in tier]
+
+    def _pick(self, tier, tried, tokens):
+        """The best route of a tier that has budget now, waiting for budget if need be; None if none is up."""
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            candidates = sorted((r for r in tier if r.key not in tried and r.breaker.available()),
+                                key=lambda r: r.expected(self.policy, tokens))
+            if not candidates:
+                return None
+            waits = []
+            for route in candidates:
+                wait = route.provider.reserve(tokens)
+                if wait == 0:
+                    return route
+                waits.append(wait)
+            pause = min(waits)
+            if time.monotonic() + pause > deadline:
+                return None
+            time.sleep(pause)
+
+    def complete(self, messages, json_mode=None):
+        json_mode = config.LLM_JSON_MODE if json_mode is None else json_mode
+        tokens = estimate_tokens(" ".join(m["content"] for m in messages))
+        tried = set()
+        last_error = None
+        for tier in self.tiers:
+            while True:
+                route = self._pick(tier, tried, tokens)
+                if route is None:
+                    break
+                tried.add(route.key)
+                started = time.perf_counter()
+                try:
+                    with route.provider.slots, tracing.span("llm_call", route=route.key):
+                        text, tokens_in, tokens_out = route.provider.complete(route.model, messages, json_mode)
+                except Exception as e:
+                    limited, retry_after = _rate_limit_info(e)
+                    route.record(time.perf_counter() - started, error=e, rate_limited=limited)
+                    if limited:
+                        # a 429 applies to the whole account, not just this model
+                        for other in self.routes():
+                            if other.provider is route.provider:
+                                other.breaker.failure(retry_after, trip=True)
+                    else:
+                        route.breaker.failure()
+                    print(f"⚠️ LLM route {route.key} failed{' (rate limited)' if limited else ''}: {e}")
+                    last_error = e
+                    continue
+                latency = time.perf_counter() - started
+                tokens_in = tokens_in or tokens
+                tokens_out = tokens_out or estimate_tokens(text)
+                route.record(latency, tokens_in, tokens_out)
+                route.breaker.success()
+                return Completion(text, route.provider.name, route.model, latency, tokens_in, tokens_out)
+        raise LLMUnavailable(f"No LLM route available ({self.name}): {last_error}")
+
+    def _create(self, model=None, messages=None, response_format=None, **kwargs):
+        text = self.complete(messages, json_mode=bool(response_format)).text
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+    def metrics(self):
+        return {r.key: r.metrics() for r in self.routes()}
+
+    def report(self):
+        lines = [f"🧭 LLM router ({self.policy}):"]
+        for key, m in self.metrics().items():
+            if not m["calls"]:
+                continue
+            lat = f"p50 {m['latency_p50']}s p95 {m['latency_p95']}s" if m["ok"] else "no successful calls"
+            lines.append(f"   {key:<40} {m['ok']}/{m['calls']} ok, {m['errors']} errors, "
+                         f"{m['rate_limited']} rate limited, {lat}, "
+                         f"{m['tokens_in'] + m['tokens_out']} tokens, ${m['cost_usd']:.4f}, breaker {m['breaker']}")
+        return "\n".join(lines) if len(lines) > 1 else "🧭 LLM router: no calls"
+
+
+def parse_routes(spec=None):
+    """"a:m1,b:m2|a:m3" -> [[("a", "m1"), ("b", "m2")], [("a", "m3")]]"""
+    spec = spec or config.LLM_ROUTES
+    return [[tuple(r.strip().split(":", 1)) for r in tier.split(",") if ":" in r]
+            for tier in spec.split("|")]
+
+
+def build_router(spec=None, policy=None):
+    """Router over the routes in `spec` whose provider is usable; None if there are none."""
+    tiers, skipped = [], set()
+    for tier in parse_routes(spec):
+        routes = []
+        for name, model in tier:
+            try:
+                routes.append(Route(provider(name), model))
+            except ProviderUnavailable as e:
+                if name not in skipped:
+                    print(f"⚠️ LLM provider {name} skipped: {e}")
+                    skipped.add(name)
+        tiers.append(routes)
+    router = LLMRouter(tiers, policy)
+    return router if router.tiers else None
+
+
+@lru_cache(maxsize=None)
+def get_router():
+    return build_router()
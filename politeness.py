@@ -0,0 +1,233 @@
+# politeness.py
+"""
+Per-host pacing for everything that talks to the job boards.
+
+Each host gets an adaptive token bucket (HostPacer). Its rate starts at the
+configured one, creeps up while requests succeed (up to POLITENESS_SPEEDUP
+times the configured rate), is cut by POLITENESS_SLOWDOWN on a 429, and
+after a CAPTCHA/OTP challenge drops to the floor. Both throttles and
+challenges also pause the host: for Retry-After, THROTTLE_PAUSE or
+CHALLENGE_PAUSE seconds. Hosts are paced independently, so a throttled
+board never holds up the others, and callers that have a choice can use
+Scheduler.pick() to go to the host that is ready soonest.
+
+get_scheduler() paces HTTP fetches; ApplyExecutor keeps its own per-site
+Scheduler for applies.
+"""
+import re
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+
+import config
+from url_utils import normalize_host
+
+# LinkedIn answers scrapers it does not like with a non-standard 999
+THROTTLE_STATUSES = {429, 999}
+# challenge pages we get redirected to, and the reasons auto_apply_agent gives for them
+_CHALLENGE = re.compile(r"captcha|/checkpoint|/challenge|authwall|\botp\b|verification required", re.I)
+
+
+def retry_after_seconds(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date); None if absent or unparseable."""
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def is_challenge(text):
+    """Whether a URL or an apply failure reason points at a CAPTCHA / OTP / login challenge."""
+    return bool(text and _CHALLENGE.search(text))
+
+
+class TokenBucket:
+    """`rate` tokens per second up to `capacity`; a rate of 0 means unlimited."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+
+    def wait_time(self, n=1):
+        """Seconds until `n` tokens are available (0 if they are now). Callers hold the owner's lock."""
+        if not self.rate:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        n = min(n, self.capacity)
+        return 0.0 if self._tokens >= n else (n - self._tokens) / self.rate
+
+    def take(self, n=1):
+        if self.rate:
+            self._tokens -= min(n, self.capacity)
+
+    def empty(self):
+        self.wait_time()
+        self._tokens = min(self._tokens, 0.0)
+
+
+class HostPacer:
+    """Adaptive token bucket plus pause for one host (or apply site)."""
+
+    def __init__(self, host, rate, burst=None):
+        self.host = host
+        self.base_rate = rate
+        self.bucket = TokenBucket(rate, burst or config.POLITENESS_BURST)
+        self.paused_until = 0.0
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self.bucket.rate
+
+    def _delay(self):
+        return max(self.paused_until - time.monotonic(), self.bucket.wait_time())
+
+    def ready_in(self):
+        """Seconds until the next request may go out."""
+        with self._lock:
+            return max(0.0, self._delay())
+
+    def acquire(self, max_wait=None):
+        """
+        Wait for this host's next slot and take it. Returns the seconds
+        waited, or None without taking a slot if that would be more than
+        `max_wait` (a paused host).
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                delay = self._delay()
+                if delay <= 0:
+                    self.bucket.take()
+                    self.stats["requests"] += 1
+                    self.stats["waited"] += waited
+                    return waited
+                if max_wait is not None and waited + delay > max_wait:
+                    self.stats["gave_up"] += 1
+                    return None
+            # re-check after sleeping: a throttle on another thread may have paused the host meanwhile
+            time.sleep(delay)
+            waited += delay
+
+    def success(self):
+        """Additive increase, up to POLITENESS_SPEEDUP x the configured rate."""
+        with self._lock:
+            if self.base_rate:
+                self.bucket.rate = min(self.base_rate * config.POLITENESS_SPEEDUP,
+                                       self.bucket.rate + self.base_rate * config.POLITENESS_STEP)
+
+    def _back_off(self, rate, pause):
+        self.bucket.rate = max(self.base_rate * config.POLITENESS_FLOOR, rate)
+        self.bucket.empty()
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def throttled(self, retry_after=None):
+        """The host said slow down (429): cut the rate and pause for Retry-After (or THROTTLE_PAUSE)."""
+        with self._lock:
+            self.stats["throttled"] += 1
+            pause = config.THROTTLE_PAUSE if retry_after is None else retry_after
+            self._back_off(self.bucket.rate * config.POLITENESS_SLOWDOWN, pause)
+
+    def challenged(self):
+        """A CAPTCHA/OTP challenge: slowest rate and a CHALLENGE_PAUSE pause."""
+        with self._lock:
+            self.stats["challenges"] += 1
+            self._back_off(0.0, config.CHALLENGE_PAUSE)
+        print(f"⚠️ Challenge on {self.host}: pausing it for {config.CHALLENGE_PAUSE:.0f}s")
+
+
+class Scheduler:
+    """
+    HostPacers keyed by host. `rates` maps a host, or any domain it ends
+    with ("linkedin.com" covers "in.linkedin.com"), to requests per second;
+    other hosts get `default_rate` (0 = unpaced). `burst` is how many
+    requests may go out back to back (default POLITENESS_BURST).
+    """
+
+    def __init__(self, rates=None, default_rate=None, burst=None, name="fetch"):
+        self.rates = {normalize_host(h): r for h, r in (config.FETCH_HOST_RATES if rates is None else rates).items()}
+        self.default_rate = config.FETCH_DEFAULT_RATE if default_rate is None else default_rate
+        self.burst = burst
+        self.name = name
+        self._pacers = {}
+        self._lock = threading.Lock()
+
+    def _rate(self, host):
+        parts = host.split(".")
+        for i in range(len(parts)):
+            rate = self.rates.get(".".join(parts[i:]))
+            if rate is not None:
+                return rate
+        return self.default_rate
+
+    def pacer(self, host):
+        host = normalize_host(host) or "unknown"
+        with self._lock:
+            if host not in self._pacers:
+                self._pacers[host] = HostPacer(host, self._rate(host), self.burst)
+            return self._pacers[host]
+
+    def acquire(self, host, max_wait=None):
+        return self.pacer(host).acquire(max_wait)
+
+    def feedback(self, host, status, retry_after=None, url=None):
+        """Adapt to one HTTP response: 429/999 throttle, a redirect (`url`) to a challenge page, or success."""
+        pacer = self.pacer(host)
+        if status in THROTTLE_STATUSES or (status == 503 and retry_after is not None):
+            pacer.throttled(retry_after)
+        elif url and is_challenge(url):
+            pacer.challenged()
+        elif status < 400:
+            pacer.success()
+
+    def pick(self, hosts):
+        """The host among `hosts` whose next slot comes soonest."""
+        return min(hosts, key=lambda h: self.pacer(h).ready_in())
+
+    def _used(self):
+        with self._lock:
+            return [p for p in self._pacers.values() if p.stats["requests"] or p.stats["gave_up"]]
+
+    @property
+    def used(self):
+        return bool(self._used())
+
+    def report(self):
+        pacers = self._used()
+        if not pacers:
+            return f"🚦 Pacing ({self.name}): no requests"
+        parts = []
+        for p in pacers:
+            s = p.stats
+            part = f"{p.host} {s['requests']} req, waited {s['waited']:.1f}s"
+            if p.base_rate:
+                part += f", rate {p.rate:.2f}/s (base {p.base_rate:.2f})"
+            for key in ("throttled", "challenges", "gave_up"):
+                if s[key]:
+                    part += f", {s[key]} {key.replace('_', ' ')}"
+            parts.append(part)
+        return f"🚦 Pacing ({self.name}): " + "; ".join(parts)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Process-wide scheduler for HTTP fetches (FETCH_HOST_RATES)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
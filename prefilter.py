@@ -0,0 +1,68 @@
+# prefilter.py
+import json
+import re
+
+import config
+
+# How much one matched term from each skills.json section is worth
+CATEGORY_WEIGHTS = {
+    "roles_of_interest": 3,
+    "technical_skills": 2,
+    "tools": 1,
+    "soft_skills": 0,
+}
+
+
+class SkillMatcher:
+    """Single compiled regex over all skill terms, matched on word boundaries."""
+
+    def __init__(self, weights):
+        self.weights = {t.lower(): w for t, w in weights.items() if t.strip() and w > 0}
+        alternation = "|".join(re.escape(t) for t in sorted(self.weights, key=len, reverse=True))
+        self._regex = re.compile(rf"(?<![a-z0-9])(?:{alternation})(?![a-z0-9])") if self.weights else None
+
+    @classmethod
+    def from_skills_file(cls, path=None, extra_terms=None):
+        with open(path or config.SKILLS_JSON, "r", encoding="utf-8") as f:
+            skills = json.load(f)
+        weights = {}
+        for category, terms in skills.items():
+            for term in terms:
+                weights[term] = max(weights.get(term, 0), CATEGORY_WEIGHTS.get(category, 1))
+        for term in extra_terms if extra_terms is not None else config.PREFILTER_EXTRA_TERMS:
+            weights.setdefault(term, CATEGORY_WEIGHTS["technical_skills"])
+        return cls(weights)
+
+    def match(self, text):
+        """Return (score, matched_terms); each distinct term counts once."""
+        if not self._regex:
+            return 0, []
+        found = sorted(set(self._regex.findall((text or "").lower())))
+        return sum(self.weights[t] for t in found), found
+
+
+class PreFilter:
+    """Drops listings with too little skill overlap before they reach the LLM."""
+
+    def __init__(self, matcher=None, threshold=None):
+        self.matcher = matcher or SkillMatcher.from_skills_file()
+        self.threshold = config.PREFILTER_MIN_SCORE if threshold is None else threshold
+        self.seen = 0
+        self.dropped = 0
+
+    def keep(self, job):
+        text = " ".join(str(job.get(k) or "") for k in ("title", "company", "description"))
+        score, terms = self.matcher.match(text)
+        job["prefilter_score"] = score
+        self.seen += 1
+        if score < self.threshold:
+            self.dropped += 1
+            return False
+        return True
+
+    def report(self, batch_size=None):
+        batch_size = batch_size or config.LLM_BATCH_SIZE
+        calls_saved = -(-self.dropped // batch_size)
+        pct = self.dropped / self.seen if self.seen else 0.0
+        return (f"🧹 Pre-filter (threshold {self.threshold}): kept {self.seen - self.dropped}/{self.seen}, "
+                f"dropped {self.dropped} ({pct:.0%}) — saved {self.dropped} LLM item(s), ~{calls_saved} batch call(s)")
@@ -0,0 +1,87 @@
+# ranker.py
+import re
+import zlib
+
+import numpy as np
+
+import config
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text):
+    words = _TOKEN.findall((text or "").lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class HashingVectorizer:
+    """Stateless bag-of-words (unigrams + bigrams) hashed into a fixed-width vector."""
+
+    def __init__(self, n_features=None):
+        self.n_features = n_features or config.RANK_FEATURES
+
+    def transform(self, texts):
+        """Return an L2-normalised float32 matrix with one row per text."""
+        texts = list(texts)
+        out = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                h = zlib.crc32(token.encode("utf-8"))
+                # the top hash bit picks the sign so collisions tend to cancel out
+                out[row, h % self.n_features] += 1.0 if h & 0x80000000 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+def job_text(job):
+    return " ".join(str(job.get(k) or "") for k in ("title", "company", "location", "description"))
+
+
+class ResumeRanker:
+    """
+    Ranks jobs by cosine similarity to the resume.
+
+    Job vectors live in one growable matrix, so scoring every job is a
+    single matrix-vector product and new jobs can be added between calls.
+    """
+
+    def __init__(self, resume_text, vectorizer=None):
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self.resume_vec = self.vectorizer.transform([resume_text])[0]
+        self.jobs = []
+        self._matrix = np.zeros((0, self.vectorizer.n_features), dtype=np.float32)
+
+    @classmethod
+    def from_resume_file(cls, path=None):
+        with open(path or config.RESUME_FILE, "r", encoding="utf-8") as f:
+            return cls(f.read())
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add_jobs(self, jobs):
+        jobs = list(jobs)
+        if not jobs:
+            return
+        needed = len(self.jobs) + len(jobs)
+        if needed > self._matrix.shape[0]:
+            grown = np.zeros((max(needed, 2 * self._matrix.shape[0], 64), self.vectorizer.n_features),
+                             dtype=np.float32)
+            grown[:len(self.jobs)] = self._matrix[:len(self.jobs)]
+            self._matrix = grown
+        self._matrix[len(self.jobs):needed] = self.vectorizer.transform(job_text(j) for j in jobs)
+        self.jobs.extend(jobs)
+
+    def scores(self):
+        return self._matrix[:len(self.jobs)] @ self.resume_vec
+
+    def top_k(self, k):
+        """Return [(job, similarity)] for the k best matches, best first."""
+        if not self.jobs:
+            return []
+        scores = self.scores()
+        k = min(k, len(scores))
+        idx = np.argpartition(-scores, k - 1)[:k]
+        idx = idx[np.argsort(-scores[idx])]
+        return [(self.jobs[i], float(scores[i])) for i in idx]
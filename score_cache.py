@@ -0,0 +1,170 @@
+# score_cache.py
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+import config
+
+
+def normalize(description):
+    """Lowercase and collapse whitespace so cosmetic changes still hit the cache."""
+    return re.sub(r"\s+", " ", (description or "").strip().lower())
+
+
+def cache_key(description, model, prompt_version):
+    raw = "\0".join([normalize(description), model or "", prompt_version or ""])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """
+    On-disk cache of LLM relevance scores, keyed by content hash.
+
+    Entries expire after `ttl` seconds and the table is trimmed back to
+    `max_entries` by least-recent access. Hit/miss counts are kept for the
+    lifetime of the object.
+    """
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        self.path = path or config.SCORE_CACHE_FILE
+        self.ttl = config.SCORE_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or config.SCORE_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS scores (
+                   key TEXT PRIMARY KEY,
+                   result TEXT NOT NULL,
+                   created_at REAL NOT NULL,
+                   accessed_at REAL NOT NULL
+               )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_scores_accessed ON scores(accessed_at)")
+        self._db.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT result, created_at FROM scores WHERE key = ?", (key,)).fetchone()
+            if row and (not self.ttl or now - row[1] <= self.ttl):
+                self._db.execute("UPDATE scores SET accessed_at = ? WHERE key = ?", (now, key))
+                self._db.commit()
+                self.hits += 1
+                return json.loads(row[0])
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO scores (key, result, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result), now, now),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._evict(now)
+            self._db.commit()
+
+    def evict(self):
+        with self._lock:
+            self._evict(time.time())
+            self._db.commit()
+
+    def _evict(self, now):
+        if self.ttl:
+            self._db.execute("DELETE FROM scores WHERE created_at < ?", (now - self.ttl,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM scores").fetchone()
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def stats(self):
+        with self._lock:
+            (entries,) = self._db.execute("SELECT COUNT(*) FROM scores").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._evict(time.time())
+            self._db.commit()
+            self._db.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache instance, or None when SCORE_CACHE_ENABLED is off."""
+    global _cache
+    if not config.SCORE_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ScoreCache()
+        return _cache
+
+
+def close_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+            _cache = None
+
+
+def cached_score(description, model, prompt_version, compute):
+    """Return the cached result for this description, or compute and store it."""
+    cache = get_cache()
+    if cache is None:
+        return compute(description)
+    key = cache_key(description, model, prompt_version)
+    result = cache.get(key)
+    if result is None:
+        result = compute(description)
+        if is_cacheable(result, model):
+            cache.put(key, result)
+    return result
+
+
+def cached_batch(descriptions, model, prompt_version, compute_batch):
+    """Batch variant of cached_score: only cache misses are sent to `compute_batch`."""
+    cache = get_cache()
+    if cache is None:
+        return compute_batch(descriptions)
+    keys = [cache_key(d, model, prompt_version) for d in descriptions]
+    results = [cache.get(k) for k in keys]
+    todo = [i for i, r in enumerate(results) if r is None]
+    if todo:
+        fresh = compute_batch([descriptions[i] for i in todo])
+        for i, result in zip(todo, fresh):
+            results[i] = result
+            if is_cacheable(result, model):
+                cache.put(keys[i], result)
+    return results
+
+
+def is_cacheable(result, model=None):
+    """
+    Only keep real scores (1-10); failures score 0 and are retried next run.
+    A result naming another `model` than the key's (a router fallback) is
+    not kept either, so it is never served as the primary model's score.
+    """
+    return (isinstance(result, dict) and result.get("score", 0) > 0
+            and (model is None or result.get("model", model) == model))
@@ -0,0 +1,260 @@
+# sources/__init__.py
+"""
+Job-board adapters.
+
+Each board lives in its own module, sources/<name>.py, which defines a
+SourceAdapter subclass decorated with @register. Modules are imported only
+when a board is first asked for (config.SOURCES lists the enabled ones), and
+nothing here imports Selenium or an LLM SDK, so scrape-only runs start fast.
+Adding a board means adding a module and naming it in SOURCES.
+"""
+import importlib
+import json
+import threading
+import time
+from collections import Counter
+from urllib.parse import urljoin, urlsplit
+
+import config
+import tracing
+from html_backend import clean_text, parse_page
+from http_client import get_client
+from url_utils import canonical_url, normalize_host
+
+_registry = {}
+_by_host = {}
+_lock = threading.RLock()
+
+
+class SourceAdapter:
+    """
+    One job board: how to fetch and parse its listings, how to turn its links
+    into store/dedup keys, and how to apply.
+
+    Subclasses set the class attributes and implement parse() and apply().
+    Adapters double as crawl sources (name, url_template, page_size,
+    fetch_page), see crawler.crawl_jobs.
+    """
+
+    name = None           # display name, stored as job["source"]
+    base_url = None       # relative links are resolved against this
+    hosts = ()            # hosts whose URLs canonicalize() handles
+    search_url = None     # single listing page for the default fetch
+    url_template = None   # crawl-mode page template (see crawler.page_urls)
+    page_size = 1
+    # detail page: field -> CSS selectors tried in order (see parse_detail)
+    detail_selectors = {}
+    email = None
+    password = None
+
+    def __init__(self):
+        self.key = self.name.lower()
+        self._lock = threading.Lock()
+        self.counters = Counter()
+
+    # ---------- board specifics ----------
+    def parse(self, html):
+        """HTML listing page -> list of job dicts (source, title, company, link)."""
+        raise NotImplementedError
+
+    def apply(self, job, pool=None, headless=True):
+        """Apply to one job; returns (ok, reason)."""
+        raise NotImplementedError
+
+    def is_apply_control(self, tag, cls, text):
+        """Whether a button/link on an apply page is the one apply() would click (dry-run check)."""
+        return False
+
+    def parse_detail(self, html):
+        """
+        Job detail page -> {description, company, location, stipend}, with
+        only the fields that were found. A schema.org JobPosting (JSON-LD)
+        is read first, then this board's `detail_selectors` fill the gaps,
+        and the meta description stands in for a missing description.
+        """
+        root = parse_page(html)
+        found = _posting_fields(root)
+        for field, selectors in self.detail_selectors.items():
+            if found.get(field):
+                continue
+            for css in selectors:
+                node = root.first(css)
+                value = clean_text(node.html) if node else ""
+                if value:
+                    found[field] = value
+                    break
+        if not found.get("description"):
+            meta = root.first("meta[property='og:description'], meta[name='description']")
+            if meta and clean_text(meta.attr("content")):
+                found["description"] = clean_text(meta.attr("content"))
+        return found
+
+    def link(self, href):
+        return urljoin(self.base_url, href) if href else None
+
+    def canonicalize(self, url):
+        """Key under which this board's job URL is stored and deduplicated."""
+        return canonical_url(url)
+
+    # ---------- fetching ----------
+    def _count(self, **amounts):
+        with self._lock:
+            self.counters.update(amounts)
+
+    def fetch_page(self, url):
+        started = time.monotonic()
+        try:
+            with tracing.span("fetch_page", source=self.name):
+                jobs = get_client().get_parsed(url, self.parse)
+        except Exception:
+            self._count(errors=1, seconds=time.monotonic() - started)
+            raise
+        self._count(pages=1, jobs=len(jobs), seconds=time.monotonic() - started)
+        return jobs
+
+    def fetch(self, max_items=None):
+        """Fetch the single search page; errors are logged and yield no jobs."""
+        print(f"🔍 Fetching {self.name}...")
+        try:
+            return self.fetch_page(self.search_url)[:max_items or config.MAX_JOBS_PER_SITE]
+        except Exception as e:
+            print(f"⚠️ {self.name} fetch failed:", e)
+            return []
+
+    def stats(self):
+        with self._lock:
+            c = dict(self.counters)
+        seconds = c.get("seconds", 0.0)
+        return {
+            "pages": c.get("pages", 0),
+            "jobs": c.get("jobs", 0),
+            "errors": c.get("errors", 0),
+            "seconds": round(seconds, 3),
+            "jobs_per_s": round(c.get("jobs", 0) / seconds, 1) if seconds else 0.0,
+        }
+
+
+def _name(value):
+    """The "name" of a schema.org thing, which may also be given as a plain string."""
+    return value.get("name") if isinstance(value, dict) else value
+
+
+def _postings(data):
+    """JobPosting objects in a JSON-LD document (top level, lists and @graph)."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _postings(item)
+    elif isinstance(data, dict):
+        kind = data.get("@type")
+        if kind == "JobPosting" or (isinstance(kind, list) and "JobPosting" in kind):
+            yield data
+        yield from _postings(data.get("@graph"))
+
+
+def _location(posting):
+    places = posting.get("jobLocation") or []
+    names = []
+    for place in places if isinstance(places, list) else [places]:
+        address = place.get("address") if isinstance(place, dict) else place
+        if isinstance(address, dict):
+            parts = [_name(address.get(k)) for k in ("addressLocality", "addressRegion", "addressCountry")]
+            address = ", ".join(str(p) for p in parts if p)
+        if address and address not in names:
+            names.append(str(address))
+    if posting.get("jobLocationType") == "TELECOMMUTE":
+        names.append("Remote")
+    return "; ".join(names)
+
+
+def _salary(posting):
+    salary = posting.get("baseSalary")
+    if not isinstance(salary, dict):
+        return str(salary or "")
+    value = salary.get("value")
+    unit = ""
+    if isinstance(value, dict):
+        unit = value.get("unitText") or ""
+        low, high = value.get("minValue"), value.get("maxValue")
+        value = value.get("value") if low is None else (f"{low}-{high}" if high not in (None, low) else low)
+    if value in (None, ""):
+        return ""
+    text = f"{salary.get('currency') or ''} {value}".strip()
+    return f"{text}/{unit.lower()}" if unit else text
+
+
+def _posting_fields(root):
+    """Fields of the first JobPosting in the page's JSON-LD blocks ({} if there is none)."""
+    for script in root.all("script[type='application/ld+json']"):
+        try:
+            data = json.loads(script.text)
+        except ValueError:
+            continue
+        for posting in _postings(data):
+            fields = {
+                "description": clean_text(posting.get("description")),
+                "company": clean_text(str(_name(posting.get("hiringOrganization")) or "")),
+                "location": _location(posting),
+                "stipend": _salary(posting),
+            }
+            return {k: v for k, v in fields.items() if v}
+    return {}
+
+
+def register(cls):
+    """Class decorator used by the board modules."""
+    with _lock:
+        adapter = cls()
+        _registry[adapter.key] = adapter
+        for host in cls.hosts:
+            _by_host[normalize_host(host)] = adapter
+    return cls
+
+
+def get(name):
+    """Adapter for a board name (any casing), importing its module on first use."""
+    key = (name or "").lower()
+    with _lock:
+        if key not in _registry:
+            if not key.isidentifier():
+                raise KeyError(f"No source adapter named {name!r}")
+            try:
+                importlib.import_module(f"{__name__}.{key}")
+            except ModuleNotFoundError as e:
+                if e.name != f"{__name__}.{key}":
+                    raise
+                raise KeyError(f"No source adapter named {name!r}") from None
+        return _registry[key]
+
+
+def enabled():
+    """Adapters for the boards listed in config.SOURCES, in that order."""
+    return [get(name) for name in config.SOURCES]
+
+
+def find(job):
+    """Adapter for a job dict (by its "source"), or None for unknown boards."""
+    try:
+        return get(job.get("source"))
+    except KeyError:
+        return None
+
+
+def canonicalize(url):
+    """Store/dedup key for any job URL: the owning board's rule, else the generic one."""
+    if not url:
+        return ""
+    if not _by_host:
+        enabled()
+    adapter = _by_host.get(normalize_host(urlsplit(url.strip()).hostname))
+    return adapter.canonicalize(url) if adapter else canonical_url(url)
+
+
+def stats():
+    with _lock:
+        return {a.name: a.stats() for a in _registry.values()}
+
+
+def report():
+    parts = [f"{name} {s['jobs']} jobs/{s['pages']} pages, {s['errors']} errors ({s['jobs_per_s']}/s)"
+             for name, s in stats().items() if s["pages"] or s["errors"]]
+    return "📡 Sources: " + ("; ".join(parts) if parts else "nothing fetched")
@@ -0,0 +1,46 @@
+# sources/internshala.py
+import config
+from html_backend import CardSpec, parse_cards
+from sources import SourceAdapter, register
+
+CARDS = CardSpec((".individual_internship", ".internship_meta"),
+                 ("div", {"class": ["individual_internship", "internship_meta"]}))
+
+
+@register
+class Internshala(SourceAdapter):
+    name = "Internshala"
+    base_url = "https://internshala.com"
+    hosts = ("internshala.com",)
+    search_url = config.INTERNSHALA_SEARCH_URL
+    url_template = config.INTERNSHALA_CRAWL_URL
+    detail_selectors = {
+        "description": (".internship_details .text-container", ".internship_details"),
+        "company": (".company_name a", ".company_name", ".company-name"),
+        "location": ("#location_names", ".location_link"),
+        "stipend": (".stipend",),
+    }
+    email = config.INTERNSHALA_EMAIL
+    password = config.INTERNSHALA_PASSWORD
+
+    def parse(self, html):
+        jobs = []
+        for card in parse_cards(html, CARDS):
+            # class names change now and then; fall back to older markup
+            title = card.first(".job-internship-name") or card.first(".heading_4_5") or card.first("h3")
+            company = card.first(".link_display_like_text, .company_name")
+            link_tag = card.first("a")
+            jobs.append({
+                "source": self.name,
+                "title": title.text.strip() if title else "Untitled",
+                "company": company.text.strip() if company else "Unknown",
+                "link": self.link(link_tag.attr("href")) if link_tag else None,
+            })
+        return jobs
+
+    def apply(self, job, pool=None, headless=True):
+        from auto_apply_agent import apply_internshala
+        return apply_internshala(job["link"], self.email, self.password, headless=headless, pool=pool)
+
+    def is_apply_control(self, tag, cls, text):
+        return tag == "a" and ("apply_button" in cls or "Apply" in text)
@@ -0,0 +1,38 @@
+# sources/jobright.py
+import config
+from html_backend import CardSpec, parse_cards
+from sources import SourceAdapter, register
+
+CARDS = CardSpec(("a.job-card, .job-listing a, a[href*='/jobs/']",), ("a",))
+
+
+@register
+class Jobright(SourceAdapter):
+    name = "Jobright"
+    base_url = "https://www.jobright.ai"
+    hosts = ("jobright.ai",)
+    search_url = config.JOBRIGHT_SEARCH_URL
+    url_template = config.JOBRIGHT_CRAWL_URL
+    detail_selectors = {
+        "description": ("[class*='job-description']", "[class*='description']"),
+        "company": ("[class*='company-name']",),
+        "location": ("[class*='location']",),
+        "stipend": ("[class*='salary']",),
+    }
+    email = config.JOBRIGHT_EMAIL
+    password = config.JOBRIGHT_PASSWORD
+
+    def parse(self, html):
+        jobs = []
+        for a in parse_cards(html, CARDS):
+            text = a.text.strip()
+            if text and ("machine learning" in text.lower() or "intern" in text.lower()):
+                jobs.append({"source": self.name, "title": text, "company": self.name, "link": self.link(a.attr("href"))})
+        return jobs
+
+    def apply(self, job, pool=None, headless=True):
+        from auto_apply_agent import apply_jobright
+        return apply_jobright(job["link"], self.email, self.password, headless=headless, pool=pool)
+
+    def is_apply_control(self, tag, cls, text):
+        return tag == "a" and "Apply" in text
@@ -0,0 +1,48 @@
+# sources/linkedin.py
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+import config
+from html_backend import CardSpec, parse_cards
+from sources import SourceAdapter, register
+from url_utils import canonical_url
+
+CARDS = CardSpec(("a.base-card__full-link, a.result-card__full-card-link",),
+                 ("a", {"class": ["base-card__full-link", "result-card__full-card-link"]}))
+# Job slugs end in the numeric posting id; the slug text varies by locale
+_VIEW = re.compile(r"^/jobs/view/(?:[^/]*-)?(\d+)$")
+
+
+@register
+class LinkedIn(SourceAdapter):
+    name = "LinkedIn"
+    base_url = "https://www.linkedin.com"
+    hosts = ("linkedin.com",)
+    search_url = config.LINKEDIN_SEARCH_URL
+    url_template = config.LINKEDIN_CRAWL_URL
+    page_size = 25
+    detail_selectors = {
+        "description": (".show-more-less-html__markup", ".description__text"),
+        "company": (".topcard__org-name-link", ".top-card-layout__second-subline a"),
+        "location": (".topcard__flavor--bullet",),
+        "stipend": (".compensation__salary",),
+    }
+    email = config.LINKEDIN_EMAIL
+    password = config.LINKEDIN_PASSWORD
+
+    def parse(self, html):
+        return [
+            {"source": self.name, "title": a.text.strip(), "company": self.name, "link": self.link(a.attr("href"))}
+            for a in parse_cards(html, CARDS)
+        ]
+
+    def canonicalize(self, url):
+        parts = urlsplit(canonical_url(url))
+        return urlunsplit(parts._replace(path=_VIEW.sub(r"/jobs/view/\1", parts.path)))
+
+    def apply(self, job, pool=None, headless=True):
+        from auto_apply_agent import apply_linkedin
+        return apply_linkedin(job["link"], self.email, self.password, headless=headless, pool=pool)
+
+    def is_apply_control(self, tag, cls, text):
+        return tag == "button" and ("Easy Apply" in text or "Apply now" in text)
@@ -0,0 +1,39 @@
+# sources/wellfound.py
+import config
+from html_backend import CardSpec, parse_cards
+from sources import SourceAdapter, register
+
+CARDS = CardSpec(("a[data-test='job-link'], a.job-link, a[href*='/jobs/']",), ("a",))
+
+
+@register
+class Wellfound(SourceAdapter):
+    name = "Wellfound"
+    base_url = "https://wellfound.com"
+    hosts = ("wellfound.com",)
+    search_url = config.WELLFOUND_SEARCH_URL
+    url_template = config.WELLFOUND_CRAWL_URL
+    # job pages carry a JobPosting JSON-LD block; these cover pages without one
+    detail_selectors = {
+        "description": ("[data-test='JobDescription']", "[class*='description']"),
+        "company": ("a[href^='/company/'] h2", "a[href^='/company/']"),
+        "location": ("[data-test='JobLocation']", "[class*='location']"),
+        "stipend": ("[data-test='Compensation']", "[class*='compensation']"),
+    }
+    email = config.WELLFOUND_EMAIL
+    password = config.WELLFOUND_PASSWORD
+
+    def parse(self, html):
+        jobs = []
+        for a in parse_cards(html, CARDS):
+            text = a.text.strip()
+            if "intern" in text.lower() or "machine learning" in text.lower():
+                jobs.append({"source": self.name, "title": text, "company": self.name, "link": self.link(a.attr("href"))})
+        return jobs
+
+    def apply(self, job, pool=None, headless=True):
+        from auto_apply_agent import apply_wellfound
+        return apply_wellfound(job["link"], self.email, self.password, headless=headless, pool=pool)
+
+    def is_apply_control(self, tag, cls, text):
+        return tag == "button" and "Apply" in text
@@ -0,0 +1,56 @@
+# startup_profile.py
+"""
+Import-time breakdown for `python job_agent.py --profile-startup ...`.
+
+Standard library only, so it can be installed before anything else loads.
+Like `python -X importtime`, each package is charged only its own time,
+not the time of the packages it imports in turn.
+"""
+import builtins
+import sys
+import time
+from collections import defaultdict
+
+_self_time = defaultdict(float)
+_stack = []
+_original_import = None
+_installed_at = None
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    _stack.append(0.0)
+    started = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - started
+        children = _stack.pop()
+        _self_time[name.split(".")[0]] += elapsed - children
+        if _stack:
+            _stack[-1] += elapsed
+
+
+def install():
+    global _original_import, _installed_at
+    if _original_import is None:
+        _original_import = builtins.__import__
+        _installed_at = time.perf_counter()
+        builtins.__import__ = _timed_import
+
+
+def uninstall():
+    global _original_import
+    if _original_import is not None:
+        builtins.__import__ = _original_import
+        _original_import = None
+
+
+def report(top=15):
+    total = sum(_self_time.values())
+    wall = time.perf_counter() - _installed_at if _installed_at else 0.0
+    lines = [f"⏱️ Startup profile: {total * 1000:.0f} ms in imports, {wall * 1000:.0f} ms since start"]
+    for name, seconds in sorted(_self_time.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        lines.append(f"   {name:<28}{seconds * 1000:>8.1f} ms")
+    return "\n".join(lines)
@@ -0,0 +1,254 @@
+# structured_output.py
+"""
+Parsing of LLM replies that should be JSON but often are not quite.
+
+Models wrap JSON in ```json fences or in prose, use single quotes or
+Python literals, leave trailing commas, or get cut off mid-array. Rather
+than calling json.loads on the raw text and scoring 0 on failure, replies
+go through extract -> repair -> schema check here. Only items that still
+fail are returned as None, so callers can re-query just those. Every step
+is counted in STATS.
+"""
+import json
+import re
+import threading
+from collections import Counter, namedtuple
+
+
+class ParseError(ValueError):
+    """No JSON value could be recovered from a reply."""
+
+
+class SchemaError(ValueError):
+    """A JSON value was recovered but does not fit the schema."""
+
+
+# ======================================
+# SCHEMA
+# ======================================
+# kind: int or str; low/high bound ints; aliases are other keys models use for the same field
+Field = namedtuple("Field", ["name", "kind", "required", "low", "high", "default", "aliases"])
+
+SCORE_SCHEMA = (
+    Field("score", int, True, 0, 10, None, ("relevance", "relevance_score", "rating")),
+    Field("summary", str, False, None, None, "", ("reason", "reasoning", "explanation")),
+)
+BATCH_ITEM_SCHEMA = (Field("id", int, True, 1, None, None, ("job_id", "index")),) + SCORE_SCHEMA
+
+_NUMBER = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(?:/\s*10)?\s*$")
+
+
+def _coerce_int(value):
+    if isinstance(value, bool):
+        raise SchemaError("boolean where a number was expected")
+    if isinstance(value, (int, float)):
+        return int(round(value))
+    match = _NUMBER.match(str(value))
+    if not match:
+        raise SchemaError(f"not a number: {value!r}")
+    return int(round(float(match.group(1))))
+
+
+def validate(obj, schema):
+    """Checked and coerced copy of `obj` holding only the schema's fields; raises SchemaError."""
+    if not isinstance(obj, dict):
+        raise SchemaError(f"expected an object, got {type(obj).__name__}")
+    lowered = {str(k).strip().lower(): v for k, v in obj.items()}
+    out = {}
+    for field in schema:
+        key = next((k for k in (field.name,) + field.aliases if k in lowered), None)
+        if key is None or lowered[key] is None:
+            if field.required:
+                raise SchemaError(f"missing {field.name}")
+            out[field.name] = field.default
+            continue
+        value = lowered[key]
+        if field.kind is int:
+            value = _coerce_int(value)
+            if (field.low is not None and value < field.low) or (field.high is not None and value > field.high):
+                raise SchemaError(f"{field.name} {value} out of range")
+        else:
+            value = value if isinstance(value, str) else json.dumps(value)
+        out[field.name] = value
+    return out
+
+
+# ======================================
+# METRICS
+# ======================================
+class ParseStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = Counter()
+
+    def count(self, **amounts):
+        with self._lock:
+            self.counts.update(amounts)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts)
+
+    def report(self):
+        c = Counter(self.snapshot())
+        if not c["replies"]:
+            return "🧩 Structured output: no replies parsed"
+        line = (f"🧩 Structured output: {c['replies']} replies ({c['clean']} clean, {c['extracted']} extracted "
+                f"from fences/prose, {c['repaired']} repaired, {c['unparseable']} unparseable)")
+        if c["items"]:
+            line += f"; {c['items_invalid']}/{c['items']} items invalid ({c['items_invalid'] / c['items']:.1%})"
+        if c["requeried"]:
+            line += f", {c['requeried']} re-queried"
+        return line
+
+
+STATS = ParseStats()
+
+
+# ======================================
+# EXTRACTION + REPAIR
+# ======================================
+_FENCE = re.compile(r"```[ \t]*(?:json|JSON)?[ \t]*\r?\n?(.*?)```", re.S)
+_FLAT_OBJECT = re.compile(r"\{[^{}]*\}")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_REPAIRS = (
+    (re.compile(r"\bTrue\b"), "true"),
+    (re.compile(r"\bFalse\b"), "false"),
+    (re.compile(r"\bNone\b"), "null"),
+    # 'single quoted' keys and values
+    (re.compile(r"(?<=[{\[,:])(\s*)'([^'\\\n]*)'"), r'\1"\2"'),
+    # unquoted keys
+    (re.compile(r"(?<=[{,])(\s*)([A-Za-z_][A-Za-z0-9_]*)(\s*):"), r'\1"\2"\3:'),
+    # trailing commas
+    (re.compile(r",(\s*[}\]])"), r"\1"),
+    # objects in a list without the comma
+    (re.compile(r"\}(\s*)\{"), r"},\1{"),
+)
+
+
+def _span(text, start):
+    """
+    (end, closers) for the JSON value opening at text[start]: end is the
+    index after its closing bracket, or None with the closers still owed
+    if the text ends first (a reply cut off by the token limit).
+    """
+    stack, quote, escaped = [], None, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if not stack or ch != stack[-1]:
+                return i + 1, ""
+            stack.pop()
+            if not stack:
+                return i + 1, ""
+    return None, "".join(reversed(stack))
+
+
+def repair(text):
+    text = text.translate(_SMART_QUOTES)
+    for pattern, replacement in _REPAIRS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _candidates(text):
+    """Substrings that may hold the reply's JSON, most likely first, with how they were found."""
+    stripped = text.strip()
+    yield stripped, "clean"
+    for block in _FENCE.findall(text):
+        yield block.strip(), "extracted"
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if starts:
+        start = min(starts)
+        end, closers = _span(text, start)
+        if end is not None:
+            yield text[start:end], "extracted"
+        else:
+            # cut off: drop the unfinished last element, then close what is still open
+            body = text[start:].rstrip()
+            cut = max(body.rfind("}"), body.rfind("]"))
+            if cut > 0:
+                _, closers = _span(body[:cut + 1], 0)
+                yield body[:cut + 1] + closers, "repaired"
+
+
+def loads(text):
+    """The JSON value in an LLM reply, recovered as far as possible; raises ParseError."""
+    STATS.count(replies=1)
+    for candidate, how in _candidates(text or ""):
+        for attempt, repaired in ((candidate, False), (repair(candidate), True)):
+            try:
+                value = json.loads(attempt)
+            except ValueError:
+                continue
+            STATS.count(**{"repaired" if repaired else how: 1})
+            return value
+    STATS.count(unparseable=1)
+    raise ParseError(f"no JSON found in reply: {(text or '')[:80]!r}")
+
+
+def parse_score(text):
+    """A single {score, summary} reply, validated; None if it cannot be recovered."""
+    STATS.count(items=1)
+    try:
+        value = loads(text)
+        if isinstance(value, list) and len(value) == 1:
+            value = value[0]
+        return validate(value, SCORE_SCHEMA)
+    except (ParseError, SchemaError):
+        STATS.count(items_invalid=1)
+        return None
+
+
+def parse_batch(text, count):
+    """
+    Map a batch reply ({"results": [{id, score, summary}, ...]} or a bare
+    list) back onto its `count` inputs. Returns one validated dict per input,
+    or None where that item could not be recovered. When the reply as a whole
+    does not parse, each flat {...} object in it is tried on its own, so one
+    broken entry does not sink the rest of the batch.
+    """
+    results = [None] * count
+    try:
+        value = loads(text)
+    except ParseError:
+        value = None
+    if isinstance(value, dict):
+        value = value.get("results", [value])
+    objects = value if isinstance(value, list) else []
+
+    def _place(pos, obj):
+        if isinstance(obj, dict) and "id" not in obj and "job_id" not in obj and "index" not in obj:
+            obj = {**obj, "id": pos + 1}
+        try:
+            item = validate(obj, BATCH_ITEM_SCHEMA)
+        except SchemaError:
+            return
+        idx = item.pop("id") - 1
+        if idx < count and results[idx] is None:
+            results[idx] = item
+
+    for pos, obj in enumerate(objects):
+        _place(pos, obj)
+    if None in results:
+        for pos, chunk in enumerate(_FLAT_OBJECT.findall(text or "")):
+            for attempt in (chunk, repair(chunk)):
+                try:
+                    _place(pos, json.loads(attempt))
+                    break
+                except ValueError:
+                    continue
+
+    STATS.count(items=count, items_invalid=results.count(None))
+    return results
@@ -0,0 +1,38 @@
+# test_apply_executor.py
+import time
+
+from apply_executor import ApplyExecutor, DryRunBackend
+
+
+def main():
+    jobs = [
+        {"source": source, "title": f"{source} ML Intern {i}", "link": f"https://example.com/{source}/{i}"}
+        for source in ("LinkedIn", "Internshala", "Wellfound", "Jobright")
+        for i in range(3)
+    ]
+    jobs.append({"source": "Jobright", "title": "Broken page", "link": "file://fixtures/apply/missing.html"})
+
+    executor = ApplyExecutor(
+        DryRunBackend(latency=0.2),
+        max_workers=6,
+        site_limits={"linkedin": 1, "internshala": 1, "wellfound": 2, "jobright": 3},
+        site_intervals={"linkedin": 0.1},
+    )
+    started = time.monotonic()
+    for job in jobs:
+        executor.submit(job)
+    outcomes = executor.drain()
+    executor.shutdown()
+    elapsed = time.monotonic() - started
+
+    print(f"✅ {len(outcomes)} dry-run applications in {elapsed:.2f}s "
+          f"(serial would take {0.2 * len(jobs):.2f}s)")
+    for site, stats in executor.outcomes.summary().items():
+        print(f"   {site:<12} ok={stats['ok']} failed={stats['failed']}")
+    for o in outcomes:
+        if not o.ok:
+            print(f"✅ Failure reported: {o.job['title']} -> {o.reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# test_batch_scorer.py
+import json
+import os
+import tempfile
+
+from batch_scorer import ReplayClient, RateLimiter, score_batch
+from structured_output import parse_batch
+
+
+def fake_llm():
+    """Scores each numbered job by keyword; job 2 of a batch comes back broken the first time it is asked."""
+    broken = set()
+
+    def reply(messages):
+        lines = [l for l in messages[-1]["content"].splitlines() if l[:1].isdigit()]
+        entries = []
+        for line in lines:
+            idx, text = line.split(". ", 1)
+            score = 9 if "machine learning" in text.lower() else 2
+            entries.append(f'{{"id": {idx}, "score": {score}, "summary": "keyword match"}}')
+        second = lines[1].split(". ", 1)[1] if len(lines) > 1 else None
+        if second and second not in broken:
+            broken.add(second)
+            entries[1] = '{"id": 2, "score": }'
+        return "Here you go:\n" + ",\n".join(entries)
+    return reply
+
+
+def main():
+    partial = parse_batch('{"id": 1, "score": 7} {"id": 3, "score": "x"}', 3)
+    assert partial == [{"score": 7, "summary": ""}, None, None], partial
+    print("✅ Partial JSON:", partial)
+
+    jobs = [
+        "Machine Learning Intern at Acme (Internshala)",
+        "Sales Intern at Foo (LinkedIn)",
+        "Machine Learning Research Intern at Bar (Wellfound)",
+        "Marketing Intern at Baz (Jobright)",
+        "Machine Learning Engineer Intern at Qux (LinkedIn)",
+    ]
+    path = os.path.join(tempfile.mkdtemp(), "replay.jsonl")
+    recorder = ReplayClient(path, client=ReplayClient(path + ".none", responder=fake_llm()))
+    results = score_batch(recorder, jobs, batch_size=3, limiter=RateLimiter(0))
+    # jobs 2 and 5 came back broken and were re-queried together: both get their real score
+    assert [r["score"] for r in results] == [9, 2, 9, 2, 9] and recorder.calls == 3, (results, recorder.calls)
+    print(f"✅ Recorded {recorder.calls} LLM call(s) for {len(jobs)} jobs, broken items re-queried:")
+    for job, res in zip(jobs, results):
+        print(f"   {res['score']:>2} | {job}")
+
+    replay = ReplayClient(path)
+    replayed = score_batch(replay, jobs, batch_size=3, limiter=RateLimiter(0))
+    assert replayed == results and replay.calls == 3
+    print(f"✅ Offline replay matches ({replay.calls} calls)")
+    with open(path, encoding="utf-8") as f:
+        print("✅ Recorded entries:", len([json.loads(l) for l in f]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# test_daemon.py
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+
+import apply_executor
+import config
+import job_agent
+from daemon import Daemon, Stage
+
+
+def check_backpressure():
+    release = threading.Event()
+    seen = []
+    sink = Stage("sink", lambda item, emit: (release.wait(), seen.append(item)), workers=1, maxsize=2)
+    source = Stage("source", lambda n, emit: [emit(i) for i in range(n)], workers=1, maxsize=1)
+    source.next = sink
+    for stage in (source, sink):
+        stage.start()
+    source.inbox.put(10)
+    time.sleep(0.2)
+    # one item in the sink's hands, two queued, and the source blocked on the third
+    assert sink.status()["queued"] == 2 and source.status()["emitted"] == 3, (sink.status(), source.status())
+    release.set()
+    for stage in (source, sink):
+        stage.inbox.join()
+        stage.stop()
+    assert seen == list(range(10)) and sink.status()["processed"] == 10
+    print("✅ a full inbox blocks the stage feeding it; everything arrives once released")
+
+
+def check_batches():
+    batches = []
+    stage = Stage("batch", lambda items, emit: batches.append(len(items)), workers=1, maxsize=50,
+                  batch=4, linger=0.1)
+    for i in range(10):
+        stage.inbox.put(i)
+    stage.start()
+    stage.inbox.join()
+    stage.stop()
+    assert batches == [4, 4, 2], batches
+    print("✅ batched stage takes up to 4 items, and a partial batch after the linger")
+
+
+def _jobs(cycle):
+    # cycle 2 repeats cycle 1's postings, one of them edited, plus two new ones
+    count = 6 if cycle == 1 else 8
+    jobs = [{"source": "Wellfound", "title": f"Machine Learning Intern {i}", "company": f"Company {i}",
+             "link": f"https://wellfound.com/jobs/{i}"} for i in range(count)]
+    if cycle == 2:
+        jobs[1]["title"] += " (Remote)"
+    return jobs
+
+
+def _source_stream(cycles):
+    def stream(crawl=None, tracker=None):
+        jobs = _jobs(next(cycles))
+        return iter(tracker.check("Wellfound", "", jobs)[0] if tracker else jobs)
+    return stream
+
+
+def check_daemon():
+    scored = []
+    job_agent.source_stream = _source_stream(iter([1, 2]))
+    job_agent.analyze_batch_with_groq = lambda descriptions: [
+        scored.append(d) or {"score": 9, "summary": "fit"} for d in descriptions]
+    fixtures = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "apply")
+    apply_executor.create_backend = lambda: apply_executor.DryRunBackend(fixtures, latency=0.01)
+    config.DRY_RUN = True
+    config.PREFILTER_ENABLED = False
+    config.ENRICH_ENABLED = False
+    config.MAX_JOBS_TO_APPLY = 5
+    config.APPLY_SITE_INTERVALS = {}
+    config.DAEMON_BATCH_WAIT = 0.1
+    config.GMAIL_USER = ""
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.JOB_STORE_FILE = os.path.join(tmp, "jobs.sqlite3")
+        config.APPLIED_JOBS_FILE = os.path.join(tmp, "applied_jobs.txt")
+        config.MATCHED_CSV = os.path.join(tmp, "matched.csv")
+        agent = Daemon(interval=0.5, incremental=True, port=0,
+                       workers={"score": 2, "apply": 2})
+        snapshots, metrics = [], []
+
+        def poll():
+            while agent.status_url is None:
+                time.sleep(0.01)
+            with urllib.request.urlopen(agent.status_url.replace("/status", "/metrics"), timeout=5) as resp:
+                metrics.append(resp.read().decode())
+            while agent.cycles < 2:
+                with urllib.request.urlopen(agent.status_url, timeout=5) as resp:
+                    snapshots.append(json.load(resp))
+                time.sleep(0.05)
+
+        poller = threading.Thread(target=poll)
+        poller.start()
+        agent.run(max_cycles=2)
+        poller.join()
+
+    stages = agent.status()["stages"]
+    # cycle 2: the Tracker drops the unchanged repeats that were applied to; the edited posting, the one
+    # cycle 1's budget left out and the 2 new ones are passed on
+    assert agent.cycles == 2 and agent.counts["fetched"] == 10, (agent.cycles, agent.counts)
+    assert any(d.startswith("Machine Learning Intern 1 (Remote)") for d in scored), scored
+    assert stages["score"]["processed"] == 10, stages
+    # 5 of cycle 1's 6 (budget), then the sixth, the edited one and the 2 new ones
+    assert agent.applied == 9 and stages["apply"]["processed"] == 9, stages
+    assert all(s["queued"] == 0 and s["errors"] == 0 for s in stages.values()), stages
+    status = snapshots[0]
+    assert set(status["stages"]) == {"fetch", "filter", "enrich", "score", "apply", "notify"}
+    assert {"queued", "capacity", "per_minute"} <= set(status["stages"]["score"])
+    assert metrics[0].startswith("# HELP job_agent_run_duration_seconds")
+    print(f"✅ daemon: 2 cycles, edited posting re-scored, budget leftover applied in cycle 2, 9 applied; /status served {len(snapshots)} snapshot(s), "
+          f"/metrics in Prometheus format")
+
+
+def main():
+    check_backpressure()
+    check_batches()
+    check_daemon()
+
+
+if __name__ == "__main__":
+    main()
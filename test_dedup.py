@@ -0,0 +1,52 @@
+# test_dedup.py
+from dedup import Deduplicator, company_of, dedup_jobs
+
+
+def _job(source, title, company, link):
+    return {"source": source, "title": title, "company": company, "link": link}
+
+
+def check_company():
+    assert company_of(_job("LinkedIn", "x", "LinkedIn", "")) == ""
+    assert company_of(_job("Wellfound", "x", "Unknown", "")) == ""
+    assert company_of(_job("Internshala", "x", "Acme Labs Pvt. Ltd.", "")) == "acme labs pvt ltd"
+    print("✅ board names standing in for the company are ignored")
+
+
+def check_cross_board():
+    jobs = [
+        _job("Internshala", "Machine Learning Intern", "Acme Labs", "https://internshala.com/internship/detail/ml-1"),
+        _job("Wellfound", "Machine Learning Internship (Remote)", "Acme Labs", "https://wellfound.com/jobs/77-ml"),
+        # same posting again, by canonical URL (other host, tracking parameters)
+        _job("LinkedIn", "ML Intern", "LinkedIn", "https://in.linkedin.com/jobs/view/ml-intern-at-acme-42?trk=x"),
+        _job("LinkedIn", "ML Intern", "LinkedIn", "https://www.linkedin.com/jobs/view/ml-intern-at-acme-42"),
+        # no real company on one side: long, near-identical titles still merge
+        _job("Jobright", "Computer Vision Research Intern", "Jobright", "https://jobright.ai/jobs/info/cv-9"),
+        _job("Internshala", "Computer Vision Research Intern", "Visionary AI", "https://internshala.com/internship/detail/cv-9"),
+        # distinct postings: other company, other role, short generic title without a company
+        _job("Internshala", "Machine Learning Intern", "Beta Corp", "https://internshala.com/internship/detail/ml-2"),
+        _job("Internshala", "Data Analyst Intern", "Acme Labs", "https://internshala.com/internship/detail/da-1"),
+        _job("Wellfound", "Data Intern", "Wellfound", "https://wellfound.com/jobs/78-data"),
+        _job("Jobright", "Data Intern", "Jobright", "https://jobright.ai/jobs/info/data-3"),
+    ]
+    deduper = Deduplicator()
+    kept = dedup_jobs(jobs, deduper)
+    assert [j["link"] for j in kept] == [jobs[i]["link"] for i in (0, 2, 4, 6, 7, 8, 9)], [j["link"] for j in kept]
+
+    ml, linkedin, cv = kept[0], kept[1], kept[2]
+    assert ml["sources"] == ["Internshala", "Wellfound"] and ml["links"] == [jobs[0]["link"], jobs[1]["link"]]
+    assert linkedin["sources"] == ["LinkedIn"] and linkedin["links"] == [jobs[2]["link"], jobs[3]["link"]]
+    assert cv["sources"] == ["Jobright", "Internshala"]
+    assert all(len(j["links"]) == 1 for j in kept[3:])
+    assert deduper.collapsed == {"Wellfound": 1, "LinkedIn": 1, "Internshala": 1}, deduper.collapsed
+    print(f"✅ {len(jobs)} postings -> {len(kept)}: near-duplicates across boards merged, distinct ones kept")
+    print(deduper.report())
+
+
+def main():
+    check_company()
+    check_cross_board()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# test_driver_pool.py
+import threading
+import time
+
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    """Browser stand-in; once `hang` is set, its health check blocks until `release` is."""
+
+    def __init__(self, site):
+        self.site = site
+        self.hang = False
+        self.dead = False
+        self.release = threading.Event()
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if self.hang:
+            self.release.wait()
+        if self.dead:
+            raise RuntimeError("chrome not reachable")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def check_reuse_and_recycle():
+    made = []
+    pool = DriverPool(max_per_site=1, max_uses=2, cookie_dir="",
+                      factory=lambda site, headless: made.append(FakeDriver(site)) or made[-1])
+    for _ in range(3):
+        with pool.borrow("linkedin"):
+            pass
+    assert len(made) == 2 and made[0].quit_called, made
+    made[1].dead = True
+    with pool.borrow("linkedin") as session:
+        assert session.driver is made[2]
+    pool.close()
+    print("✅ browsers reused, recycled after max_uses, dead ones replaced")
+
+
+def check_hung_browser():
+    made = []
+    pool = DriverPool(max_per_site=2, cookie_dir="",
+                      factory=lambda site, headless: made.append(FakeDriver(site)) or made[-1])
+    with pool.borrow("linkedin"):
+        pass
+    made[0].hang = True
+    stuck = threading.Thread(target=lambda: pool.borrow("linkedin").__enter__(), daemon=True)
+    stuck.start()
+    time.sleep(0.1)
+
+    # the LinkedIn borrow is stuck in its health check; other sites, and returns, go on
+    other = threading.Thread(target=lambda: pool.borrow("internshala").__enter__(), daemon=True)
+    other.start()
+    other.join(0.5)
+    hung = other.is_alive()
+    made[0].release.set()
+    assert not hung, "an Internshala borrow waited on LinkedIn's health check"
+    stuck.join(1)
+    assert not stuck.is_alive()
+    pool.close()
+    print("✅ a hung browser's health check blocks only its own borrow")
+
+
+def main():
+    check_reuse_and_recycle()
+    check_hung_browser()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# test_email_notifier.py
+import email
+import socket
+import time
+
+from aiosmtpd.controller import Controller
+
+from email_notifier import Mailer, Notifier
+
+
+class Inbox:
+    """aiosmtpd handler: keeps every message, can refuse the first few with a 451."""
+
+    def __init__(self, refuse=0):
+        self.messages = []
+        self.sessions = set()
+        self.refuse = refuse
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        if self.refuse:
+            self.refuse -= 1
+            return "451 Try again later"
+        self.messages.append(email.message_from_bytes(envelope.content))
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def local_notifier(handler, **kwargs):
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    mailer = Mailer("127.0.0.1", port, user="", password="", starttls=False, timeout=5)
+    kwargs.setdefault("digest_seconds", 0)
+    return controller, Notifier(mailer, to_addr="me@example.com", sender="agent@example.com",
+                                retries=3, backoff=0.01, **kwargs)
+
+
+def check_pooled_connection():
+    inbox = Inbox()
+    controller, notifier = local_notifier(inbox)
+    started = time.monotonic()
+    for i in range(5):
+        notifier.notify(f"Applied to Intern {i}", f"Link: https://example.com/{i}")
+    queued = time.monotonic() - started
+    notifier.close(timeout=5)
+    controller.stop()
+    assert [m["Subject"] for m in inbox.messages] == [f"Applied to Intern {i}" for i in range(5)]
+    assert len(inbox.sessions) == notifier.mailer.connects == 1, inbox.sessions
+    print(f"✅ 5 emails over 1 SMTP connection; notify() returned in {queued * 1000:.1f}ms total")
+
+
+def check_digest():
+    inbox = Inbox()
+    controller, notifier = local_notifier(inbox, digest_seconds=30)
+    for i in range(4):
+        notifier.notify(f"Applied to Intern {i}", f"Score: {i}")
+    assert notifier.flush(timeout=5)
+    notifier.notify("Applied to Intern 4", "Score: 4")
+    notifier.close(timeout=5)
+    controller.stop()
+    subjects = [m["Subject"] for m in inbox.messages]
+    assert subjects == ["Job agent: 4 updates (Applied to Intern 0, ...)", "Applied to Intern 4"], subjects
+    assert "3. Applied to Intern 2\nScore: 2" in inbox.messages[0].get_payload(0).get_payload().replace("\r\n", "\n")
+    print("✅ events coalesced into one digest per flush; a lone event keeps its own subject")
+
+
+def check_retry():
+    inbox = Inbox(refuse=2)
+    controller, notifier = local_notifier(inbox)
+    notifier.notify("Applied to Intern", "Link: https://example.com/1")
+    notifier.close(timeout=5)
+    controller.stop()
+    assert len(inbox.messages) == 1 and notifier.stats["retries"] == 2, notifier.stats
+    print("✅ 451 replies retried with backoff until the message was accepted")
+    print(notifier.report())
+
+
+def check_server_down():
+    notifier = Notifier(Mailer("127.0.0.1", 9, user="", password="", starttls=False, timeout=1),
+                        to_addr="me@example.com", digest_seconds=0, retries=1, backoff=0.01)
+    started = time.monotonic()
+    notifier.notify("Applied to Intern", "body")
+    assert time.monotonic() - started < 0.1
+    notifier.close(timeout=5)
+    assert notifier.stats["failed"] == 1 and notifier.stats["retries"] == 1, notifier.stats
+    print("✅ unreachable server: notify() still returns at once, the email is retried then dropped")
+
+
+def main():
+    check_pooled_connection()
+    check_digest()
+    check_retry()
+    check_server_down()
+
+
+if __name__ == "__main__":
+    main()
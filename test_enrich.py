@@ -0,0 +1,123 @@
+# test_enrich.py
+import os
+import tempfile
+import threading
+import time
+
+import config
+import html_backend
+import sources
+from enrich import Enricher, truncate_tokens
+from http_client import Page
+from job_agent import describe_job
+from job_store import JobStore
+
+WELLFOUND_PAGE = """<html><head>
+<script type="application/ld+json">{"@context": "https://schema.org", "@graph": [
+  {"@type": "Organization", "name": "Wellfound"},
+  {"@type": "JobPosting", "title": "Machine Learning Intern",
+   "description": "&lt;p&gt;Train &amp;amp; ship &lt;b&gt;PyTorch&lt;/b&gt; models.&lt;/p&gt;&lt;p&gt;Show more&lt;/p&gt;",
+   "hiringOrganization": {"@type": "Organization", "name": "Acme AI"},
+   "jobLocation": [{"@type": "Place", "address": {"addressLocality": "Bengaluru", "addressCountry": "IN"}}],
+   "jobLocationType": "TELECOMMUTE",
+   "baseSalary": {"currency": "INR", "value": {"minValue": 20000, "maxValue": 30000, "unitText": "MONTH"}}}
+]}</script></head><body><h1>Machine Learning Intern</h1></body></html>"""
+
+LINKEDIN_PAGE = """<html><head><meta name="description" content="Meta blurb"></head><body>
+<a class="topcard__org-name-link" href="/company/deepco"> DeepCo </a>
+<span class="topcard__flavor topcard__flavor--bullet">Pune, Maharashtra</span>
+<div class="show-more-less-html__markup"><p>Work on <strong>NLP</strong> pipelines.</p><ul><li>Python</li>
+<li>Transformers</li></ul></div></body></html>"""
+
+
+def check_parse_detail():
+    for backend in html_backend.available_backends():
+        config.HTML_PARSER = backend
+        wellfound = sources.get("Wellfound").parse_detail(WELLFOUND_PAGE)
+        assert wellfound == {"description": "Train & ship PyTorch models.", "company": "Acme AI",
+                             "location": "Bengaluru, IN; Remote", "stipend": "INR 20000-30000/month"}, wellfound
+        linkedin = sources.get("LinkedIn").parse_detail(LINKEDIN_PAGE)
+        assert linkedin == {"description": "Work on NLP pipelines. Python Transformers", "company": "DeepCo",
+                            "location": "Pune, Maharashtra"}, (backend, linkedin)
+        assert sources.get("Jobright").parse_detail(LINKEDIN_PAGE)["description"] == "Meta blurb"
+    config.HTML_PARSER = "auto"
+    print(f"✅ JSON-LD JobPosting, board selectors and meta fallback parsed alike on "
+          f"{', '.join(html_backend.available_backends())}")
+
+
+def check_truncate():
+    text = " ".join(f"word{i}" for i in range(200))
+    cut = truncate_tokens(text, 50)
+    assert cut.endswith(" …") and len(cut) <= 50 * 4 + 2 and text.startswith(cut[:-2]), cut
+    assert truncate_tokens("short text", 50) == "short text" and truncate_tokens(text, 0) == text
+    print(f"✅ descriptions cut on a word boundary to the token budget ({len(text)} -> {len(cut)} chars)")
+
+
+class FakeClient:
+    """Detail pages by URL; "missing" URLs fail the way replay mode does."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.calls = []
+        self.in_flight = self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        with self._lock:
+            self.calls.append(url)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+        if "missing" in url:
+            raise FileNotFoundError(f"No recorded page for {url}")
+        return Page(url, 200, WELLFOUND_PAGE, False, False)
+
+
+def check_enricher():
+    jobs = [{"source": "Wellfound", "title": f"ML Intern {i}", "company": "Wellfound",
+             "link": f"https://wellfound.com/jobs/{i}-ml-intern"} for i in range(12)]
+    jobs.append({"source": "Wellfound", "title": "Gone", "company": "Wellfound",
+                 "link": "https://wellfound.com/jobs/missing"})
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.sqlite3"))
+        client = FakeClient()
+        enricher = Enricher(store, max_workers=4, token_budget=3, client=client)
+        started = time.monotonic()
+        enriched = list(enricher.stream(iter(jobs)))
+        elapsed = time.monotonic() - started
+        assert [j["title"] for j in enriched] == [j["title"] for j in jobs]
+        assert enriched[0]["company"] == "Acme AI" and enriched[0]["description"] == "Train & ship …"
+        assert enriched[-1] == jobs[-1] and enricher.stats["failed"] == 1
+        assert 1 < client.peak <= 4 and elapsed < 13 * client.latency / 2, (client.peak, elapsed)
+        assert describe_job(enriched[0]) == ("ML Intern 0 at Acme AI (Wellfound) | Location: Bengaluru, IN; Remote"
+                                             " | Stipend: INR 20000-30000/month | Train & ship …")
+
+        # a later run (new Enricher, same store) fetches only the page that failed
+        again = Enricher(store, max_workers=4, client=client)
+        calls = len(client.calls)
+        again.enrich(jobs)
+        assert client.calls[calls:] == ["https://wellfound.com/jobs/missing"], client.calls[calls:]
+        assert again.stats["cached"] == 12
+
+        # an edited listing is fetched again; the unchanged ones still come from the store
+        edited = [{**jobs[3], "title": "ML Intern 3 (Remote)"}] + jobs[4:6]
+        calls = len(client.calls)
+        later = Enricher(store, max_workers=4, client=client)
+        later.enrich(edited)
+        assert client.calls[calls:] == [jobs[3]["link"]] and later.stats["stale"] == 1, client.calls[calls:]
+        store.close()
+    print(f"✅ 13 detail pages fetched {client.peak} at a time in {elapsed:.2f}s, order kept; "
+          f"a second run re-fetches only the failed one, a third only the edited listing")
+    print(enricher.report())
+
+
+def main():
+    check_parse_detail()
+    check_truncate()
+    check_enricher()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# test_http_client.py
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import config
+import html_backend
+import http_client
+from http_client import HttpClient
+
+PAGE = "<html><body><a class='base-card__full-link' href='https://www.linkedin.com/jobs/view/1'>ML Intern</a></body></html>"
+
+
+class _Board(BaseHTTPRequestHandler):
+    """Serves one page with an ETag and answers 304 when it is sent back."""
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = PAGE.encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def check_conditional_get():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Board)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/jobs"
+    parses = []
+
+    def parse_links(html):
+        parses.append(html)
+        return [{"title": "ML Intern", "link": "https://www.linkedin.com/jobs/view/1"}]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        client = HttpClient(cache_dir=cache_dir, ttl=0, mode="live")
+        first = client.get_parsed(url, parse_links)
+        second = client.get_parsed(url, parse_links)
+        assert len(parses) == 1 and first == second, parses
+        # a 304 is parsed again after a parser change or with another HTML backend
+        html_backend.PARSER_VERSION += 1
+        client.get_parsed(url, parse_links)
+        html_backend.PARSER_VERSION -= 1
+        config.HTML_PARSER = "soup" if html_backend.get_backend().name != "soup" else "soup-strained"
+        client.get_parsed(url, parse_links)
+        config.HTML_PARSER = "auto"
+        client.close()
+    server.shutdown()
+
+    assert len(parses) == 3 and client.stats["not_modified"] == 3, (len(parses), client.stats)
+    print(f"✅ Conditional GET: {client.stats['not_modified']} x 304, "
+          f"parsed {len(parses)} time(s): once, then after a parser version bump and a backend switch")
+
+
+def check_replay():
+    # Offline run of every board adapter against the pages under fixtures/http
+    http_client._client = HttpClient(cache_dir="", mode="replay")
+    import scraper
+    import sources
+
+    for adapter in sources.enabled():
+        print(f"✅ {adapter.name}.fetch(): {len(adapter.fetch())} jobs (replay)")
+    jobs = scraper.fetch_all_jobs(max_per_site=10)
+    print(f"✅ scraper.fetch_all_jobs: {len(jobs)} jobs (replay)")
+    print(f"   network requests made: {http_client._client.stats['requests']}")
+    print("   " + sources.report())
+
+
+def main():
+    check_conditional_get()
+    check_replay()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# test_incremental.py
+import os
+import tempfile
+
+from crawler import crawl_source
+from incremental import Tracker
+from job_store import JobStore
+
+
+class _Board:
+    """Crawl source over an in-memory listing, newest first, 10 postings per page."""
+
+    name = "Internshala"
+    url_template = "https://internshala.com/internships?q={keyword}&page={page}"
+    page_size = 10
+
+    def __init__(self, postings):
+        self.postings = postings
+        self.pages_fetched = 0
+
+    def fetch_page(self, url):
+        self.pages_fetched += 1
+        page = int(url.rsplit("=", 1)[1])
+        return [dict(p) for p in self.postings[(page - 1) * 10:page * 10]]
+
+
+def _posting(n, title=None):
+    return {"source": "Internshala", "title": title or f"ML Intern {n}", "company": f"Co {n}",
+            "link": f"https://internshala.com/internship/detail/ml-intern-{n}"}
+
+
+def _crawl(store, board, save=True, defer=False):
+    tracker = Tracker(store)
+    jobs = crawl_source(board, [("ml", "")], max_pages=5, tracker=tracker)
+    jobs = list(tracker.defer(jobs) if defer else jobs)
+    if save:
+        tracker.save()
+    return jobs, tracker
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.sqlite3"))
+        postings = [_posting(n) for n in range(50, 0, -1)]
+
+        board = _Board(postings)
+        jobs, _ = _crawl(store, board)
+        assert len(jobs) == 50 and board.pages_fetched == 5
+        print("✅ first run: 50 postings over 5 pages")
+
+        board = _Board(postings)
+        jobs, tracker = _crawl(store, board)
+        assert jobs == [] and board.pages_fetched == 1, (len(jobs), board.pages_fetched)
+        print(f"✅ nothing new: stopped after 1 page   {tracker.report()}")
+
+        postings = [_posting(52), _posting(51)] + postings
+        board = _Board(postings)
+        jobs, _ = _crawl(store, board)
+        assert [j["title"] for j in jobs] == ["ML Intern 52", "ML Intern 51"] and board.pages_fetched == 1
+        print("✅ two new postings on top: only they are passed on, 1 page fetched")
+
+        postings[3] = _posting(49, title="ML Intern 49 (stipend raised)")
+        board = _Board(postings)
+        jobs, tracker = _crawl(store, board)
+        assert [j["title"] for j in jobs] == ["ML Intern 49 (stipend raised)"], jobs
+        assert tracker.counts["changed"] == 1
+        print("✅ edited posting passed on again as changed")
+
+        postings = [_posting(53)] + postings
+        _crawl(store, _Board(postings), save=False)
+        jobs, _ = _crawl(store, _Board(postings))
+        assert [j["title"] for j in jobs] == ["ML Intern 53"], jobs
+        print("✅ a fetch that never reached save() does not hide its postings from the next run")
+
+        # handed on to scoring: only the one whose score was recorded (with its hash) is known next run
+        postings = [_posting(55), _posting(54)] + postings
+        jobs, _ = _crawl(store, _Board(postings), defer=True)
+        assert [j["title"] for j in jobs] == ["ML Intern 55", "ML Intern 54"], jobs
+        store.bulk_upsert([{**jobs[0], "score": 3}], "scored")
+        store.bulk_upsert([{**jobs[1], "score": 9, "content_hash": None}], "scored")
+        jobs, _ = _crawl(store, _Board(postings))
+        assert [j["title"] for j in jobs] == ["ML Intern 54"], jobs
+        store.close()
+        print("✅ a deferred posting stays new until its outcome is stored with its hash")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# test_job_store.py
+import os
+import tempfile
+
+from job_store import JobStore
+
+
+def _job(n, **extra):
+    return {"source": "LinkedIn", "title": f"ML Intern {n}", "company": "Acme",
+            "link": f"https://in.linkedin.com/jobs/view/ml-intern-{n}?trk=public_jobs", **extra}
+
+
+def check_status_order(store):
+    job = _job(1)
+    store.bulk_upsert([job], "seen")
+    store.bulk_upsert([{**job, "score": 8, "reason": "fit"}], "scored")
+    store.mark(job, "applied", "Applied")
+    # later "seen"/"scored"/"failed" upserts never move it back down
+    store.bulk_upsert([job], "seen")
+    store.bulk_upsert([{**job, "score": 2}], "scored")
+    store.mark(job, "failed", "retry")
+    assert store.status(job["link"]) == "applied"
+    assert [status for status, _, _ in store.history(job["link"])] == ["seen", "scored", "applied"]
+
+    other = _job(2)
+    store.bulk_upsert([other], "seen")
+    store.mark(other, "failed", "Fixture missing")
+    store.bulk_upsert([{**other, "score": 7}], "scored")
+    assert store.status(other["link"]) == "failed"
+    print("✅ upserts only move a status up seen -> scored -> failed -> applied; history has the real changes")
+
+
+def check_has_applied(store):
+    # keyed by canonical URL: another host and tracking parameters are the same job
+    assert store.has_applied("https://www.linkedin.com/jobs/view/ml-intern-1")
+    assert not store.has_applied(_job(2)["link"]) and not store.has_applied(_job(3)["link"])
+    merged = {**_job(4), "links": [_job(4)["link"], "https://www.linkedin.com/jobs/view/ml-intern-5"]}
+    store.mark(merged, "applied", "Applied")
+    assert store.has_applied(_job(5)["link"])
+    assert store.counts() == {"applied": 3, "failed": 1}, store.counts()
+    print("✅ has_applied by canonical URL, and for every duplicate link merged into an applied job")
+
+
+def check_scored_jobs(store):
+    store.bulk_upsert([_job(n, score=n, reason=f"score {n}") for n in (6, 9, 7)], "scored")
+    best = store.jobs("scored", min_score=7)
+    assert [j["score"] for j in best] == [9, 7] and best[0]["summary"] == "score 9"
+    assert store.jobs("scored", limit=1)[0]["title"] == "ML Intern 9"
+    print("✅ stored jobs come back by status, best score first")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.sqlite3"))
+        check_status_order(store)
+        check_has_applied(store)
+        check_scored_jobs(store)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
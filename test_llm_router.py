@@ -0,0 +1,87 @@
+# test_llm_router.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from batch_scorer import score_batch
+from llm_router import FakeProvider, LLMRouter, LLMUnavailable, Route, fake_reply
+
+MESSAGES = [{"role": "user", "content": "Job Description:\nML Intern at Acme"}]
+
+
+def check_deterministic():
+    router = LLMRouter([[Route(FakeProvider(latency=0), "fake-model")]])
+    first = router.complete(MESSAGES)
+    assert first.text == router.complete(MESSAGES).text == fake_reply(MESSAGES[0]["content"])
+    jobs = [f"ML Intern {i} at Co {i} (LinkedIn)" for i in range(25)]
+    assert score_batch(router, jobs, batch_size=10) == score_batch(router, jobs, batch_size=7)
+    print(f"✅ fake provider is deterministic ({first.tokens_in} tokens in, {first.tokens_out} out)")
+
+
+def check_failover():
+    flaky = FakeProvider(latency=0, fail_every=1, name="flaky")
+    backup = FakeProvider(latency=0, name="backup")
+    router = LLMRouter([[Route(flaky, "m1")], [Route(backup, "m2")]])
+    for _ in range(5):
+        assert router.complete(MESSAGES).provider == "backup"
+    m = router.metrics()
+    assert m["flaky:m1"]["errors"] == 3 and m["flaky:m1"]["breaker"] == "open", m["flaky:m1"]
+    assert m["backup:m2"]["ok"] == 5
+    print("✅ errors fail over to the next tier; the breaker opens after 3 failures")
+
+
+def check_rate_limit():
+    limited = FakeProvider(latency=0, rate_limit_every=1, name="limited")
+    other = FakeProvider(latency=0, name="other")
+    router = LLMRouter([[Route(limited, "a"), Route(limited, "b"), Route(other, "c")]], policy="latency")
+    # make the limited provider look fastest so it is tried first
+    router.tiers[0][0].ewma, router.tiers[0][1].ewma, router.tiers[0][2].ewma = 0.001, 0.002, 0.5
+    assert router.complete(MESSAGES).provider == "other"
+    m = router.metrics()
+    assert m["limited:a"]["rate_limited"] == 1 and m["limited:b"]["calls"] == 0
+    assert m["limited:a"]["breaker"] == m["limited:b"]["breaker"] == "open"
+    print("✅ a 429 opens the breaker of every route on that provider")
+
+
+def check_latency_routing():
+    slow = FakeProvider(latency=0.03, name="slow")
+    fast = FakeProvider(latency=0.0, name="fast")
+    router = LLMRouter([[Route(slow, "s"), Route(fast, "f")]], policy="latency")
+    picks = [router.complete(MESSAGES).provider for _ in range(10)]
+    assert picks[-5:] == ["fast"] * 5, picks
+    print(f"✅ latency routing settles on the faster route ({picks.count('fast')}/10 calls)")
+
+
+def check_buckets():
+    provider = FakeProvider(latency=0, rpm=600, concurrency=4)  # 10 requests/s, burst of 50
+    router = LLMRouter([[Route(provider, "m")]])
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: router.complete(MESSAGES), range(60)))
+    elapsed = time.monotonic() - started
+    assert elapsed >= 0.9, elapsed
+    print(f"✅ request bucket paces calls past the burst (60 calls in {elapsed:.1f}s at 10/s, burst 50)")
+
+
+def check_all_down():
+    router = LLMRouter([[Route(FakeProvider(latency=0, fail_every=1), "m")]])
+    try:
+        router.complete(MESSAGES)
+    except LLMUnavailable:
+        pass
+    else:
+        raise AssertionError("expected LLMUnavailable")
+    print("✅ LLMUnavailable when every route fails")
+    print(router.report())
+
+
+def main():
+    check_deterministic()
+    check_failover()
+    check_rate_limit()
+    check_latency_routing()
+    check_buckets()
+    check_all_down()
+
+
+if __name__ == "__main__":
+    main()
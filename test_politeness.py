@@ -0,0 +1,103 @@
+# test_politeness.py
+import os
+import tempfile
+import time
+
+import config
+import job_agent
+from apply_executor import ApplyExecutor
+from job_store import JobStore
+from politeness import Scheduler, is_challenge, retry_after_seconds
+
+
+def check_pacing():
+    scheduler = Scheduler({"linkedin.com": 20.0}, default_rate=0.0, burst=1)
+    started = time.monotonic()
+    for _ in range(6):
+        scheduler.acquire("in.linkedin.com")
+    paced = time.monotonic() - started
+    started = time.monotonic()
+    for _ in range(6):
+        scheduler.acquire("example.com")
+    assert paced >= 0.2 and time.monotonic() - started < 0.05, paced
+    print(f"✅ linkedin.com paced at 20/s (6 requests in {paced:.2f}s), unlisted hosts unpaced")
+
+
+def check_adapts():
+    scheduler = Scheduler({"wellfound.com": 10.0}, burst=1)
+    pacer = scheduler.pacer("wellfound.com")
+    for _ in range(100):
+        pacer.success()
+    assert pacer.rate == 10.0 * config.POLITENESS_SPEEDUP
+    scheduler.feedback("wellfound.com", 429, retry_after=0.3)
+    assert pacer.rate == 10.0 * config.POLITENESS_SPEEDUP * config.POLITENESS_SLOWDOWN
+    assert 0.2 < pacer.ready_in() <= 0.3
+    assert scheduler.pick(["wellfound.com", "jobright.ai"]) == "jobright.ai"
+    assert pacer.acquire(max_wait=0.05) is None
+    scheduler.feedback("wellfound.com", 200, url="https://wellfound.com/login/challenge?next=/jobs")
+    assert pacer.rate == 10.0 * config.POLITENESS_FLOOR and pacer.ready_in() > config.CHALLENGE_PAUSE - 1
+    assert retry_after_seconds("120") == 120 and retry_after_seconds("soon") is None
+    print("✅ rate grows on success, halves and pauses on 429 (Retry-After), drops to the floor on a challenge")
+
+
+class ChallengedBackend:
+    """LinkedIn asks for a CAPTCHA on the first apply; the other sites just work."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, job):
+        self.calls.append(job["source"])
+        if job["source"] == "LinkedIn":
+            return False, "CAPTCHA login required"
+        time.sleep(0.02)
+        return True, "Applied"
+
+    def close(self):
+        pass
+
+
+def check_apply_challenge():
+    assert is_challenge("OTP verification required") and not is_challenge("Fixture missing")
+    backend = ChallengedBackend()
+    executor = ApplyExecutor(backend, max_workers=2, site_limits={"linkedin": 1, "internshala": 1},
+                             site_intervals={"linkedin": 0.01, "internshala": 0.01}, max_wait=1)
+    jobs = [{"source": source, "title": f"{source} {i}", "link": f"https://example.com/{source}/{i}"}
+            for i in range(4) for source in ("LinkedIn", "Internshala")]
+    started = time.monotonic()
+    for job in jobs:
+        executor.submit(job)
+    outcomes = executor.drain()
+    executor.shutdown()
+    elapsed = time.monotonic() - started
+    skipped = [o for o in outcomes if o.skipped]
+    assert all(o.reason.startswith("Skipped: linkedin paused") for o in skipped), [o.reason for o in outcomes]
+    assert backend.calls.count("LinkedIn") == 1 and len(skipped) == 3, [o.reason for o in outcomes]
+    assert sum(o.ok for o in outcomes) == 4 and elapsed < 1, elapsed
+    assert executor.outcomes.summary()["linkedin"]["skipped"] == 3
+    print(f"✅ a CAPTCHA pauses only LinkedIn: 3 LinkedIn jobs skipped, 4 Internshala applied in {elapsed:.2f}s")
+    print(executor.scheduler.report())
+
+    # the challenged job is "failed"; the skipped ones stay "scored", for `apply` to pick up later
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.sqlite3"))
+        config.MATCHED_CSV = os.path.join(tmp, "matched.csv")
+        config.DRY_RUN = False
+        linkedin = [{**o.job, "score": 9, "summary": "fit"} for o in outcomes if not o.ok]
+        store.bulk_upsert(linkedin, "scored")
+        job_agent.record_outcomes([o._replace(job={**o.job, "score": 9, "summary": "fit"})
+                                   for o in outcomes if not o.ok], store)
+        assert store.counts() == {"failed": 1, "scored": 3}, store.counts()
+        assert sorted(j["link"] for j in store.jobs("scored")) == sorted(o.job["link"] for o in skipped)
+        store.close()
+    print("✅ skipped jobs stay \"scored\"; only the one that met the CAPTCHA is \"failed\"")
+
+
+def main():
+    check_pacing()
+    check_adapts()
+    check_apply_challenge()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# test_prefilter.py
+import json
+import os
+import tempfile
+
+from prefilter import PreFilter, SkillMatcher
+
+
+def _job(title, company="Acme"):
+    return {"source": "Internshala", "title": title, "company": company, "link": f"https://x.com/{title}"}
+
+
+def check_matcher():
+    matcher = SkillMatcher({"machine learning": 3, "ml": 2, "python": 2, "c++": 1, "teamwork": 0})
+    assert matcher.match("Machine Learning Intern (Python, ML)") == (7, ["machine learning", "ml", "python"])
+    # word boundaries: no "ml" inside "HTML", no "python" inside "pythonic"
+    assert matcher.match("HTML/CSS developer, pythonic code") == (0, [])
+    assert matcher.match("C++ and teamwork") == (1, ["c++"])
+    assert matcher.match("ml ML Ml") == (2, ["ml"])
+    print("✅ one regex over all terms, on word boundaries, each term counted once")
+
+
+def check_prefilter():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "skills.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"roles_of_interest": ["Data Scientist"], "technical_skills": ["NLP", "PyTorch"],
+                       "tools": ["Docker"], "soft_skills": ["communication"]}, f)
+        prefilter = PreFilter(SkillMatcher.from_skills_file(path, extra_terms=["ai", "ml"]), threshold=2)
+
+    kept = ["Data Scientist Intern", "NLP Research Intern", "AI Intern", "ML Engineer Intern",
+            "Backend Intern (Docker, PyTorch)"]
+    dropped = ["Sales Intern", "Content Writing Intern", "HTML Email Designer", "Maintenance Intern",
+               "Docker Ops Intern", "Communication Intern"]
+    assert [t for t in kept if not prefilter.keep(_job(t))] == []
+    assert [t for t in dropped if prefilter.keep(_job(t))] == []
+    assert prefilter.seen == 11 and prefilter.dropped == 6
+    job = _job("NLP and PyTorch Intern")
+    prefilter.keep(job)
+    assert job["prefilter_score"] == 4
+    print(f"✅ {len(kept)} AI/ML titles kept, {len(dropped)} others dropped")
+    print(prefilter.report(batch_size=5))
+
+
+def main():
+    check_matcher()
+    check_prefilter()
+
+
+if __name__ == "__main__":
+    main()
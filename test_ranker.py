@@ -0,0 +1,49 @@
+# test_ranker.py
+import config
+from ranker import HashingVectorizer, ResumeRanker, tokenize
+
+RESUME = """Python developer focused on machine learning and NLP: PyTorch, transformers,
+text classification, named entity recognition, model deployment with Docker."""
+
+
+def _job(i, title, company="Acme"):
+    return {"source": "LinkedIn", "title": title, "company": company, "link": f"https://x.com/{i}"}
+
+
+def check_vectors():
+    assert tokenize("C++ and Node.js") == ["c++", "and", "node.js", "c++ and", "and node.js"]
+    vectors = HashingVectorizer(n_features=256).transform(["machine learning", "", "machine learning"])
+    assert abs(float(vectors[0] @ vectors[2]) - 1.0) < 1e-6 and not vectors[1].any()
+    print("✅ hashed unigram+bigram vectors, L2-normalised (empty text stays zero)")
+
+
+def check_ranking():
+    ranker = ResumeRanker(RESUME)
+    titles = ["Sales Intern", "NLP Machine Learning Intern (PyTorch, transformers)", "Graphic Design Intern",
+              "Machine Learning Intern", "Python Backend Intern", "Marketing Intern"]
+    ranker.add_jobs(_job(i, t) for i, t in enumerate(titles))
+    # more than the first matrix allocation: the matrix grows and keeps earlier rows
+    ranker.add_jobs(_job(100 + i, f"Office Assistant {i}") for i in range(70))
+    assert len(ranker) == 76
+
+    ranked = ranker.top_k(len(ranker))
+    similarities = [s for _, s in ranked]
+    assert similarities == sorted(similarities, reverse=True)
+    assert [j["title"] for j, _ in ranked[:2]] == [titles[1], titles[3]], ranked[:3]
+    assert ranked[1][1] > 0.1 > ranked[2][1], ranked[:3]
+
+    config.RANK_TOP_K = 3
+    top = ranker.top_k(config.RANK_TOP_K)
+    assert [j for j, _ in top] == [j for j, _ in ranked[:3]]
+    assert len(ranker.top_k(500)) == 76 and ResumeRanker(RESUME).top_k(5) == []
+    print(f"✅ {len(ranker)} jobs ranked by resume similarity (best {ranked[0][1]:.2f}); "
+          f"RANK_TOP_K={config.RANK_TOP_K} keeps the top {len(top)}")
+
+
+def main():
+    check_vectors()
+    check_ranking()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# test_score_cache.py
+import os
+import tempfile
+
+import config
+import score_cache
+from batch_scorer import score_batch
+from llm_router import FakeProvider, LLMRouter, Route
+from score_cache import ScoreCache, cache_key, cached_batch
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def check_ttl_and_counts(tmp, clock):
+    cache = ScoreCache(os.path.join(tmp, "ttl.sqlite3"), ttl=60, max_entries=10)
+    key = cache_key("ML intern at Acme", "groq:m", "v1")
+    assert cache_key("  ml   INTERN at acme ", "groq:m", "v1") == key
+    assert cache.get(key) is None
+    cache.put(key, {"score": 8, "summary": "fit"})
+    clock.now += 59
+    assert cache.get(key) == {"score": 8, "summary": "fit"}
+    clock.now += 2
+    assert cache.get(key) is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "hit_rate": 0.333, "entries": 1}, cache.stats()
+    cache.evict()
+    assert cache.stats()["entries"] == 0
+    cache.close()
+    print("✅ entries expire after the TTL; hits and misses counted")
+
+
+def check_lru(tmp, clock):
+    cache = ScoreCache(os.path.join(tmp, "lru.sqlite3"), ttl=0, max_entries=3)
+    for name in "abcd":
+        clock.now += 1
+        cache.put(name, {"score": 5, "summary": name})
+    clock.now += 1
+    assert cache.get("a")
+    cache.evict()
+    assert cache.get("b") is None and all(cache.get(k) for k in "acd")
+    cache.close()
+    print("✅ over the size cap, the least recently used entry goes first")
+
+
+def check_fallback_not_cached(tmp):
+    primary = FakeProvider(latency=0, fail_every=1, name="primary")
+    backup = FakeProvider(latency=0, name="backup")
+    router = LLMRouter([[Route(primary, "big")], [Route(backup, "small")]])
+    assert router.primary == "primary:big"
+    calls = []
+
+    def compute(todo):
+        calls.append(len(todo))
+        return score_batch(router, todo, batch_size=5)
+
+    jobs = ["Machine Learning Intern at Acme", "NLP Intern at Qux"]
+    config.SCORE_CACHE_ENABLED = True
+    config.SCORE_CACHE_FILE = os.path.join(tmp, "scores.sqlite3")
+    try:
+        first = cached_batch(jobs, router.primary, "v1", compute)
+        assert all(r["model"] == "backup:small" and r["score"] > 0 for r in first), first
+        # one failure does not open the primary's breaker
+        primary.fail_every = 0
+        second = cached_batch(jobs, router.primary, "v1", compute)
+        assert all(r["model"] == "primary:big" for r in second), second
+        third = cached_batch(jobs, router.primary, "v1", compute)
+        assert third == second and calls == [2, 2], calls
+        stats = score_cache.get_cache().stats()
+        assert stats["entries"] == 2 and stats["hits"] == 2, stats
+    finally:
+        score_cache.close_cache()
+        config.SCORE_CACHE_ENABLED = False
+    print("✅ scores from a fallback route are not cached; the primary's are, and are reused")
+
+
+def main():
+    clock = Clock()
+    real_time = score_cache.time
+    score_cache.time = clock
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            check_ttl_and_counts(tmp, clock)
+            check_lru(tmp, clock)
+    finally:
+        score_cache.time = real_time
+    with tempfile.TemporaryDirectory() as tmp:
+        check_fallback_not_cached(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# test_sources.py
+import sys
+
+import config
+import sources
+
+BOARDS = {
+    "internshala": "https://internshala.com/internship/detail/ml-1",
+    "linkedin": "https://www.linkedin.com/jobs/view/ml-intern-at-acme-42",
+    "wellfound": "https://wellfound.com/jobs/77-ml",
+    "jobright": "https://jobright.ai/jobs/info/cv-9",
+}
+
+
+def loaded():
+    return sorted(key for key in BOARDS if f"sources.{key}" in sys.modules)
+
+
+def check_lazy_find():
+    assert loaded() == [], loaded()
+    for key, name in (("wellfound", "Wellfound"), ("linkedin", "LinkedIn")):
+        adapter = sources.find({"source": name, "link": BOARDS[key]})
+        assert adapter.name == name and adapter.key == key
+        assert sources.find({"source": name.upper()}) is adapter
+    # only the boards asked for were imported
+    assert loaded() == ["linkedin", "wellfound"], loaded()
+
+    for key in ("internshala", "jobright"):
+        assert sources.find({"source": key}).key == key
+    assert loaded() == sorted(BOARDS)
+    assert sources.find({"source": "Monster"}) is None
+    assert sources.find({"source": "../config"}) is None and sources.find({}) is None
+    print("✅ find(job) imports each board's module on first use, and None for unknown boards")
+
+
+def check_enabled_and_canonicalize():
+    config.SOURCES = ["jobright", "internshala"]
+    assert [a.key for a in sources.enabled()] == ["jobright", "internshala"]
+    try:
+        sources.get("monster")
+        raise AssertionError("unknown board did not raise")
+    except KeyError:
+        pass
+
+    # LinkedIn's own rule drops the slug and the regional host; others use the generic one
+    assert sources.canonicalize("https://in.linkedin.com/jobs/view/ml-intern-at-acme-42?trk=public_jobs") == \
+        sources.canonicalize("https://www.linkedin.com/jobs/view/42")
+    assert sources.canonicalize(BOARDS["wellfound"] + "?utm_source=x") == sources.canonicalize(BOARDS["wellfound"])
+    assert sources.canonicalize("") == ""
+    print("✅ enabled() follows SOURCES; canonicalize() applies the owning board's rule")
+
+
+def main():
+    check_lazy_find()
+    check_enabled_and_canonicalize()
+
+
+if __name__ == "__main__":
+    main()
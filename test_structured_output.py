@@ -0,0 +1,65 @@
+# test_structured_output.py
+from batch_scorer import score_batch
+from llm_router import FakeProvider, LLMRouter, Route, fake_reply
+from structured_output import STATS, parse_batch, parse_score
+
+SINGLE = {
+    "fenced": 'Sure! Here is the rating:\n```json\n{"score": 8, "summary": "PyTorch internship"}\n```',
+    "prose": 'Based on the description I would say {"score": 8, "summary": "PyTorch internship"} overall.',
+    "python literals": "{'score': 8, 'summary': 'PyTorch internship', 'remote': True}",
+    "trailing comma": '{"score": 8, "summary": "PyTorch internship",}',
+    "unquoted keys": '{score: 8, summary: "PyTorch internship"}',
+    "score as text": '{"score": "8/10", "summary": "PyTorch internship"}',
+    "alias keys": '{"relevance": 8.2, "reason": "PyTorch internship"}',
+}
+
+
+def check_single():
+    for name, text in SINGLE.items():
+        result = parse_score(text)
+        assert result == {"score": 8, "summary": "PyTorch internship"}, (name, result)
+    assert parse_score('{"score": 42, "summary": "x"}') is None
+    assert parse_score("I cannot rate this job.") is None
+    print(f"✅ single replies recovered: {', '.join(SINGLE)}; out-of-range and prose-only rejected")
+
+
+def check_batch():
+    truncated = '```json\n{"results": [{"id": 1, "score": 9, "summary": "a"}, {"id": 2, "score": 3, "summ'
+    assert parse_batch(truncated, 3) == [{"score": 9, "summary": "a"}, None, None]
+    unordered = '[{"id": 3, "score": 2}, {"id": 1, "score": 7}, {"id": 9, "score": 5}]'
+    assert parse_batch(unordered, 3) == [{"score": 7, "summary": ""}, None, {"score": 2, "summary": ""}]
+    broken_middle = '{"id": 1, "score": 6}\n{"id": 2, "score": }\n{"id": 3, "score": 4}'
+    assert [r and r["score"] for r in parse_batch(broken_middle, 3)] == [6, None, 4]
+    print("✅ batch replies: cut-off, unordered and one-broken-entry replies keep their good items")
+
+
+def check_requery_only_failed():
+    """Every reply is fenced and full batches have job 2 broken; only those jobs should be asked again."""
+    asked = []
+
+    def responder(messages):
+        prompt = messages[-1]["content"]
+        jobs = [line for line in prompt.split("Jobs:", 1)[1].splitlines() if line[:1].isdigit()]
+        asked.append(len(jobs))
+        reply = fake_reply(prompt)
+        if len(jobs) == 3:
+            reply = reply.replace('{"id": 2, "score": ', '{"id": 2, "score": "n/a", "x": ', 1)
+        return f"Here are the scores:\n```json\n{reply}\n```"
+
+    router = LLMRouter([[Route(FakeProvider(latency=0, responder=responder), "m")]])
+    jobs = [f"ML Intern {i} at Co {i} (LinkedIn)" for i in range(6)]
+    results = score_batch(router, jobs, batch_size=3)
+    assert sorted(asked) == [2, 3, 3], asked
+    assert all(r["summary"] == "fake provider score" for r in results), results
+    print(f"✅ 2 broken items re-queried on their own (prompt sizes {asked}), no whole batch re-run")
+
+
+def main():
+    check_single()
+    check_batch()
+    check_requery_only_failed()
+    print(STATS.report())
+
+
+if __name__ == "__main__":
+    main()
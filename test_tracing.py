@@ -0,0 +1,57 @@
+# test_tracing.py
+import json
+import os
+import tempfile
+import time
+
+import tracing
+
+
+def check_spans():
+    tracing.REGISTRY.reset()
+    for _ in range(4):
+        with tracing.span("http", host="a.example"):
+            time.sleep(0.002)
+    try:
+        with tracing.span("http", host="b.example"):
+            raise TimeoutError
+    except TimeoutError:
+        pass
+
+    @tracing.traced()
+    def score_one():
+        return 7
+
+    assert score_one() == 7
+    spans = {(s["name"], s["labels"].get("host")): s for s in tracing.REGISTRY.snapshot()["spans"]}
+    assert spans[("http", "a.example")]["count"] == 4 and spans[("http", "a.example")]["p50"] >= 0.002
+    assert spans[("http", "b.example")]["errors"] == 1
+    assert spans[("score_one", None)]["count"] == 1
+    print("✅ spans time blocks per label set, count exceptions as errors; traced() names after the function")
+
+
+def check_export():
+    tracing.REGISTRY.reset()
+    with tracing.span("llm_call", route='fake:"m"'):
+        pass
+    tracing.count("jobs", 20, stage="fetched")
+    tracing.count("jobs", 5, stage="fetched")
+    with tempfile.TemporaryDirectory() as tmp:
+        prom = open(tracing.export(os.path.join(tmp, "m.prom")), encoding="utf-8").read()
+        data = json.load(open(tracing.export(os.path.join(tmp, "m.json")), encoding="utf-8"))
+        assert not [f for f in os.listdir(tmp) if f.endswith(".tmp")]
+    assert 'job_agent_jobs_total{stage="fetched"} 25' in prom
+    assert 'job_agent_span_seconds_count{span="llm_call",route="fake:\\"m\\""} 1' in prom
+    assert data["counters"] == [{"name": "jobs", "labels": {"stage": "fetched"}, "value": 25}]
+    assert tracing.export("") is None
+    print("✅ export writes Prometheus text for .prom, JSON otherwise (label values escaped)")
+
+
+def main():
+    check_spans()
+    check_export()
+    print(tracing.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# tracing.py
+"""
+Run instrumentation: span timers, counters and an end-of-run export.
+
+    with tracing.span("http", host=host):
+        ...
+    tracing.count("jobs", 20, stage="fetched")
+
+Spans and counters go into one process-wide registry (thread-safe, no
+dependencies), keyed by name plus labels. At the end of a command
+job_agent writes it to METRICS_FILE: Prometheus textfile-collector format
+if the name ends in .prom, JSON otherwise. profiled() wraps a command in
+cProfile (or pyinstrument, if installed) and dumps the hot paths to
+PROFILE_DIR.
+"""
+import io
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+import config
+
+# per-series cap on kept durations (count and total stay exact past it)
+MAX_SAMPLES = 10000
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self._samples = {}
+            self._totals = Counter()
+            self._counts = Counter()
+            self._errors = Counter()
+            self._counters = Counter()
+
+    def observe(self, name, seconds, error=False, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            samples = self._samples.setdefault(key, [])
+            if len(samples) < MAX_SAMPLES:
+                samples.append(seconds)
+            self._totals[key] += seconds
+            self._counts[key] += 1
+            if error:
+                self._errors[key] += 1
+
+    def count(self, name, n=1, **labels):
+        with self._lock:
+            self._counters[_key(name, labels)] += n
+
+    def samples(self, name):
+        """Kept durations of every series of span `name`, whatever their labels."""
+        with self._lock:
+            return [s for (n, _), values in self._samples.items() if n == name for s in values]
+
+    def snapshot(self):
+        with self._lock:
+            samples = {k: list(v) for k, v in self._samples.items()}
+            totals, counts, errors = dict(self._totals), dict(self._counts), dict(self._errors)
+            counters = dict(self._counters)
+            started = self.started
+        spans = []
+        for key in sorted(samples):
+            values = samples[key]
+            spans.append({
+                "name": key[0],
+                "labels": dict(key[1]),
+                "count": counts[key],
+                "errors": errors.get(key, 0),
+                "total": round(totals[key], 6),
+                "p50": round(percentile(values, 50), 6),
+                "p95": round(percentile(values, 95), 6),
+                "max": round(max(values), 6),
+            })
+        return {
+            "started_at": started,
+            "duration": round(time.time() - started, 3),
+            "spans": spans,
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in sorted(counters.items())],
+        }
+
+
+REGISTRY = Registry()
+
+
+@contextmanager
+def span(name, **labels):
+    """Time the block; exceptions are counted as errors of the span and re-raised."""
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        REGISTRY.observe(name, time.perf_counter() - started, error, **labels)
+
+
+def traced(name=None, **labels):
+    """Decorator form of span(); the span is named after the function by default."""
+    def decorate(fn):
+        span_name = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1, **labels):
+    REGISTRY.count(name, n, **labels)
+
+
+# ======================================
+# EXPORT
+# ======================================
+def _labels(labels, **extra):
+    items = {**labels, **extra}
+    if not items:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in items.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(items, escaped)) + "}"
+
+
+def to_prometheus(snapshot, prefix="job_agent"):
+    """Prometheus text exposition of a snapshot (for node_exporter's textfile collector)."""
+    lines = [
+        f"# HELP {prefix}_run_duration_seconds Wall time of the run.",
+        f"# TYPE {prefix}_run_duration_seconds gauge",
+        f"{prefix}_run_duration_seconds {snapshot['duration']}",
+        f"# HELP {prefix}_run_started_timestamp_seconds When the run started.",
+        f"# TYPE {prefix}_run_started_timestamp_seconds gauge",
+        f"{prefix}_run_started_timestamp_seconds {snapshot['started_at']:.3f}",
+        f"# HELP {prefix}_span_seconds Time spent in instrumented spans.",
+        f"# TYPE {prefix}_span_seconds summary",
+    ]
+    for s in snapshot["spans"]:
+        labels = {"span": s["name"], **s["labels"]}
+        lines.append(f"{prefix}_span_seconds{_labels(labels, quantile='0.5')} {s['p50']}")
+        lines.append(f"{prefix}_span_seconds{_labels(labels, quantile='0.95')} {s['p95']}")
+        lines.append(f"{prefix}_span_seconds_sum{_labels(labels)} {s['total']}")
+        lines.append(f"{prefix}_span_seconds_count{_labels(labels)} {s['count']}")
+    lines += [f"# HELP {prefix}_span_errors_total Spans that ended in an exception.",
+              f"# TYPE {prefix}_span_errors_total counter"]
+    for s in snapshot["spans"]:
+        lines.append(f"{prefix}_span_errors_total{_labels({'span': s['name'], **s['labels']})} {s['errors']}")
+    for name in sorted({c["name"] for c in snapshot["counters"]}):
+        lines += [f"# TYPE {prefix}_{name}_total counter"]
+        for c in snapshot["counters"]:
+            if c["name"] == name:
+                lines.append(f"{prefix}_{name}_total{_labels(c['labels'])} {c['value']}")
+    return "\n".join(lines) + "\n"
+
+
+def export(path=None):
+    """Write the registry to `path` (default METRICS_FILE) atomically; returns the path, or None if disabled."""
+    path = config.METRICS_FILE if path is None else path
+    if not path:
+        return None
+    snapshot = REGISTRY.snapshot()
+    text = to_prometheus(snapshot) if path.endswith(".prom") else json.dumps(snapshot, indent=2)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # the textfile collector may read at any moment, so never leave a half-written file
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def report(top=8):
+    spans = sorted(REGISTRY.snapshot()["spans"], key=lambda s: s["total"], reverse=True)[:top]
+    if not spans:
+        return "📈 No spans recorded."
+    lines = ["📈 Where the time went (top spans by total seconds):",
+             f"   {'span':<34} {'n':>6} {'total':>8} {'p50':>7} {'p95':>7} {'err':>4}"]
+    for s in spans:
+        label = s["name"] + "".join(f" {v}" for v in s["labels"].values())
+        lines.append(f"   {label[:34]:<34} {s['count']:>6} {s['total']:>8.2f} {s['p50']:>7.3f} "
+                     f"{s['p95']:>7.3f} {s['errors']:>4}")
+    return "\n".join(lines)
+
+
+# ======================================
+# PROFILING
+# ======================================
+@contextmanager
+def profiled(kind=None, name="run"):
+    """
+    Profile the block with "cprofile" or "pyinstrument" (default PROFILE;
+    nothing if empty). Output goes to PROFILE_DIR/<name>-<time>.prof|.html.
+    """
+    kind = (config.PROFILE if kind is None else kind or "").lower()
+    if not kind:
+        yield
+        return
+    os.makedirs(config.PROFILE_DIR, exist_ok=True)
+    base = os.path.join(config.PROFILE_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+
+    if kind == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️ pyinstrument is not installed; profiling with cProfile instead")
+        else:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(base + ".html", "w", encoding="utf-8") as f:
+                    f.write(profiler.output_html())
+                print(f"🔬 Profile written to {base}.html")
+            return
+
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(base + ".prof")
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(15)
+        print(f"🔬 Profile written to {base}.prof (hot paths by cumulative time):")
+        print("\n".join(out.getvalue().strip().splitlines()[-20:]))
@@ -0,0 +1,48 @@
+# url_utils.py
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query params that only track where a click came from, never which job it is
+TRACKING_PARAMS = {
+    "ref", "refid", "trackingid", "trk", "trkinfo", "lipi", "src", "source", "position",
+    "pagenum", "originalsubdomain", "ebp", "fbclid", "gclid", "mc_cid", "mc_eid", "utm",
+}
+
+# Mirrors and regional/mobile hosts that serve the same postings
+HOST_ALIASES = {
+    "angel.co": "wellfound.com",
+}
+_REGIONAL_PREFIX = re.compile(r"^(?:m|mobile|[a-z]{2})\.(linkedin\.com)$")
+
+
+def normalize_host(host):
+    host = (host or "").lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    host = _REGIONAL_PREFIX.sub(r"\1", host)
+    return HOST_ALIASES.get(host, host)
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith("utm_")
+
+
+def canonical_url(url):
+    """
+    Normalise a job URL so the same posting always maps to the same key:
+    lowercase scheme/host, no "www."/regional/mobile host prefix, no
+    fragment, no trailing slash, no tracking params, remaining params
+    sorted. Board-specific rules live in the source adapters
+    (sources.canonicalize).
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = normalize_host(parts.hostname)
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https" if parts.scheme in ("http", "https", "") else parts.scheme,
+                       host, path, urlencode(query), ""))